@@ -0,0 +1,298 @@
+from scripts.file_manager import FileManager
+from scripts.source import Source
+from scripts.encoder import Encoder
+from scripts.decoder import Decoder
+from scripts.bit_buffer import BitBuffer
+from typing import Callable, List
+from time import perf_counter
+import pandas as pd
+
+
+class Benchmark:
+    """
+    A class to measure the execution time of the stages of the program.
+
+        Attributes
+        ----------
+
+        file_paths : List[str]
+            Paths of the text files
+        repetitions : int
+            Number of executions of each measure (the best one is kept)
+
+        Methods
+        -------
+
+        measure(self, function: Callable, *args) -> tuple:
+            Measure the execution time of a function.
+        get_encoder(self, file_manager: "FileManager", coding_method: str, args: list, canonical: bool = False) -> "Encoder":
+            Create the encoder of a text file (with the pre-compression of the file manager).
+        encoder(self, coding_method: str, args: list) -> pd.DataFrame:
+            Compare the original symbol by symbol encoder with the table encoder.
+        get_coded_content(self, encoder: "Encoder", file_manager: "FileManager") -> "BitBuffer":
+            Get the coded content (preamble, source code and content) without redundancy.
+        decoder(self, coding_method: str, args: list) -> pd.DataFrame:
+            Compare the bit by bit decoder with the table decoder.
+        header(self, coding_method: str, args: list) -> pd.DataFrame:
+            Compare the size of the inverse source code with the canonical source code.
+        blocked(self, args: list, workers: int = 1) -> pd.DataFrame:
+            Compare the Huffman code with the blocked Huffman code.
+        coding_methods(self, coding_methods: List[str], args: list) -> pd.DataFrame:
+            Compare the size and the execution time of several coding methods.
+        compression(self, compressions: List[str], coding_method: str, args: list, level: int = None) -> pd.DataFrame:
+            Compare the coded content of the text with the coded content of the pre-compressed text.
+    """
+
+    def __init__(self, file_paths: List[str], repetitions: int = 3) -> None:
+        self.file_paths = file_paths
+        self.repetitions = repetitions
+
+    def measure(self, function: Callable, *args) -> tuple:
+        """
+        Measure the execution time of a function.
+
+            Parameters
+                function (Callable): Function to measure
+                args: Arguments of the function
+
+            Returns
+                return Tuple with the result of the function and the best execution time (seconds)
+        """
+
+        best = float("inf")
+        for _ in range(self.repetitions):
+            start = perf_counter()
+            result = function(*args)
+            best = min(best, perf_counter() - start)
+        return result, best
+
+    def get_encoder(self, file_manager: "FileManager", coding_method: str, args: list, canonical: bool = False) -> "Encoder":
+        """
+        Create the encoder of a text file.
+
+            Parameters
+                file_manager ("FileManager"): File manager of the text file
+                coding_method (str): Name of the coding method to use
+                args (list): Extra arguments of the coding method
+                canonical (bool): Use the canonical source code
+
+            Returns
+                return The encoder
+        """
+
+        source = Source(
+            symbols=file_manager.symbols,
+            probability_distribution=file_manager.get_probability_distribution()
+        )
+        compression = {} if file_manager.compression is None else {"compression": file_manager.compression, "compression_level": file_manager.compression_level}
+        return Encoder(coding_method=coding_method, source=source, args=args, canonical=canonical, binary=file_manager.binary, **compression)
+
+    def encoder(self, coding_method: str, args: list) -> pd.DataFrame:
+        """
+        Compare the original symbol by symbol encoder (string concatenation) with the table encoder.
+
+            Parameters
+                coding_method (str): Name of the coding method to use
+                args (list): Extra arguments of the coding method
+
+            Returns
+                return Dataframe with the execution times of each text file
+        """
+
+        data = {"file": [], "symbols": [], "bits": [], "baseline": [], "table": [], "speedup": [], "identical": []}
+        for file_path in self.file_paths:
+            file_manager = FileManager(file_path)
+            encoder = self.get_encoder(file_manager, coding_method, args)
+            reference, reference_time = self.measure(encoder.encode_by_symbol, file_manager.content)
+            result, result_time = self.measure(encoder.encode, file_manager.content)
+            data["file"].append(file_path)
+            data["symbols"].append(file_manager.length)
+            data["bits"].append(len(result))
+            data["baseline"].append(reference_time)
+            data["table"].append(result_time)
+            data["speedup"].append(reference_time/result_time)
+            data["identical"].append(BitBuffer.from_string(reference) == result)
+        return pd.DataFrame(data)
+
+    def get_coded_content(self, encoder: "Encoder", file_manager: "FileManager") -> "BitBuffer":
+        """
+        Get the coded content (preamble, source code and content) without redundancy.
+
+            Parameters
+                encoder ("Encoder"): Encoder of the text file
+                file_manager ("FileManager"): File manager of the text file
+
+            Returns
+                return The coded content
+        """
+
+        coded_content = BitBuffer.from_string(encoder.preamble_to_string() + encoder.source_code_to_string(file_manager.end_delimiter))
+        return coded_content.append(encoder.encode(file_manager.content))
+
+    def decoder(self, coding_method: str, args: list) -> pd.DataFrame:
+        """
+        Compare the bit by bit decoder with the table decoder.
+
+            Parameters
+                coding_method (str): Name of the coding method to use
+                args (list): Extra arguments of the coding method
+
+            Returns
+                return Dataframe with the execution times of each text file
+        """
+
+        data = {"file": [], "symbols": [], "bits": [], "by-bit": [], "table": [], "speedup": [], "identical": []}
+        for file_path in self.file_paths:
+            file_manager = FileManager(file_path)
+            encoder = self.get_encoder(file_manager, coding_method, args)
+            coded_content = self.get_coded_content(encoder, file_manager)
+            decoder = Decoder("")
+            reference, reference_time = self.measure(decoder.decode_content_by_bit, coded_content)
+            result, result_time = self.measure(decoder.decode_content, coded_content)
+            data["file"].append(file_path)
+            data["symbols"].append(file_manager.length)
+            data["bits"].append(len(coded_content))
+            data["by-bit"].append(reference_time)
+            data["table"].append(result_time)
+            data["speedup"].append(reference_time/result_time)
+            data["identical"].append(reference == result == file_manager.content[:-1])
+        return pd.DataFrame(data)
+
+    def header(self, coding_method: str, args: list) -> pd.DataFrame:
+        """
+        Compare the size of the inverse source code with the canonical source code.
+
+            Parameters
+                coding_method (str): Name of the coding method to use
+                args (list): Extra arguments of the coding method
+
+            Returns
+                return Dataframe with the header sizes (bits) of each text file
+        """
+
+        data = {"file": [], "symbols": [], "inverse": [], "canonical": [], "ratio": [], "identical": []}
+        for file_path in self.file_paths:
+            file_manager = FileManager(file_path)
+            encoder = self.get_encoder(file_manager, coding_method, args)
+            canonical_encoder = self.get_encoder(file_manager, coding_method, args, True)
+            inverse = len(encoder.source_code_to_string(file_manager.end_delimiter))
+            canonical = len(canonical_encoder.source_code_to_string(file_manager.end_delimiter))
+            coded_content = self.get_coded_content(canonical_encoder, file_manager)
+            data["file"].append(file_path)
+            data["symbols"].append(len(file_manager.symbols))
+            data["inverse"].append(inverse)
+            data["canonical"].append(canonical)
+            data["ratio"].append(inverse/canonical)
+            data["identical"].append(Decoder("", True).decode_content(coded_content) == file_manager.content[:-1])
+        return pd.DataFrame(data)
+
+    def blocked(self, args: list, workers: int = 1) -> pd.DataFrame:
+        """
+        Compare the Huffman code with the blocked Huffman code (compression and encoding and decoding time),
+        the blocks are decoded in a pool of threads and in a pool of processes.
+
+            Parameters
+                args (list): Extra arguments of the blocked Huffman code (output symbols and block length)
+                workers (int): Number of workers to encode and decode the blocks
+
+            Returns
+                return Dataframe with the sizes (bits) and the execution times of each text file
+        """
+
+        data = {
+            "file": [], "symbols": [], "huffman-bits": [], "blocked-bits": [], "ratio": [], "huffman-encode": [], "huffman-decode": [],
+            "blocked-encode": [], "blocked-decode-thread": [], "blocked-decode-process": [], "identical": []
+        }
+        blocked_args = [args[0], args[1] if len(args) > 1 else None, workers]
+        for file_path in self.file_paths:
+            file_manager = FileManager(file_path)
+            data["file"].append(file_path)
+            data["symbols"].append(file_manager.length)
+            text = file_manager.content[:-1]
+
+            encoder = self.get_encoder(file_manager, "huffman", args[:1], True)
+            coded_content, encode_time = self.measure(self.get_coded_content, encoder, file_manager)
+            content, decode_time = self.measure(Decoder("", True, coding_method="huffman").decode_content, coded_content)
+            data["huffman-bits"].append(len(coded_content))
+            data["huffman-encode"].append(encode_time)
+            data["huffman-decode"].append(decode_time)
+            identical = content == text
+
+            encoder = self.get_encoder(file_manager, "blocked_huffman", blocked_args, True)
+            coded_content, encode_time = self.measure(self.get_coded_content, encoder, file_manager)
+            data["blocked-bits"].append(len(coded_content))
+            data["blocked-encode"].append(encode_time)
+            for executor in ("thread", "process"):
+                decoder = Decoder("", True, workers=workers, executor=executor, coding_method="blocked_huffman")
+                content, decode_time = self.measure(decoder.decode_content, coded_content)
+                data[f"blocked-decode-{executor}"].append(decode_time)
+                identical = identical and content == text
+
+            data["ratio"].append(data["huffman-bits"][-1]/data["blocked-bits"][-1])
+            data["identical"].append(identical)
+        return pd.DataFrame(data)
+
+    def coding_methods(self, coding_methods: List[str], args: list) -> pd.DataFrame:
+        """
+        Compare the size and the execution time of several coding methods.
+
+            Parameters
+                coding_methods (List[str]): Names of the coding methods to compare
+                args (list): Extra arguments of the coding methods
+
+            Returns
+                return Dataframe with the sizes (bits) and the execution times of each text file and coding method
+        """
+
+        data = {"file": [], "coding-method": [], "symbols": [], "bits": [], "bits-per-symbol": [], "encode": [], "decode": [], "identical": []}
+        for file_path in self.file_paths:
+            file_manager = FileManager(file_path)
+            for coding_method in coding_methods:
+                encoder = self.get_encoder(file_manager, coding_method, args, True)
+                coded_content, encode_time = self.measure(self.get_coded_content, encoder, file_manager)
+                content, decode_time = self.measure(Decoder("", True, coding_method=coding_method).decode_content, coded_content)
+                data["file"].append(file_path)
+                data["coding-method"].append(coding_method)
+                data["symbols"].append(file_manager.length)
+                data["bits"].append(len(coded_content))
+                data["bits-per-symbol"].append(len(coded_content)/file_manager.length)
+                data["encode"].append(encode_time)
+                data["decode"].append(decode_time)
+                data["identical"].append(content == file_manager.content[:-1])
+        return pd.DataFrame(data)
+
+    def compression(self, compressions: List[str], coding_method: str, args: list, level: int = None) -> pd.DataFrame:
+        """
+        Compare the coded content of the text with the coded content of the pre-compressed text.
+
+            Parameters
+                compressions (List[str]): Names of the pre-compression methods to compare
+                coding_method (str): Name of the coding method to use
+                args (list): Extra arguments of the coding method
+                level (int): Level of the pre-compression (None for the default level)
+
+            Returns
+                return Dataframe with the sizes (bits) and the execution times of each text file and pre-compression method
+        """
+
+        data = {"file": [], "compression": [], "bits": [], "ratio": [], "compression-time": [], "encode": [], "decode": [], "identical": []}
+        for file_path in self.file_paths:
+            text, text_bits = FileManager(file_path).content[:-1], None
+            for compression in [None] + compressions:
+                file_manager = FileManager(file_path, compression, level)
+                encoder = self.get_encoder(file_manager, coding_method, args, True)
+                coded_content, encode_time = self.measure(self.get_coded_content, encoder, file_manager)
+                decoder = Decoder("", True, coding_method=coding_method)
+                content, decode_time = self.measure(decoder.decode_content, coded_content)
+                data["file"].append(file_path)
+                data["compression"].append(compression or "none")
+                # The text without pre-compression is the reference of the ratio
+                text_bits = text_bits or len(coded_content)
+                data["bits"].append(len(coded_content))
+                data["ratio"].append(text_bits/len(coded_content))
+                # The decompression time is added in each repetition of the decoding
+                data["compression-time"].append(file_manager.compression_time + decoder.decompression_time/self.repetitions)
+                data["encode"].append(encode_time)
+                data["decode"].append(decode_time)
+                data["identical"].append(content == text)
+        return pd.DataFrame(data)
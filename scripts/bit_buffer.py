@@ -0,0 +1,593 @@
+from typing import Iterator, Union
+import numpy as np
+
+# Number of ones of each byte
+
+POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1)
+
+
+class BitBuffer:
+    """
+    A class to represent a packed sequence of bits.
+
+        The bits are stored eight per byte in a NumPy uint8 array, the most
+        significant bit first, so the packed bytes are exactly the channel
+        values of the frames.
+
+        Attributes
+        ----------
+
+        data : np.ndarray
+            Packed bits (the array can be bigger than the bits in use)
+        length : int
+            Number of bits in the buffer
+        owned : bool
+            False when the data is a view of another buffer
+
+        Methods
+        -------
+
+        __len__(self) -> int:
+            Get the number of bits of the buffer.
+        __str__(self) -> str:
+            Represents the bit buffer in a string format.
+        __repr__(self) -> str:
+            Represents the bit buffer in a string format for data structures.
+        __eq__(self, other: object) -> bool:
+            Compare two bit buffers.
+        __getitem__(self, key: Union[int, slice]) -> Union[int, "BitBuffer"]:
+            Get a bit or a slice of the buffer.
+        __iter__(self) -> Iterator[int]:
+            Iterate over the bits of the buffer.
+        __add__(self, other: "BitBuffer") -> "BitBuffer":
+            Concatenate two bit buffers.
+        from_string(cls, bits: str) -> "BitBuffer":
+            Create a bit buffer from a string of '0' and '1' characters.
+        from_bits(cls, bits: np.ndarray) -> "BitBuffer":
+            Create a bit buffer from an array of unpacked bits.
+        from_bytes(cls, data: bytes, length: int = None) -> "BitBuffer":
+            Create a bit buffer from packed bytes.
+        from_int(cls, value: int, width: int) -> "BitBuffer":
+            Create a bit buffer from an integer with the given number of bits.
+        from_fields(cls, values: np.ndarray, width: int) -> "BitBuffer":
+            Create a bit buffer from fixed-width unsigned integers.
+        packed(self) -> np.ndarray:
+            Get the packed bytes in use (view).
+        reserve(self, length: int) -> None:
+            Make room for the given number of bits.
+        append(self, bits: Union["BitBuffer", str]) -> "BitBuffer":
+            Append bits at the end of the buffer.
+        append_int(self, value: int, width: int) -> "BitBuffer":
+            Append an integer with the given number of bits.
+        to_bits(self) -> np.ndarray:
+            Get the unpacked bits of the buffer.
+        to_bytes(self) -> bytes:
+            Get the packed bits of the buffer.
+        to_string(self) -> str:
+            Get the bits of the buffer as a string of '0' and '1' characters.
+        to_int(self) -> int:
+            Get the bits of the buffer as an unsigned integer.
+        pad(self, length: int) -> "BitBuffer":
+            Fill the buffer with zeros up to the given length.
+        repeat(self, factor: int) -> "BitBuffer":
+            Repeat each bit of the buffer.
+        repeat_rows(self, row_length: int, factor: int) -> "BitBuffer":
+            Repeat each row of bits of the buffer.
+        majority(self, factor: int) -> "BitBuffer":
+            Keep the majority bit of each group of bits of the buffer.
+        majority_rows(self, row_length: int, factor: int) -> "BitBuffer":
+            Keep the majority row of each group of rows of bits of the buffer.
+        fields(self, width: int) -> np.ndarray:
+            Split the buffer in fixed-width unsigned integers.
+        iter_fields(self, width: int) -> Iterator[int]:
+            Iterate over the fixed-width unsigned integers of the buffer.
+    """
+
+    def __init__(self, data: np.ndarray = None, length: int = None, owned: bool = True) -> None:
+        self.data = np.zeros(0, dtype=np.uint8) if data is None else data
+        self.length = self.data.size*8 if length is None else length
+        self.owned = owned
+
+    def __len__(self) -> int:
+        """
+        Get the number of bits of the buffer.
+
+            Parameters
+                None
+
+            Returns
+                return The number of bits
+        """
+
+        return self.length
+
+    def __str__(self) -> str:
+        """
+        Represents the bit buffer in a string format.
+
+            Parameters
+                None
+
+            Returns
+                return The string format of the bit buffer
+        """
+
+        return self.to_string()
+
+    def __repr__(self) -> str:
+        """
+        Represents the bit buffer in a string format for data structures.
+
+            Parameters
+                None
+
+            Returns
+                return The string format of the bit buffer
+        """
+
+        return f"BitBuffer({self.length} bits)"
+
+    def __eq__(self, other: object) -> bool:
+        """
+        Compare two bit buffers.
+
+            Parameters
+                other (object): Bit buffer to compare
+
+            Returns
+                return True if both buffers have the same bits otherwise False
+        """
+
+        if not isinstance(other, BitBuffer):
+            return NotImplemented
+        return self.length == other.length and self.to_bytes() == other.to_bytes()
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[int, "BitBuffer"]:
+        """
+        Get a bit or a slice of the buffer, slices starting in a byte boundary are views.
+
+            Parameters
+                key (Union[int, slice]): Index or slice of the bits
+
+            Returns
+                return The bit (int) or a bit buffer with the sliced bits
+        """
+
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.length)
+            if step != 1:
+                raise Exception(f"The step ({step}) isn't supported.")
+            length = max(stop-start, 0)
+            data = self.data[start//8:(start+length+7)//8]
+            shift = start%8
+            if shift == 0:
+                return BitBuffer(data, length, owned=False)
+            # Shift the bytes to align the first bit
+            shifted = data << shift
+            shifted[:-1] |= data[1:] >> (8-shift)
+            return BitBuffer(shifted[:(length+7)//8], length)._masked()
+        if key < 0:
+            key += self.length
+        if not 0 <= key < self.length:
+            raise IndexError(f"The index ({key}) is out of range.")
+        return int(self.data[key//8] >> (7-key%8)) & 1
+
+    def __iter__(self) -> Iterator[int]:
+        """
+        Iterate over the bits of the buffer.
+
+            Parameters
+                None
+
+            Returns
+                return Iterator with the bits
+        """
+
+        return iter(self.to_bits().tolist())
+
+    def __add__(self, other: "BitBuffer") -> "BitBuffer":
+        """
+        Concatenate two bit buffers.
+
+            Parameters
+                other ("BitBuffer"): Bit buffer to concatenate
+
+            Returns
+                return A new bit buffer
+        """
+
+        result = BitBuffer()
+        result.reserve(self.length+len(other))
+        return result.append(self).append(other)
+
+    @classmethod
+    def from_string(cls, bits: str) -> "BitBuffer":
+        """
+        Create a bit buffer from a string of '0' and '1' characters.
+
+            Parameters
+                bits (str): Binary string
+
+            Returns
+                return The bit buffer
+        """
+
+        return cls.from_bits(np.frombuffer(bits.encode("ascii"), dtype=np.uint8) - ord("0"))
+
+    @classmethod
+    def from_bits(cls, bits: np.ndarray) -> "BitBuffer":
+        """
+        Create a bit buffer from an array of unpacked bits.
+
+            Parameters
+                bits (np.ndarray): Array of zeros and ones
+
+            Returns
+                return The bit buffer
+        """
+
+        return cls(np.packbits(bits), len(bits))
+
+    @classmethod
+    def from_bytes(cls, data: bytes, length: int = None) -> "BitBuffer":
+        """
+        Create a bit buffer from packed bytes.
+
+            Parameters
+                data (bytes): Packed bits (bytes or uint8 array)
+                length (int): Number of bits to use (all the bits by default)
+
+            Returns
+                return The bit buffer
+        """
+
+        data = np.frombuffer(data, dtype=np.uint8) if isinstance(data, (bytes, bytearray)) else data.reshape(-1)
+        return cls(data, length, owned=False)
+
+    @classmethod
+    def from_int(cls, value: int, width: int) -> "BitBuffer":
+        """
+        Create a bit buffer from an integer with the given number of bits.
+
+            Parameters
+                value (int): Unsigned integer
+                width (int): Number of bits
+
+            Returns
+                return The bit buffer
+        """
+
+        if value >> width:
+            raise Exception(f"The value ({value}) doesn't fit in {width} bits.")
+        nbytes = (width+7)//8
+        data = (value << (nbytes*8-width)).to_bytes(nbytes, "big")
+        return cls(np.frombuffer(data, dtype=np.uint8).copy(), width)
+
+    @classmethod
+    def from_fields(cls, values: np.ndarray, width: int) -> "BitBuffer":
+        """
+        Create a bit buffer from fixed-width unsigned integers (the inverse of fields).
+
+            Parameters
+                values (np.ndarray): Unsigned integers (each one fits in width bits)
+                width (int): Number of bits of each field (up to 64)
+
+            Returns
+                return The bit buffer
+        """
+
+        if width == 1:
+            # The fields are the bits
+            return cls.from_bits(np.asarray(values, dtype=np.uint8))
+        values = np.asarray(values, dtype=np.uint64)
+        if width in (8, 16, 32, 64):
+            # The fields are whole bytes
+            return cls(np.frombuffer(values.astype(f">u{width//8}").tobytes(), dtype=np.uint8).copy(), values.size*width)
+        # Unpack the big endian bytes of each value and keep its last width bits
+        nbytes = next(nbytes for nbytes in (1, 2, 4, 8) if 8*nbytes >= width)
+        data = np.frombuffer(values.astype(f">u{nbytes}").tobytes(), dtype=np.uint8).reshape(-1, nbytes)
+        return cls.from_bits(np.unpackbits(data, axis=1)[:, 8*nbytes-width:].reshape(-1))
+
+    def packed(self) -> np.ndarray:
+        """
+        Get the packed bytes in use (view), the bits after the length of the last byte are undefined.
+
+            Parameters
+                None
+
+            Returns
+                return Array with the packed bytes
+        """
+
+        return self.data[:(self.length+7)//8]
+
+    def _masked(self) -> "BitBuffer":
+        """
+        Set to zero the unused bits of the last byte.
+
+            Parameters
+                None
+
+            Returns
+                return The bit buffer
+        """
+
+        if self.length%8:
+            self.data[self.length//8] &= (0xFF << (8-self.length%8)) & 0xFF
+        return self
+
+    def reserve(self, length: int) -> None:
+        """
+        Make room for the given number of bits, copying the data if it's a view.
+
+            Parameters
+                length (int): Number of bits
+
+            Returns
+                return None
+        """
+
+        nbytes = (length+7)//8
+        if self.owned and nbytes <= self.data.size:
+            return
+        data = np.zeros(max(nbytes, 2*self.data.size), dtype=np.uint8)
+        used = self.packed()
+        data[:used.size] = used
+        self.data, self.owned = data, True
+        self._masked()
+
+    def append(self, bits: Union["BitBuffer", str]) -> "BitBuffer":
+        """
+        Append bits at the end of the buffer.
+
+            Parameters
+                bits (Union["BitBuffer", str]): Bit buffer or binary string
+
+            Returns
+                return The bit buffer
+        """
+
+        if isinstance(bits, str):
+            bits = BitBuffer.from_string(bits)
+        if not bits.length:
+            return self
+        start = self.length
+        self.reserve(start+bits.length)
+        source = np.frombuffer(bits.to_bytes(), dtype=np.uint8)
+        index, shift = start//8, start%8
+        if shift == 0:
+            self.data[index:index+source.size] = source
+        else:
+            self.data[index] |= source[0] >> shift
+            tail = source << (8-shift)
+            tail[:-1] |= source[1:] >> shift
+            end = (start+bits.length+7)//8
+            self.data[index+1:end] = tail[:end-index-1]
+        self.length = start+bits.length
+        return self
+
+    def append_int(self, value: int, width: int) -> "BitBuffer":
+        """
+        Append an integer with the given number of bits.
+
+            Parameters
+                value (int): Unsigned integer
+                width (int): Number of bits
+
+            Returns
+                return The bit buffer
+        """
+
+        return self.append(BitBuffer.from_int(value, width))
+
+    def to_bits(self) -> np.ndarray:
+        """
+        Get the unpacked bits of the buffer.
+
+            Parameters
+                None
+
+            Returns
+                return Array of zeros and ones (uint8)
+        """
+
+        return np.unpackbits(self.packed(), count=self.length)
+
+    def to_bytes(self) -> bytes:
+        """
+        Get the packed bits of the buffer, the last byte is filled with zeros.
+
+            Parameters
+                None
+
+            Returns
+                return Bytes with the packed bits
+        """
+
+        data = self.packed().tobytes()
+        if self.length%8:
+            data = data[:-1] + bytes([data[-1] & (0xFF << (8-self.length%8)) & 0xFF])
+        return data
+
+    def to_string(self) -> str:
+        """
+        Get the bits of the buffer as a string of '0' and '1' characters.
+
+            Parameters
+                None
+
+            Returns
+                return The binary string
+        """
+
+        return (self.to_bits() + ord("0")).tobytes().decode("ascii")
+
+    def to_int(self) -> int:
+        """
+        Get the bits of the buffer as an unsigned integer.
+
+            Parameters
+                None
+
+            Returns
+                return The unsigned integer
+        """
+
+        if not self.length:
+            return 0
+        return int.from_bytes(self.to_bytes(), "big") >> ((8-self.length%8)%8)
+
+    def pad(self, length: int) -> "BitBuffer":
+        """
+        Fill the buffer with zeros up to the given length.
+
+            Parameters
+                length (int): Final number of bits
+
+            Returns
+                return The bit buffer
+        """
+
+        if length > self.length:
+            self.reserve(length)
+            self._masked()
+            self.data[(self.length+7)//8:(length+7)//8] = 0
+            self.length = length
+        return self
+
+    def repeat(self, factor: int) -> "BitBuffer":
+        """
+        Repeat each bit of the buffer, each byte becomes factor bytes.
+
+            Parameters
+                factor (int): Number of repetitions of each bit
+
+            Returns
+                return A new bit buffer with the repeated bits
+        """
+
+        if factor == 1:
+            return self
+        table = np.packbits(np.repeat(np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1), factor, axis=1), axis=1)
+        return BitBuffer(table[self.packed()].reshape(-1), self.length*factor)._masked()
+
+    def repeat_rows(self, row_length: int, factor: int) -> "BitBuffer":
+        """
+        Repeat each row of bits of the buffer, the last row is filled with zeros (with any factor).
+
+            Parameters
+                row_length (int): Number of bits of each row
+                factor (int): Number of repetitions of each row
+
+            Returns
+                return A new bit buffer with the repeated rows (empty if the buffer is empty)
+        """
+
+        if not self.length:
+            return BitBuffer()
+        rows = -(-self.length//row_length)
+        if row_length%8 == 0:
+            packed = np.zeros(rows*row_length//8, dtype=np.uint8)
+            packed[:(self.length+7)//8] = np.frombuffer(self.to_bytes(), dtype=np.uint8)
+            repeated = np.repeat(packed.reshape(rows, -1), factor, axis=0)
+            return BitBuffer(repeated.reshape(-1), rows*row_length*factor)
+        bits = np.zeros(rows*row_length, dtype=np.uint8)
+        bits[:self.length] = self.to_bits()
+        return BitBuffer.from_bits(np.repeat(bits.reshape(rows, -1), factor, axis=0).reshape(-1))
+
+    def majority(self, factor: int) -> "BitBuffer":
+        """
+        Keep the majority bit of each group of bits of the buffer (inverse of repeat), the last group
+        is filled with zeros and the ties give zero.
+
+            Parameters
+                factor (int): Number of bits of each group
+
+            Returns
+                return A new bit buffer with one bit for each group
+        """
+
+        if factor == 1:
+            return self
+        groups = -(-self.length//factor)
+        if 8%factor == 0:
+            # Each byte holds 8/factor groups, factor bytes give one byte of the result
+            packed = np.zeros(-(-groups//8)*factor, dtype=np.uint8)
+            packed[:(self.length+7)//8] = np.frombuffer(self.to_bytes(), dtype=np.uint8)
+            bits = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).reshape(256, -1, factor)
+            table = np.packbits(2*bits.sum(axis=2) > factor, axis=1, bitorder="big").reshape(-1) >> (8 - 8//factor)
+            packed = table[packed].reshape(-1, factor)
+            result = np.zeros(packed.shape[0], dtype=np.uint8)
+            for j in range(factor):
+                result |= packed[:, j] << (8 - (j+1)*(8//factor))
+            return BitBuffer(result, groups)._masked()
+        if factor%8 == 0:
+            # Count the ones of whole bytes
+            packed = np.zeros(groups*factor//8, dtype=np.uint8)
+            packed[:(self.length+7)//8] = np.frombuffer(self.to_bytes(), dtype=np.uint8)
+            counts = POPCOUNT[packed].reshape(groups, -1).sum(axis=1)
+        else:
+            bits = np.zeros(groups*factor, dtype=np.uint8)
+            bits[:self.length] = self.to_bits()
+            counts = bits.reshape(groups, factor).sum(axis=1)
+        return BitBuffer.from_bits(2*counts > factor)
+
+    def majority_rows(self, row_length: int, factor: int) -> "BitBuffer":
+        """
+        Keep the majority row of each group of rows of bits of the buffer (inverse of repeat_rows),
+        the last group is filled with zeros and the ties give zero.
+
+            Parameters
+                row_length (int): Number of bits of each row
+                factor (int): Number of rows of each group
+
+            Returns
+                return A new bit buffer with one row for each group
+        """
+
+        if factor == 1:
+            return self
+        groups = -(-self.length//(row_length*factor))
+        bits = np.zeros(groups*factor*row_length, dtype=np.uint8)
+        bits[:self.length] = self.to_bits()
+        counts = bits.reshape(groups, factor, row_length).sum(axis=1, dtype=np.int64)
+        return BitBuffer.from_bits((2*counts > factor).reshape(-1))
+
+    def fields(self, width: int) -> np.ndarray:
+        """
+        Split the buffer in fixed-width unsigned integers, the last one is filled with zeros.
+
+            Parameters
+                width (int): Number of bits of each field (up to 64)
+
+            Returns
+                return Array with the fields (uint64)
+        """
+
+        count = -(-self.length//width)
+        if width in (8, 16, 32, 64) and not self.length%width:
+            # The fields are whole bytes
+            return np.frombuffer(self.to_bytes(), dtype=f">u{width//8}").astype(np.uint64)
+        bits = np.zeros(count*width, dtype=np.uint8)
+        bits[:self.length] = self.to_bits()
+        bits = bits.reshape(count, width)
+        # The fields are built in the smallest integers that hold them
+        nbytes = next(nbytes for nbytes in (1, 2, 4, 8) if 8*nbytes >= width)
+        result = np.zeros(count, dtype=f"u{nbytes}")
+        for j in range(width):
+            result <<= 1
+            result |= bits[:, j]
+        return result.astype(np.uint64)
+
+    def iter_fields(self, width: int) -> Iterator[int]:
+        """
+        Iterate over the fixed-width unsigned integers of the buffer.
+
+            Parameters
+                width (int): Number of bits of each field
+
+            Returns
+                return Iterator with the fields
+        """
+
+        return iter(self.fields(width).tolist())
@@ -0,0 +1,191 @@
+from scripts.bit_buffer import BitBuffer
+import scripts.constants, numpy as np
+
+class CellGrid:
+    """
+    A class to represent the grid of cells of the frames.
+
+        The frame is split in cells of cell_width x cell_height pixels and each channel of a cell
+        holds cell_bits bits as one of 2^cell_bits levels between 0 and the maximal value of the
+        channel. The levels are Gray coded, so two neighbour levels only differ in one bit. The cells
+        are read from their interior (the pixels of the edges are the most blurred by the video
+        compression) with the mean of the pixels or the pixel of the center.
+
+        Attributes
+        ----------
+
+        cell_width : int
+            Number of pixels of each row of the cells
+        cell_height : int
+            Number of rows of the cells
+        cell_bits : int
+            Number of bits of each channel of the cells
+        sampling : str
+            Way to read the interior of the cells ("mean" or "center")
+        margin : tuple
+            Number of columns and rows of the edges of the cells that aren't read
+        gray : np.ndarray
+            Gray code of each level
+        levels : np.ndarray
+            Level of each symbol (inverse of the Gray code)
+
+        Methods
+        -------
+
+        __str__(self) -> str:
+            Represents the cell grid in a string format.
+        __repr__(self) -> str:
+            Represents the cell grid in a string format for data structures.
+        get_shape(self, dimensions: tuple) -> tuple:
+            Get the number of rows and columns of cells of a frame.
+        get_capacity(self, dimensions: tuple, bit_depth: int) -> int:
+            Get the number of bits of a frame.
+        get_pixels_per_bit(self, bit_depth: int) -> float:
+            Get the number of pixels of each bit.
+        to_pixel_array(self, content: "BitBuffer", bit_depth: int, dimensions: tuple) -> np.ndarray:
+            Get the pixels of a frame from its content.
+        from_pixel_array(self, pixel_array: np.ndarray) -> "BitBuffer":
+            Get the content of a frame from its pixels.
+    """
+
+    def __init__(self, cell_width: int, cell_height: int, cell_bits: int = None, sampling: str = "mean") -> None:
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        self.cell_bits = cell_bits or scripts.constants.CELL_BITS
+        self.sampling = sampling
+        if self.cell_width < 1 or self.cell_height < 1:
+            raise Exception(f"The cells ({self.cell_width}x{self.cell_height}) need at least one pixel.")
+        if not 1 <= self.cell_bits <= scripts.constants.BITS_PER_CHANNEL:
+            raise Exception(f"The cells need from 1 to {scripts.constants.BITS_PER_CHANNEL} bits per channel ({self.cell_bits}).")
+        if self.sampling not in scripts.constants.CELL_SAMPLINGS:
+            raise Exception(f"The sampling ({self.sampling}) isn't available.")
+        # The edges are skipped if the interior keeps at least one pixel
+        self.margin = tuple(
+            scripts.constants.CELL_MARGIN if length > 2*scripts.constants.CELL_MARGIN else 0
+            for length in (self.cell_width, self.cell_height)
+        )
+        self.gray = np.arange(1 << self.cell_bits) ^ (np.arange(1 << self.cell_bits) >> 1)
+        self.levels = np.argsort(self.gray)
+
+    def __str__(self) -> str:
+        """
+        Represents the cell grid in a string format.
+
+            Parameters
+                None
+
+            Returns
+                return The string format of the cell grid
+        """
+
+        return f"{self.cell_width}x{self.cell_height} ({self.cell_bits} bits, {self.sampling})"
+
+    def __repr__(self) -> str:
+        """
+        Represents the cell grid in a string format for data structures.
+
+            Parameters
+                None
+
+            Returns
+                return The string format of the cell grid
+        """
+
+        return self.__str__()
+
+    def get_shape(self, dimensions: tuple) -> tuple:
+        """
+        Get the number of rows and columns of cells of a frame (the pixels after the last cells are padding).
+
+            Parameters
+                dimensions (tuple): Dimensions (width and height) of the frame
+
+            Returns
+                return Tuple with the number of rows and columns
+        """
+
+        width, height = dimensions
+        return height//self.cell_height, width//self.cell_width
+
+    def get_capacity(self, dimensions: tuple, bit_depth: int) -> int:
+        """
+        Get the number of bits of a frame.
+
+            Parameters
+                dimensions (tuple): Dimensions (width and height) of the frame
+                bit_depth (int): Bit depth (bpp) of the frame
+
+            Returns
+                return Number of bits
+        """
+
+        rows, columns = self.get_shape(dimensions)
+        return rows*columns*max(bit_depth//scripts.constants.BITS_PER_CHANNEL, 1)*self.cell_bits
+
+    def get_pixels_per_bit(self, bit_depth: int) -> float:
+        """
+        Get the number of pixels of each bit.
+
+            Parameters
+                bit_depth (int): Bit depth (bpp) of the frame
+
+            Returns
+                return Number of pixels
+        """
+
+        return self.cell_width*self.cell_height/(max(bit_depth//scripts.constants.BITS_PER_CHANNEL, 1)*self.cell_bits)
+
+    def to_pixel_array(self, content: "BitBuffer", bit_depth: int, dimensions: tuple) -> np.ndarray:
+        """
+        Get the pixels of a frame from its content, the symbols of cell_bits bits are the channels
+        of the cells (row by row) and each cell is broadcast to its pixels.
+
+            Parameters
+                content ("BitBuffer"): Content of the frame
+                bit_depth (int): Bit depth (bpp) of the frame
+                dimensions (tuple): Dimensions (width and height) of the frame
+
+            Returns
+                return The array of pixels with shape (height, width, channels) or (height, width) with one channel
+        """
+
+        width, height = dimensions
+        rows, columns = self.get_shape(dimensions)
+        channels = max(bit_depth//scripts.constants.BITS_PER_CHANNEL, 1)
+        capacity = self.get_capacity(dimensions, bit_depth)
+        if len(content) > capacity:
+            raise Exception(f"The content ({len(content)} bits) doesn't fit in the cells ({capacity} bits).")
+        maximum = 1 if bit_depth < scripts.constants.BITS_PER_CHANNEL else (1 << scripts.constants.BITS_PER_CHANNEL) - 1
+        values = np.rint(self.levels*maximum/((1 << self.cell_bits) - 1)).astype(np.uint8)
+        symbols = np.zeros(rows*columns*channels, dtype=np.int64)
+        symbols[:-(-len(content)//self.cell_bits)] = content.fields(self.cell_bits)
+        cells = values[symbols].reshape(rows, 1, columns, 1, channels)
+        pixel_array = np.zeros((height, width, channels), dtype=np.uint8)
+        pixel_array[:rows*self.cell_height, :columns*self.cell_width] = np.broadcast_to(
+            cells, (rows, self.cell_height, columns, self.cell_width, channels)
+        ).reshape(rows*self.cell_height, columns*self.cell_width, channels)
+        return pixel_array[:, :, 0] if channels == 1 else pixel_array
+
+    def from_pixel_array(self, pixel_array: np.ndarray) -> "BitBuffer":
+        """
+        Get the content of a frame from its pixels, the interior of each cell is read with a strided
+        view of the frame and rounded to the nearest level.
+
+            Parameters
+                pixel_array (np.ndarray): Pixels of the frame
+
+            Returns
+                return The content of the frame
+        """
+
+        maximum = 1 if pixel_array.dtype == bool else (1 << scripts.constants.BITS_PER_CHANNEL) - 1
+        pixel_array = pixel_array.reshape(pixel_array.shape[0], pixel_array.shape[1], -1)
+        rows, columns = self.get_shape((pixel_array.shape[1], pixel_array.shape[0]))
+        margin_x, margin_y = self.margin
+        if self.sampling == "center":
+            cells = pixel_array[self.cell_height//2::self.cell_height, self.cell_width//2::self.cell_width][:rows, :columns]
+        else:
+            cells = pixel_array[:rows*self.cell_height, :columns*self.cell_width].reshape(rows, self.cell_height, columns, self.cell_width, -1)
+            cells = cells[:, margin_y:self.cell_height-margin_y, :, margin_x:self.cell_width-margin_x].mean(axis=(1, 3), dtype=np.float32)
+        levels = np.clip(np.rint(cells.reshape(-1)*(((1 << self.cell_bits) - 1)/maximum)), 0, (1 << self.cell_bits) - 1)
+        return BitBuffer.from_fields(self.gray[levels.astype(np.int64)], self.cell_bits)
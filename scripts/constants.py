@@ -1,5 +1,10 @@
 from scripts.encoders.huffman import Huffman
 from scripts.encoders.block import Block
+from scripts.encoders.blocked_huffman import BlockedHuffman
+from scripts.encoders.arithmetic import Arithmetic
+from scripts.encoders.rans import Rans
+from scripts.error_correctors.hamming import Hamming
+from scripts.error_correctors.reed_solomon import ReedSolomon
 import string, os
 
 # Get the current directory (from is executed the program, so is main.py folder)
@@ -102,6 +107,10 @@ TXT_FORMATS = [
     "pdf"   # Portable Document Format (can contain text)
 ]
 
+# Minimal number of symbols to count the symbols of a file with several processes
+
+PARALLEL_COUNT_LENGTH = 1 << 26
+
 # ASCII printable characters 
 
 ASCII_PRINTABLE_SYMBOLS = string.printable
@@ -118,6 +127,64 @@ SOURCE_CODE_DELIMITER = "¿"
 
 BLOCK_CODE_LENGTH = 8
 
+# Number of symbols encoded per batch
+
+ENCODE_CHUNK_LENGTH = 1 << 16
+
+# Maximal number of entries of the table of pairs of symbols
+
+PAIR_TABLE_SIZE = 1 << 16
+
+# Number of bits of the index of the decoding lookup table (up to 16) 
+
+DECODING_TABLE_BITS = 12
+
+# Maximal length of the code words of the decoding lookup tables (they are read in windows of 64 bits)
+
+MAX_CODE_WORD_LENGTH = 57
+
+# Number of bits of the segments decoded at the same time
+
+DECODING_SEGMENT_LENGTH = 1024
+
+# Maximal number of rounds to synchronize the segments before following the stream one code word at a time
+
+DECODING_SYNC_ROUNDS = 16
+
+# Number of symbols of each block of the blocked Huffman code
+
+BLOCKED_HUFFMAN_BLOCK_LENGTH = 1 << 18
+
+# Number of bits of the length of each block of the blocked Huffman code
+
+BLOCK_SIZE_FIELD_LENGTH = 32
+
+# Number of symbols of each block of the codes of the frequency models (the coder starts again in each block)
+
+FREQUENCY_MODEL_BLOCK_LENGTH = 1 << 16
+
+# Number of bits of the interval of the arithmetic code (a multiple of 8)
+
+ARITHMETIC_PRECISION = 48
+
+# Number of bits of the total of the quantized frequencies of the arithmetic code (up to ARITHMETIC_PRECISION-16)
+
+ARITHMETIC_FREQUENCY_BITS = 16
+
+# Number of bits of the total of the quantized frequencies of the rANS code (up to RANS_WORD_BITS)
+
+RANS_SCALE_BITS = 14
+
+# Number of bits of the words written by the rANS code and of its states (also used by the counters of the encoded content)
+
+RANS_WORD_BITS = 16
+RANS_STATE_BITS = 32
+
+# Maximal number of interleaved states of the rANS code and minimal number of symbols of each one
+
+RANS_LANES = 256
+RANS_LANE_LENGTH = 4096
+
 # Number of bits per channel (R, G, B)
 
 BITS_PER_CHANNEL = 8
@@ -125,16 +192,77 @@ BITS_PER_CHANNEL = 8
 # List of coding methods
 
 CODING_METHODS = {
-    "huffman" : Huffman,
-    "block"   : Block,
+    "huffman"         : Huffman,
+    "block"           : Block,
+    "blocked_huffman" : BlockedHuffman,
+    "arithmetic"      : Arithmetic,
+    "rans"            : Rans,
 }
 
+# Error correcting codes of the frames
+
+ERROR_CORRECTION_METHODS = {
+    "hamming"      : Hamming,
+    "reed_solomon" : ReedSolomon,
+}
+
+# Default number of parity bits of the Hamming code words (the code words have 2^r - 1 bits)
+
+HAMMING_PARITY_BITS = 3
+
+# Number of bytes and default number of parity bytes of the Reed-Solomon code words
+
+REED_SOLOMON_CODE_LENGTH = 255
+REED_SOLOMON_PARITY_BYTES = 32
+
+# Primitive polynomial of GF(256) (x^8 + x^4 + x^3 + x^2 + 1)
+
+GF256_PRIMITIVE_POLYNOMIAL = 0x11D
+
+# Pre-compression methods of the content (the identifier in the preamble is the position + 1, 0 is no pre-compression)
+
+COMPRESSION_METHODS = ["zlib", "lzma", "bz2"]
+
+# Default level of the pre-compression
+
+COMPRESSION_LEVEL = 9
+
+# Number of bits of each field of the preamble of the coded content (pre-compression method, level and binary flag)
+
+PREAMBLE_FIELD_LENGTH = 8
+PREAMBLE_LENGTH = 3*PREAMBLE_FIELD_LENGTH
+
+# End delimiter of the contents of bytes (outside of the byte alphabet)
+
+BYTE_END_DELIMITER = chr(256)
+
 # Minimal and maximal resolutions
 
 RESOLUTIONS = {
     "youtube" : [(256, 144), (1920, 1080)],
 }
 
+# Name of the frame images (the group is the index of the frame)
+
+FRAME_NAME_PATTERN = r"frame(\d+)\.png$"
+
+# Number of bits of each field of the frame headers (index, total frames, payload length and offset)
+
+FRAME_HEADER_FIELD_LENGTH = 32
+FRAME_HEADER_LENGTH = 4*FRAME_HEADER_FIELD_LENGTH
+
+# Default number of bits of each channel of the cells of the frames
+
+CELL_BITS = 1
+
+# Number of pixels of the edges of the cells that aren't read (the most blurred by the video compression)
+
+CELL_MARGIN = 1
+
+# Ways to read the interior of the cells (mean of the pixels or pixel of the center)
+
+CELL_SAMPLINGS = ["mean", "center"]
+
 # Bit depth
 
 BIT_DEPTH = 24
@@ -150,5 +278,19 @@ MODES = {
     32 : "RGBA", # Red-Green-Blue-Transparency
 }
 
+# Colors of the comparison heatmaps (viridis), from similarity 0 to 1
+
+HEATMAP_COLORS = [
+    (68, 1, 84),
+    (71, 44, 122),
+    (59, 81, 139),
+    (44, 113, 142),
+    (33, 144, 141),
+    (39, 173, 129),
+    (92, 200, 99),
+    (170, 220, 50),
+    (253, 231, 37),
+]
+
 # Maximun distance of two values in RGB format: 255**2 + 255**2 + 255**2
 MAX_DIST = 195075
\ No newline at end of file
@@ -1,7 +1,27 @@
 import scripts.constants
+from scripts.bit_buffer import BitBuffer
+from scripts.decoding_table import DecodingTable
+from scripts.encoders.arithmetic import Arithmetic
+from scripts.encoders.block import Block
+from scripts.encoders.rans import Rans
+from scripts.source_code import SourceCode
 from scripts.misc import *
 from PIL import Image
-import os
+from typing import Iterable, Iterator, List
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from bisect import bisect_left, bisect_right
+from collections import deque
+from functools import partial
+from time import perf_counter
+import cv2, os, re, json, zlib, lzma, numpy as np
+
+
+class DecodingError(Exception):
+    """
+    An exception raised when the coded content read from the frames can't be decoded
+    (the video compression changed the frames too much).
+    """
+
 
 class Decoder:
     """
@@ -12,26 +32,133 @@ class Decoder:
 
         folder_path : str
             Path of the folder
+        canonical : bool
+            The coded content starts with a canonical source code
+        coding_method : str
+            Name of the coding method of the coded content
+        bit_width : int
+            Number of repetitions of each bit
+        bit_height : int
+            Number of repetitions of each row of the frames
+        workers : int
+            Number of workers to decode the frames and the blocks (1 to decode them in the main thread)
+        executor : str
+            Pool of the workers ("thread" or "process")
+        row_length : int
+            Number of bits of each row of the frames (None until a frame is read)
+        compression : str
+            Name of the pre-compression method of the content (None until the preamble is read or if there isn't one)
+        compression_level : int
+            Level of the pre-compression
+        decompression_time : float
+            Seconds spent undoing the pre-compression
+        binary : bool
+            The content is the bytes of a file, each symbol is a byte (otherwise it's text)
+        error_corrector : "ErrorCorrector"
+            Error correcting code of the content of each frame (None if the bits are only repeated)
+        cell_grid : "CellGrid"
+            Grid of cells of the frames (None if the bits and the rows are repeated)
 
         Methods
         -------
 
-        get_coded_content_from_img(self, file_path: str) -> str:
+        get_row_length(self, pixel_array: np.ndarray) -> int:
+            Get the number of bits of each row of a frame.
+        get_coded_content_from_array(self, pixel_array: np.ndarray) -> "BitBuffer":
+            Get the coded content from the pixels of a frame.
+        get_coded_content_from_img(self, file_path: str) -> "BitBuffer":
             Get the coded content from the image.
-        get_coded_content(self) -> str:
+        get_frame_content(self, frame: object) -> tuple:
+            Get the header and the payload of a frame without redundancy.
+        get_frame_paths(self) -> List[str]:
+            Get the paths of the frames of the folder sorted by their index.
+        get_frames(self, frames: Iterable = None) -> List[tuple]:
+            Get the header and the payload of the frames sorted by the index of their header.
+        get_coded_content(self, frames: Iterable = None) -> "BitBuffer":
             Get the coded content from the video.
-        decode_inverse_source_code(self, coded_content: str) -> tuple:
+        decode_preamble(self, coded_content: "BitBuffer") -> int:
+            Decode the pre-compression method, level and binary flag from the preamble of the coded content.
+        decompress(self, content: str) -> str:
+            Undo the pre-compression of the decoded content.
+        save_content(self, content: str, file_path: str) -> None:
+            Write the decoded content into a file.
+        decode_inverse_source_code(self, coded_content: "BitBuffer", start: int = 0) -> tuple:
             Decode the inverse source code.
-        remove_redundancy(self, coded_content: str, pixel_width: int) -> str:
+        decode_canonical_source_code(self, coded_content: "BitBuffer", start: int = 0) -> tuple:
+            Decode the canonical source code.
+        decode_source_code(self, coded_content: "BitBuffer", start: int = 0) -> tuple:
+            Decode the source code of the coded content.
+        remove_redundancy(self, coded_content: "BitBuffer", bit_width: int, bit_height: int = 1, row_length: int = None) -> "BitBuffer":
             Remove redundancy from the coded content.
-        decode(self, coded_content: str) -> str:
+        decode_content_by_bit(self, coded_content: "BitBuffer") -> str:
+            Decode the coded content without redundancy one bit at a time.
+        decode_content(self, coded_content: "BitBuffer") -> str:
+            Decode the coded content without redundancy with the lookup tables of the source code (or the decoder of the coding method).
+        decode(self, coded_content: "BitBuffer") -> str:
             Decode the coded content.
+        decode_blocks(self, coded_content: "BitBuffer") -> str:
+            Decode the blocks of the blocked coding methods.
+        decode_block(block: tuple) -> str:
+            Decode a block of the blocked coding methods.
+        get_segment_decoder(self, coded_content: "BitBuffer") -> tuple:
+            Get the function that decodes the segments of the coded content from its header.
+        decode_frames(self, frames: Iterable = None) -> str:
+            Decode each frame on its own.
+        load_seek_index(self, file_path: str) -> dict:
+            Load the seek index of the video.
+        read_frame_range(self, first: int, count: int, video_file_path: str = None) -> Iterator[np.ndarray]:
+            Read some consecutive frames.
+        decode_range(self, start: int, length: int, video_file_path: str = None, index_file_path: str = None) -> str:
+            Decode a range of characters.
     """
 
-    def __init__(self, folder_path: str) -> None:
+    def __init__(self, folder_path: str, canonical: bool = False, bit_width: int = 1, bit_height: int = 1, workers: int = 1, executor: str = "thread", coding_method: str = "huffman", error_corrector: "ErrorCorrector" = None, cell_grid: "CellGrid" = None) -> None:
         self.folder_path = folder_path
+        self.canonical = canonical
+        self.coding_method = coding_method
+        self.bit_width = bit_width
+        self.bit_height = bit_height
+        self.workers = workers
+        self.executor = executor
+        self.row_length = None
+        self.compression = None
+        self.compression_level = 0
+        self.decompression_time = 0.0
+        self.binary = False
+        self.error_corrector = error_corrector
+        self.cell_grid = cell_grid
+
+    def get_row_length(self, pixel_array: np.ndarray) -> int:
+        """
+        Get the number of bits of each row of a frame.
+
+            Parameters
+                pixel_array (np.ndarray): Pixels of the frame
 
-    def get_coded_content_from_img(self, file_path: str) -> str:
+            Returns
+                return Number of bits of each row
+        """
+
+        return pixel_array[0].size*(1 if pixel_array.dtype == bool else 8)
+
+    def get_coded_content_from_array(self, pixel_array: np.ndarray) -> "BitBuffer":
+        """
+        Get the coded content from the pixels of a frame.
+
+            Parameters
+                pixel_array (np.ndarray): Pixels of the frame
+
+            Returns
+                return The coded content from the frame
+        """
+
+        self.row_length = self.get_row_length(pixel_array)
+        if pixel_array.dtype == bool:
+            # Black and white images have one bit per pixel
+            return BitBuffer.from_bits(pixel_array.reshape(-1))
+        return BitBuffer.from_bytes(np.ascontiguousarray(pixel_array).tobytes())
+
+    def get_coded_content_from_img(self, file_path: str) -> "BitBuffer":
         """
         Get the coded content from the image.
 
@@ -42,100 +169,527 @@ class Decoder:
                 return The coded content from the image
         """
 
-        coded_content = ""
-        pixel_array = list(Image.open(file_path).getdata())
-        for pixel in pixel_array:
-            for val in pixel:
-                coded_content += int_to_bin_left_padding(val, scripts.constants.BITS_PER_CHANNEL)
-        return coded_content
+        return self.get_coded_content_from_array(np.asarray(Image.open(file_path)))
 
-    def get_coded_content(self) -> str:
+    def get_frame_content(self, frame: object) -> tuple:
         """
-        Get the coded content from the video.
+        Get the header and the payload of a frame without redundancy (it runs in the workers), the
+        bits left by the majority votes (or read from the cells) are corrected with the error correcting code (if there is one).
+
+            Parameters
+                frame (object): Path of the image, PIL image or array of the frame
+
+            Returns
+                return Tuple with the index of the frame, the total frames, the offset of the first code word and the payload
+        """
+
+        pixel_array = np.asarray(Image.open(frame) if isinstance(frame, str) else frame)
+        if self.cell_grid is not None:
+            frame_content = self.cell_grid.from_pixel_array(pixel_array)
+        else:
+            # The groups of repeated rows and bits don't cross the frames
+            frame_content = self.get_coded_content_from_array(pixel_array)
+            frame_content = self.remove_redundancy(frame_content, 1, self.bit_height, self.get_row_length(pixel_array))
+            frame_content = self.remove_redundancy(frame_content[:len(frame_content) - len(frame_content)%self.bit_width], self.bit_width)
+        if self.error_corrector is not None:
+            frame_content = self.error_corrector.decode(frame_content)
+        index, total, payload_length, offset = (int(value) for value in frame_content[:scripts.constants.FRAME_HEADER_LENGTH].fields(scripts.constants.FRAME_HEADER_FIELD_LENGTH))
+        payload = frame_content[scripts.constants.FRAME_HEADER_LENGTH:scripts.constants.FRAME_HEADER_LENGTH+payload_length]
+        return index, total, offset, payload
+
+    def get_frame_paths(self) -> List[str]:
+        """
+        Get the paths of the frames of the folder sorted by their index, the other files are ignored.
 
             Parameters
                 None
 
             Returns
-                return The coded content from the video
+                return List with the paths of the frames
         """
 
-        coded_content = ""
+        frames = []
         for filename in os.listdir(self.folder_path):
             file_path = os.path.join(self.folder_path, filename)
-            if os.path.isfile(file_path):
-                coded_content += self.get_coded_content_from_img(file_path)
+            match = re.search(scripts.constants.FRAME_NAME_PATTERN, filename)
+            if match and os.path.isfile(file_path):
+                frames.append((int(match.group(1)), file_path))
+        return [file_path for _, file_path in sorted(frames)]
+
+    def get_frames(self, frames: Iterable = None) -> List[tuple]:
+        """
+        Get the header and the payload of the frames sorted by the index of their header, with several
+        workers the frames are decoded in a pool and at most 2*workers frames are pending at the same time.
+
+            Parameters
+                frames (Iterable): Frames (PIL images or arrays) to decode instead of the images of the folder
+
+            Returns
+                return List with the index, the total frames, the offset and the payload of each frame
+        """
+
+        if frames is None:
+            frames = self.get_frame_paths()
+        if self.workers <= 1:
+            return sorted(map(self.get_frame_content, frames), key=lambda frame: frame[0])
+        executor_class = ProcessPoolExecutor if self.executor == "process" else ThreadPoolExecutor
+        contents, pending = [], deque()
+        with executor_class(max_workers=self.workers) as executor:
+            for frame in frames:
+                pending.append(executor.submit(self.get_frame_content, frame))
+                if len(pending) >= 2*self.workers:
+                    contents.append(pending.popleft().result())
+            while pending:
+                contents.append(pending.popleft().result())
+        return sorted(contents, key=lambda frame: frame[0])
+
+    def get_coded_content(self, frames: Iterable = None) -> "BitBuffer":
+        """
+        Get the coded content from the video.
+
+            Parameters
+                frames (Iterable): Frames (PIL images or arrays) to decode instead of the images of the folder
+
+            Returns
+                return The coded content from the video (without redundancy)
+        """
+
+        frames = self.get_frames(frames)
+        missing = sorted(set(range(frames[0][1] if frames else 0)) - {frame[0] for frame in frames})
+        if missing:
+            raise DecodingError(f"The frames ({missing}) are missing.")
+        coded_content = BitBuffer()
+        for _, _, _, payload in frames:
+            coded_content.append(payload)
         return coded_content
 
-    def decode_inverse_source_code(self, coded_content: str) -> tuple:
+    def decode_preamble(self, coded_content: "BitBuffer") -> int:
+        """
+        Decode the pre-compression method, level and binary flag from the preamble of the coded content.
+
+            Parameters
+                coded_content ("BitBuffer"): The coded content from the image of the text file
+
+            Returns
+                return Last index of the preamble
+        """
+
+        length = scripts.constants.PREAMBLE_FIELD_LENGTH
+        method = coded_content[:length].to_int()
+        if method > len(scripts.constants.COMPRESSION_METHODS):
+            raise DecodingError(f"The compression method ({method}) of the preamble isn't available.")
+        self.compression = scripts.constants.COMPRESSION_METHODS[method-1] if method else None
+        self.compression_level = coded_content[length:2*length].to_int()
+        self.binary = bool(coded_content[2*length:3*length].to_int())
+        return scripts.constants.PREAMBLE_LENGTH
+
+    def decompress(self, content: str) -> str:
+        """
+        Undo the pre-compression of the decoded content (each symbol is a byte of the compressed content).
+
+            Parameters
+                content (str): The decoded content
+
+            Returns
+                return The original content or raise a DecodingError
+        """
+
+        if self.compression is None:
+            return content
+        start = perf_counter()
+        try:
+            # The bytes of a binary content stay one symbol each
+            content = decompress_bytes(content.encode("latin-1"), self.compression).decode("latin-1" if self.binary else "utf-8")
+        except (zlib.error, lzma.LZMAError, OSError, UnicodeError) as e:
+            raise DecodingError(f"The {self.compression} content can't be decompressed ({e}).") from e
+        self.decompression_time += perf_counter() - start
+        return content
+
+    def save_content(self, content: str, file_path: str) -> None:
+        """
+        Write the decoded content into a file, the binary contents are written as the exact original bytes.
+
+            Parameters
+                content (str): The decoded content
+                file_path (str): Path of the file
+
+            Returns
+                return None
+        """
+
+        if self.binary:
+            with open(file_path, "wb") as file:
+                file.write(content.encode("latin-1"))
+        else:
+            with open(file_path, "w", encoding="utf-8") as file:
+                file.write(content)
+
+    def decode_inverse_source_code(self, coded_content: "BitBuffer", start: int = 0) -> tuple:
         """
         Decode the inverse source code.
 
             Parameters
-                coded_content (str): The coded content from the image of the text file
+                coded_content ("BitBuffer"): The coded content from the image of the text file
+                start (int): Position of the inverse source code
 
             Returns
-                return Tuple with dictionary representing the inverse source code and last index of the content
+                return Tuple with dictionary representing the inverse source code and last index of the content or raise a DecodingError
         """
 
-        inverse_source_code, i = {}, 0
-        value = coded_content[i:i+scripts.constants.BLOCK_CODE_LENGTH]
+        inverse_source_code, i = {}, start
+        length = scripts.constants.BLOCK_CODE_LENGTH
+        value = coded_content[i:i+length].to_int()
         # Get the inverse source code
-        while value != character_to_binary(scripts.constants.SOURCE_CODE_DELIMITER, scripts.constants.BLOCK_CODE_LENGTH):
-            length = int(coded_content[i+scripts.constants.BLOCK_CODE_LENGTH:i+scripts.constants.BLOCK_CODE_LENGTH*2], 2)
-            key = coded_content[i+scripts.constants.BLOCK_CODE_LENGTH*2:i+scripts.constants.BLOCK_CODE_LENGTH*2+length]
-            inverse_source_code[key] = binary_to_character(value)
-            i = i+scripts.constants.BLOCK_CODE_LENGTH*2+length
-            value = coded_content[i:i+scripts.constants.BLOCK_CODE_LENGTH]
-        return inverse_source_code, i+scripts.constants.BLOCK_CODE_LENGTH
+        while value != ord(scripts.constants.SOURCE_CODE_DELIMITER):
+            if i + 2*length > len(coded_content):
+                raise DecodingError("The inverse source code doesn't end with the delimiter.")
+            key_length = coded_content[i+length:i+2*length].to_int()
+            if key_length == 0 or i + 2*length + key_length > len(coded_content):
+                raise DecodingError(f"The code word of the inverse source code ({key_length} bits at {i}) is invalid.")
+            key = coded_content[i+2*length:i+2*length+key_length].to_string()
+            inverse_source_code[key] = chr(value)
+            i = i+2*length+key_length
+            value = coded_content[i:i+length].to_int()
+        return inverse_source_code, i+length
+
+    def decode_canonical_source_code(self, coded_content: "BitBuffer", start: int = 0) -> tuple:
+        """
+        Decode the canonical source code (the code words are rebuilt from the number of code words of each length).
+
+            Parameters
+                coded_content ("BitBuffer"): The coded content from the image of the text file
+                start (int): Position of the canonical source code
+
+            Returns
+                return Tuple with dictionary representing the inverse source code, the end symbol and last index of the content or raise a DecodingError
+        """
+
+        i = start
+        symbol_width = coded_content[i:i+scripts.constants.BLOCK_CODE_LENGTH].to_int()
+        max_length = coded_content[i+scripts.constants.BLOCK_CODE_LENGTH:i+scripts.constants.BLOCK_CODE_LENGTH*2].to_int()
+        if not 0 < max_length <= scripts.constants.MAX_CODE_WORD_LENGTH:
+            raise DecodingError(f"The length of the longest code word of the canonical source code ({max_length}) is invalid.")
+        i += scripts.constants.BLOCK_CODE_LENGTH*2
+        counts = [int(count) for count in coded_content[i:i+(symbol_width+1)*max_length].fields(symbol_width+1)]
+        i += (symbol_width+1)*max_length
+        n = sum(counts)
+        if i + symbol_width*(n+1) > len(coded_content):
+            # The coded content ends in the source code (the last index is past the end)
+            return {}, None, i + symbol_width*(n+1)
+        # The code words of a prefix code satisfy the Kraft inequality
+        if not n or sum(count << (max_length-length) for length, count in enumerate(counts, 1)) > 1 << max_length:
+            raise DecodingError(f"The number of code words of each length ({counts}) isn't a prefix code.")
+        end_symbol, = to_symbols([coded_content[i:i+symbol_width].to_int()])
+        i += symbol_width
+        symbols = to_symbols(coded_content[i:i+symbol_width*n].fields(symbol_width))
+        lengths = [length for length, count in enumerate(counts, 1) for _ in range(count)]
+        code_words = SourceCode.canonical_code_words(lengths)
+        return dict(zip(code_words, symbols)), end_symbol, i+symbol_width*n
+
+    def decode_source_code(self, coded_content: "BitBuffer", start: int = 0) -> tuple:
+        """
+        Decode the source code of the coded content.
+
+            Parameters
+                coded_content ("BitBuffer"): The coded content from the image of the text file
+                start (int): Position of the source code
+
+            Returns
+                return Tuple with dictionary representing the inverse source code, the end symbol and last index of the content
+        """
+
+        if self.canonical:
+            return self.decode_canonical_source_code(coded_content, start)
+        inverse_source_code, i = self.decode_inverse_source_code(coded_content, start)
+        if not inverse_source_code:
+            raise DecodingError("The inverse source code is empty.")
+        # The end delimiter is the last symbol of the source
+        return inverse_source_code, list(inverse_source_code.values())[-1], i
 
-    def remove_redundancy(self, coded_content: str, pixel_width: int) -> str:
+    def remove_redundancy(self, coded_content: "BitBuffer", bit_width: int, bit_height: int = 1, row_length: int = None) -> "BitBuffer":
         """
-        Remove redundancy from the coded content.
+        Remove redundancy from the coded content with the majority of each group of repeated rows and bits.
 
             Parameters
-                coded_content (str): The coded content from the image of the text file
-                pixel_width (int): Width of the pixels
+                coded_content ("BitBuffer"): The coded content from the image of the text file
+                bit_width (int): Number of repetitions of each bit
+                bit_height (int): Number of repetitions of each row
+                row_length (int): Number of bits of each row (needed if bit_height > 1)
 
             Returns
                 return The new coded content without redundancy
         """
 
-        new_coded_content = ""
-        for i in range(0, len(coded_content), pixel_width):
-            cnt0, cnt1 = 0, 0
-            for j in coded_content[i:i+pixel_width]:
-                if j == "0":
-                    cnt0 += 1
-                elif j == "1":
-                    cnt1 += 1
-            if cnt0 > cnt1:
-                new_coded_content += "0"
-            elif cnt1 > cnt0:
-                new_coded_content += "1"
-            else:
-                new_coded_content += "0"
-        return new_coded_content
+        if bit_height > 1:
+            # The last rows that don't fill a group are padding
+            groups_length = len(coded_content) - len(coded_content)%(row_length*bit_height)
+            coded_content = coded_content[:groups_length].majority_rows(row_length, bit_height)
+        return coded_content.majority(bit_width)
 
-    def decode(self, coded_content: str) -> str:
+    def decode_content_by_bit(self, coded_content: "BitBuffer") -> str:
         """
-        Decode the coded content.
+        Decode the coded content without redundancy one bit at a time.
 
             Parameters
-                coded_content (str): The coded content from the image of the text file
+                coded_content ("BitBuffer"): The coded content without redundancy
 
             Returns
                 return The original content
         """
 
-        coded_content = self.remove_redundancy(coded_content, scripts.constants.PIXEL_WIDTH)
-        inverse_source_code, i = self.decode_inverse_source_code(coded_content)
-        content, sub, end_delimiter = "", "", list(inverse_source_code.keys())[-1]
-        for ch in range(i, len(coded_content)):
-            sub += coded_content[ch]
-            if sub == end_delimiter:
-                break
+        inverse_source_code, end_symbol, i = self.decode_source_code(coded_content, self.decode_preamble(coded_content))
+        content, sub = "", ""
+        for bit in coded_content[i:]:
+            sub += "01"[bit]
             if sub in inverse_source_code:
+                if inverse_source_code[sub] == end_symbol:
+                    break
                 content += inverse_source_code[sub]
                 sub = ""
-        return content
+        return self.decompress(content)
+
+    def decode_content(self, coded_content: "BitBuffer") -> str:
+        """
+        Decode the coded content without redundancy with the lookup tables of the source code (or the decoder of the coding method).
+
+            Parameters
+                coded_content ("BitBuffer"): The coded content without redundancy
+
+            Returns
+                return The original content
+        """
+
+        decode_segment, i = self.get_segment_decoder(coded_content)
+        return self.decompress(decode_segment(coded_content[i:]))
+
+    def decode(self, coded_content: "BitBuffer") -> str:
+        """
+        Decode the coded content.
+
+            Parameters
+                coded_content ("BitBuffer"): The coded content from the frames (without redundancy)
+
+            Returns
+                return The original content
+        """
+
+        return self.decode_content(coded_content)
+
+    def decode_blocks(self, coded_content: "BitBuffer") -> str:
+        """
+        Decode the blocks of the blocked coding methods, each block has a flag (1 if it has its own
+        canonical source code), the canonical source code, the number of bits of its code words and
+        the code words. With several workers the blocks are decoded in a pool of the executor.
+
+            Parameters
+                coded_content ("BitBuffer"): The coded content without redundancy (starting with a block with its own source code)
+
+            Returns
+                return The original content
+        """
+
+        blocks, decoding_table, end_symbol, i = [], None, None, 0
+        while i + 1 + scripts.constants.BLOCK_SIZE_FIELD_LENGTH <= len(coded_content):
+            if coded_content[i]:
+                inverse_source_code, end_symbol, i = self.decode_canonical_source_code(coded_content, i+1)
+                if i > len(coded_content):
+                    # The segment ends in the source code of the block
+                    break
+                decoding_table = DecodingTable(inverse_source_code)
+            elif decoding_table is None:
+                raise DecodingError("The first block doesn't have its own source code.")
+            else:
+                i += 1
+            size = coded_content[i:i+scripts.constants.BLOCK_SIZE_FIELD_LENGTH].to_int()
+            i += scripts.constants.BLOCK_SIZE_FIELD_LENGTH
+            blocks.append((decoding_table, coded_content[i:i+size], end_symbol))
+            i += size
+
+        if self.workers <= 1:
+            return "".join(map(self.decode_block, blocks))
+        executor_class = ProcessPoolExecutor if self.executor == "process" else ThreadPoolExecutor
+        with executor_class(max_workers=self.workers) as executor:
+            return "".join(executor.map(self.decode_block, blocks))
+
+    @staticmethod
+    def decode_block(block: tuple) -> str:
+        """
+        Decode a block of the blocked coding methods (it runs in the workers).
+
+            Parameters
+                block (tuple): Decoding table, code words and end symbol of the block
+
+            Returns
+                return The content of the block
+        """
+
+        decoding_table, block_content, end_symbol = block
+        return decoding_table.decode(block_content, end_symbol)
+
+    def get_segment_decoder(self, coded_content: "BitBuffer") -> tuple:
+        """
+        Get the function that decodes the segments of the coded content from its header (after the preamble).
+
+            Parameters
+                coded_content ("BitBuffer"): The coded content of the first frame
+
+            Returns
+                return Tuple with the function and the position of the first code word
+        """
+
+        start = self.decode_preamble(coded_content)
+        if self.coding_method == "blocked_huffman":
+            return self.decode_blocks, start
+        if self.coding_method == "block":
+            model, i = Block.decode_header(coded_content, start)
+            return partial(Block.decode, model), i
+        if self.coding_method == "arithmetic":
+            model, i = Arithmetic.decode_header(coded_content, start)
+            return partial(Arithmetic.decode, model), i
+        if self.coding_method == "rans":
+            model, i = Rans.decode_header(coded_content, start)
+            return partial(Rans.decode, model), i
+        inverse_source_code, end_symbol, i = self.decode_source_code(coded_content, start)
+        if i > len(coded_content):
+            raise DecodingError("The source code runs past the end of the first frame.")
+        return partial(DecodingTable(inverse_source_code).decode, end_symbol=end_symbol), i
+
+    def decode_frames(self, frames: Iterable = None) -> str:
+        """
+        Decode each frame on its own: the code words (or blocks) that start in a frame are decoded
+        from the offset of its header, the missing frames only lose their own content. The frames with
+        a corrupted header (an index past the total frames of the first frame or another total) are
+        missing frames, and the code word (or block) cut by a missing frame is dropped.
+
+            Parameters
+                frames (Iterable): Frames (PIL images or arrays) to decode instead of the images of the folder
+
+            Returns
+                return The original content
+        """
+
+        frames = {frame[0]: frame for frame in self.get_frames(frames)}
+        total = frames[0][1] if 0 in frames else 0
+        frames = {index: frame for index, frame in frames.items() if index < total and frame[1] == total}
+        if 0 not in frames:
+            raise DecodingError("The first frame (source code) is missing.")
+        decode_segment, i = self.get_segment_decoder(frames[0][3])
+
+        def decode_frame(index: int) -> str:
+            _, _, offset, payload = frames[index]
+            offset = i if index == 0 else offset
+            if offset >= len(payload):
+                # The frame only holds the end of a code word of the previous frames
+                return ""
+            segment = payload[offset:]
+            while index+1 in frames:
+                # The last code word ends in the next frame with a code word that starts in it
+                index += 1
+                _, _, offset, payload = frames[index]
+                segment = segment + payload[:offset]
+                if offset < len(payload):
+                    break
+            # A segment followed by a missing frame ends in a cut code word (or block), the decoders drop it
+            return decode_segment(segment)
+
+        indexes = sorted(frames)
+        if self.workers <= 1 or self.coding_method == "blocked_huffman":
+            contents = map(decode_frame, indexes)
+        else:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                contents = list(executor.map(decode_frame, indexes))
+        return self.decompress("".join(contents))
+
+    def load_seek_index(self, file_path: str) -> dict:
+        """
+        Load the seek index of the video.
+
+            Parameters
+                file_path (str): Path of the seek index
+
+            Returns
+                return Dictionary with the number of characters, the number of frames and the checkpoints
+        """
+
+        if not os.path.isfile(file_path):
+            raise Exception(f"The seek index ({file_path}) doesn't exist.")
+        with open(file_path, "r") as f:
+            return json.load(f)
+
+    def read_frame_range(self, first: int, count: int, video_file_path: str = None) -> Iterator[np.ndarray]:
+        """
+        Read some consecutive frames, the video is seeked to the first one.
+
+            Parameters
+                first (int): Index of the first frame
+                count (int): Number of frames
+                video_file_path (str): Path of the video (None to read the images of the folder)
+
+            Returns
+                return Iterator over the RGB arrays of the frames
+        """
+
+        if video_file_path is None:
+            for index in range(first, first+count):
+                yield np.asarray(Image.open(os.path.join(self.folder_path, f"frame{index}.png")))
+            return
+        video_capture = cv2.VideoCapture(video_file_path)
+        if not video_capture.isOpened():
+            raise Exception(f"The video ({video_file_path}) couldn't be opened.")
+        video_capture.set(cv2.CAP_PROP_POS_FRAMES, first)
+        for _ in range(count):
+            ret, frame = video_capture.read()
+            if not ret:
+                break
+            yield cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        video_capture.release()
+
+    def decode_range(self, start: int, length: int, video_file_path: str = None, index_file_path: str = None) -> str:
+        """
+        Decode a range of characters, the seek index gives the frames that hold the range so
+        only those frames (and the first one, with the source code) are read and decoded.
+
+            Parameters
+                start (int): Index of the first character
+                length (int): Number of characters
+                video_file_path (str): Path of the video (None to read the images of the folder)
+                index_file_path (str): Path of the seek index (None to use the one next to the video)
+
+            Returns
+                return The characters of the range
+        """
+
+        if index_file_path is None:
+            if video_file_path is None:
+                raise Exception("The seek index is required to decode a range of the frames.")
+            index_file_path = os.path.splitext(video_file_path)[0]+".json"
+        seek_index = self.load_seek_index(index_file_path)
+        # The end delimiter isn't part of the content
+        end = min(start+length, seek_index["characters"]-1)
+        if start < 0 or start >= end:
+            return ""
+
+        # Frames of the first character and of the first code word after the range
+        characters = [checkpoint["character"] for checkpoint in seek_index["checkpoints"]]
+        first = max(bisect_right(characters, start)-1, 0)
+        following = bisect_left(characters, end)
+        last = seek_index["frames"]-1 if following == len(characters) else bisect_right(characters, characters[following])-1
+        count = last - first + 1
+        frames = self.get_frames(self.read_frame_range(first, count, video_file_path))
+        if [frame[0] for frame in frames] != list(range(first, first+count)):
+            raise DecodingError(f"The frames ({first} to {first+count-1}) couldn't be read.")
+        header = frames[0] if first == 0 else self.get_frames(self.read_frame_range(0, 1, video_file_path))[0]
+        decode_segment, i = self.get_segment_decoder(header[3])
+        if self.compression is not None:
+            raise Exception(f"The ranges of a pre-compressed content ({self.compression}) can't be decoded on their own.")
+
+        coded_content = BitBuffer()
+        for _, _, _, payload in frames:
+            coded_content.append(payload)
+        stop = len(coded_content)
+        if following < len(characters):
+            # Only the end of the last code word is read from the last frame
+            stop -= len(frames[-1][3]) - frames[-1][2]
+        content = decode_segment(coded_content[i if first == 0 else frames[0][2]:stop])
+        character = characters[first]
+        return content[start-character:end-character]
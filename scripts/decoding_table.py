@@ -0,0 +1,257 @@
+from scripts.bit_buffer import BitBuffer
+import scripts.constants, numpy as np
+
+
+class DecodingTable:
+    """
+    A class to decode prefix codes with lookup tables.
+
+        The first table_bits bits of each position give the symbol and the length of
+        the code word, the code words longer than table_bits are searched in a sorted
+        fallback table. The stream is split in segments that are decoded at the same
+        time and then synchronized (the code words of a prefix code resynchronize
+        after a few symbols when the decoding starts in the middle of a code word).
+
+        Attributes
+        ----------
+
+        inverse_source_code : dict
+            Dictionary with the code words (keys) and the symbols (values)
+        symbols : List[str]
+            Symbols of the source code
+        codes : np.ndarray
+            Code words as unsigned integers
+        lengths : np.ndarray
+            Length of each code word
+        max_length : int
+            Length of the longest code word
+        table_bits : int
+            Number of bits of the lookup table index
+        table_symbols : np.ndarray
+            Symbol index of each entry of the lookup table (-1 for long or invalid code words)
+        table_lengths : np.ndarray
+            Code word length of each entry of the lookup table (0 for long or invalid code words)
+        fallback : tuple
+            Sorted ranges of the long code words (lows, highs, symbol indexes, lengths)
+
+        Methods
+        -------
+
+        build_table(self) -> tuple:
+            Build the lookup table of the short code words.
+        build_fallback(self) -> tuple:
+            Build the sorted table of the long code words.
+        get_windows(self, words: np.ndarray, positions: np.ndarray, width: int) -> np.ndarray:
+            Get the bits after each position as unsigned integers.
+        lookup(self, words: np.ndarray, positions: np.ndarray) -> tuple:
+            Get the symbol index and the code word length of each position.
+        walk(self, words: np.ndarray, mark: np.ndarray, starts: np.ndarray, ends: np.ndarray, value: bool, sync: bool) -> tuple:
+            Follow the code words of several segments at the same time.
+        get_positions(self, words: np.ndarray, length: int) -> np.ndarray:
+            Get the starting position of each code word of the stream.
+        decode(self, coded_content: "BitBuffer", end_symbol: str = None) -> str:
+            Decode the coded content.
+    """
+
+    def __init__(self, inverse_source_code: dict) -> None:
+        self.inverse_source_code = inverse_source_code
+        self.symbols = list(inverse_source_code.values())
+        code_words = list(inverse_source_code.keys())
+        self.codes = np.array([int(code_word, 2) for code_word in code_words], dtype=np.uint64)
+        self.lengths = np.array([len(code_word) for code_word in code_words], dtype=np.int64)
+        self.max_length = int(self.lengths.max())
+        if self.max_length > scripts.constants.MAX_CODE_WORD_LENGTH:
+            raise Exception(f"The code words are longer than {scripts.constants.MAX_CODE_WORD_LENGTH} bits ({self.max_length}).")
+        self.table_bits = min(self.max_length, scripts.constants.DECODING_TABLE_BITS)
+        self.table_symbols, self.table_lengths = self.build_table()
+        self.fallback = self.build_fallback()
+
+    def build_table(self) -> tuple:
+        """
+        Build the lookup table of the short code words.
+
+            Parameters
+                None
+
+            Returns
+                return Tuple with the symbol index and the code word length of each entry
+        """
+
+        table_symbols = np.full(1 << self.table_bits, -1, dtype=np.int32)
+        table_lengths = np.zeros(1 << self.table_bits, dtype=np.int64)
+        for i in np.flatnonzero(self.lengths <= self.table_bits):
+            # Every index starting with the code word decodes the symbol
+            free_bits = self.table_bits - int(self.lengths[i])
+            low = int(self.codes[i]) << free_bits
+            table_symbols[low:low + (1 << free_bits)] = i
+            table_lengths[low:low + (1 << free_bits)] = self.lengths[i]
+        return table_symbols, table_lengths
+
+    def build_fallback(self) -> tuple:
+        """
+        Build the sorted table of the long code words.
+
+            Parameters
+                None
+
+            Returns
+                return Tuple with the ranges (lows, highs) of max_length bits starting with each long code word,
+                the symbol indexes and the code word lengths
+        """
+
+        indexes = np.flatnonzero(self.lengths > self.table_bits)
+        free_bits = (self.max_length - self.lengths[indexes]).astype(np.uint64)
+        lows = self.codes[indexes] << free_bits
+        highs = (self.codes[indexes] + np.uint64(1)) << free_bits
+        order = np.argsort(lows)
+        return lows[order], highs[order], indexes[order], self.lengths[indexes][order]
+
+    def get_windows(self, words: np.ndarray, positions: np.ndarray, width: int) -> np.ndarray:
+        """
+        Get the bits after each position as unsigned integers.
+
+            Parameters
+                words (np.ndarray): The 32 bits after each byte of the packed bits (uint32)
+                positions (np.ndarray): Bit positions
+                width (int): Number of bits of each window (up to 57)
+
+            Returns
+                return Array with the windows
+        """
+
+        index, offset = positions >> 3, positions & 7
+        if width <= 25:
+            return ((words[index] << offset.astype(np.uint32)) >> np.uint32(32 - width)) & np.uint32((1 << width) - 1)
+        windows = (words[index].astype(np.uint64) << np.uint64(32)) | words[index+4]
+        return ((windows << offset.astype(np.uint64)) >> np.uint64(64 - width)) & np.uint64((1 << width) - 1)
+
+    def lookup(self, words: np.ndarray, positions: np.ndarray) -> tuple:
+        """
+        Get the symbol index and the code word length of each position.
+
+            Parameters
+                words (np.ndarray): The 32 bits after each byte of the packed bits (uint32)
+                positions (np.ndarray): Bit positions
+
+            Returns
+                return Tuple with the symbol indexes (-1 if invalid) and the lengths (0 if invalid)
+        """
+
+        windows = self.get_windows(words, positions, self.table_bits)
+        symbols, lengths = self.table_symbols[windows], self.table_lengths[windows]
+        long = np.flatnonzero(lengths == 0)
+        if long.size and self.fallback[0].size:
+            lows, highs, indexes, long_lengths = self.fallback
+            windows = self.get_windows(words, positions[long], self.max_length)
+            candidate = np.maximum(np.searchsorted(lows, windows, side="right") - 1, 0)
+            valid = (windows >= lows[candidate]) & (windows < highs[candidate])
+            symbols[long] = np.where(valid, indexes[candidate], -1)
+            lengths[long] = np.where(valid, long_lengths[candidate], 0)
+        return symbols, lengths
+
+    def walk(self, words: np.ndarray, mark: np.ndarray, starts: np.ndarray, ends: np.ndarray, value: bool, sync: bool) -> tuple:
+        """
+        Follow the code words of several segments at the same time, setting the mark of each position.
+        The invalid code words advance one bit.
+
+            Parameters
+                words (np.ndarray): The 32 bits after each byte of the packed bits (uint32)
+                mark (np.ndarray): Mark of every bit position
+                starts (np.ndarray): First position of each segment
+                ends (np.ndarray): End of each segment
+                value (bool): Value to set in the mark of the positions
+                sync (bool): Stop each walk in the first position already marked
+
+            Returns
+                return Tuple with the last position of each walk and the synchronization position (-1 if it didn't happen)
+        """
+
+        positions, synced = starts.copy(), np.full(starts.size, -1, dtype=np.int64)
+        active = np.flatnonzero(positions < ends)
+        while active.size:
+            current = positions[active]
+            if sync:
+                hit = mark[current]
+                synced[active[hit]] = current[hit]
+                active, current = active[~hit], current[~hit]
+            mark[current] = value
+            current = current + np.maximum(self.lookup(words, current)[1], 1)
+            positions[active] = current
+            active = active[current < ends[active]]
+        return positions, synced
+
+    def get_positions(self, words: np.ndarray, length: int) -> np.ndarray:
+        """
+        Get the starting position of each code word of the stream.
+
+            Parameters
+                words (np.ndarray): The 32 bits after each byte of the packed bits (uint32)
+                length (int): Number of bits
+
+            Returns
+                return Array with the positions
+        """
+
+        segment_length = max(scripts.constants.DECODING_SEGMENT_LENGTH, 2*self.max_length)
+        begins = np.arange(0, length, segment_length, dtype=np.int64)
+        ends = np.minimum(begins + segment_length, length)
+        mark = np.zeros(length, dtype=bool)
+
+        # Decode every segment from its first bit
+        exits, _ = self.walk(words, mark, begins, ends, True, False)
+
+        # The true start of each segment is the exit of the previous one
+        for _ in range(scripts.constants.DECODING_SYNC_ROUNDS):
+            entries = np.concatenate([[0], exits[:-1]])
+            wrong = np.flatnonzero(entries != begins)
+            if not wrong.size:
+                return np.flatnonzero(mark)
+            new_exits, synced = self.walk(words, mark, entries[wrong], ends[wrong], True, True)
+            # Remove the positions of the old walk before the synchronization
+            self.walk(words, mark, begins[wrong], np.where(synced >= 0, synced, ends[wrong]), False, False)
+            exits[wrong] = np.where(synced >= 0, exits[wrong], new_exits)
+            begins[wrong] = entries[wrong]
+
+        # The code doesn't synchronize (e.g. fixed length code words), follow the rest of the stream
+        entries = np.concatenate([[0], exits[:-1]])
+        wrong = np.flatnonzero(entries != begins)
+        if not wrong.size:
+            return np.flatnonzero(mark)
+        start = int(entries[wrong[0]])
+        steps = np.maximum(self.lookup(words, np.arange(start, length))[1], 1).tolist()
+        positions, position = [], start
+        while position < length:
+            positions.append(position)
+            position += steps[position-start]
+        # The marks of the earlier walks of the segment can be before its true start
+        mark[int(wrong[0])*segment_length:] = False
+        mark[positions] = True
+        return np.flatnonzero(mark)
+
+    def decode(self, coded_content: "BitBuffer", end_symbol: str = None) -> str:
+        """
+        Decode the coded content.
+
+            Parameters
+                coded_content ("BitBuffer"): The coded content (without the source code)
+                end_symbol (str): Symbol that ends the content
+
+            Returns
+                return The original content
+        """
+
+        length = len(coded_content)
+        if not length:
+            return ""
+        data = np.concatenate([np.frombuffer(coded_content.to_bytes(), dtype=np.uint8), np.zeros(8, dtype=np.uint8)]).astype(np.uint32)
+        words = (data[:-3] << 24) | (data[1:-2] << 16) | (data[2:-1] << 8) | data[3:]
+        positions = self.get_positions(words, length)
+        symbols, lengths = self.lookup(words, positions)
+
+        # Remove the incomplete and invalid code words
+        symbols = symbols[(positions + lengths <= length) & (lengths > 0)]
+        if end_symbol is not None and end_symbol in self.symbols:
+            end = np.flatnonzero(symbols == self.symbols.index(end_symbol))
+            symbols = symbols[:end[0]] if end.size else symbols
+        codepoints = np.array([ord(symbol) for symbol in self.symbols], dtype="<u4")
+        return codepoints[symbols].tobytes().decode("utf-32-le")
@@ -1,7 +1,9 @@
 from scripts.entity import Entity
 from scripts.encoders.huffman import Huffman
 from scripts.source import Source
-import scripts.constants
+from scripts.bit_buffer import BitBuffer
+from scripts.misc import *
+import scripts.constants, numpy as np
 
 
 class Encoder(Entity):
@@ -17,10 +19,22 @@ class Encoder(Entity):
             Source of the text file (Symbols, Probability Distribution)
         args : tuple
             Extra arguments of the coding method
+        canonical : bool
+            Use the canonical source code (binary code words only)
+        compression : str
+            Name of the pre-compression method of the content (None if the content isn't compressed)
+        compression_level : int
+            Level of the pre-compression
+        binary : bool
+            The content is the bytes of the file (otherwise its text)
         encoder : Object 
             Conding method to encode the file content
         source_code : "SourceCode"
             Source code from the encoder
+        code_table : tuple
+            Lookup tables of the source code (symbol index, code words and lengths)
+        pair_table : tuple
+            Lookup tables of the pairs of symbols (code words and lengths) or None
 
         Methods
         -------
@@ -29,23 +43,60 @@ class Encoder(Entity):
             Check if the coding method exist.
         select_coding_method(self) -> object:
             Select the coding method.
-        add_redundancy(self, coded_content: str, bit_width: int) -> str:
+        check_output_symbols(self) -> bool:
+            Check if the output symbols of the coding method are binary.
+        get_code_table(self) -> tuple:
+            Build the lookup tables of the source code.
+        get_pair_table(self) -> tuple:
+            Build the lookup tables of the pairs of symbols.
+        preamble_to_string(self) -> str:
+            Convert the pre-compression method, level and binary flag into the preamble of the coded content.
+        check_inverse_source_code(self) -> bool:
+            Check if the inverse source code can hold the source code.
+        source_code_to_string(self, end_symbol: str) -> str:
+            Convert the source code into the header of the coded content.
+        add_redundancy(self, coded_content: "BitBuffer", bit_width: int) -> "BitBuffer":
             Add redundancy to the coded content.
-        encode(self, content: str) -> str:
+        encode_by_symbol(self, content: str) -> str:
+            Encode the content one symbol at a time (string concatenation).
+        pack_code_words(self, codes: np.ndarray, lengths: np.ndarray, symbols: np.ndarray) -> "BitBuffer":
+            Pack the code words of a sequence of symbols into 64 bits words.
+        get_symbols(self, content: str) -> np.ndarray:
+            Get the symbol index of each character of the content.
+        get_positions(self, content: str, start: int = 0) -> np.ndarray:
+            Get the position of the first bit of each code word of the encoded content.
+        encode(self, content: str) -> "BitBuffer":
             Encode the content.
     """
 
     valid_kwargs = {
         "coding_method" : str,
         "source"        : Source,
-        "args"          : list
+        "args"          : list,
+        "canonical"     : bool,
+        "compression"   : str,
+        "compression_level" : int,
+        "binary"        : bool,
     }
 
     def __init__(self, **kwargs: dict) -> None:
+        # Default values
+        self.canonical = False
+        self.compression = None
+        self.compression_level = 0
+        self.binary = False
         # Validate the kwargs arguments
         self.validate_kwargs(kwargs, self.valid_kwargs) 
+        if self.compression is not None and self.compression not in scripts.constants.COMPRESSION_METHODS:
+            raise Exception(f"The compression method ({self.compression}) isn't available.")
         self.encoder = self.select_coding_method()
+        if not self.check_output_symbols():
+            raise Exception(f"The coding method ({self.coding_method}) needs the binary output symbols ['0', '1'] to encode the content ({self.encoder.output_symbols}), the d-ary code words (d > 2) can't be written in the frames.")
         self.source_code = self.encoder.get_source_code()
+        if self.canonical:
+            self.source_code = self.source_code.canonical()
+        self.code_table = self.get_code_table()
+        self.pair_table = self.get_pair_table()
 
     def check_coding_method(self) -> bool:
         """
@@ -76,35 +127,244 @@ class Encoder(Entity):
         else:
             raise Exception(f"Coding method ({self.coding_method}) doesn't exist.")
 
-    def add_redundancy(self, coded_content: str, bit_width: int) -> str:
+    def check_output_symbols(self) -> bool:
+        """
+        Check if the output symbols of the coding method are binary, the coded content is a string
+        of bits (the d-ary codes are only built by the coding methods).
+
+            Parameters
+                None
+
+            Returns
+                return True if the output symbols are 0 and 1, False otherwise
+        """
+
+        return list(self.encoder.output_symbols) == ["0", "1"]
+
+    def get_code_table(self) -> tuple:
+        """
+        Build the lookup tables of the source code.
+
+            Parameters
+                None
+
+            Returns
+                return Tuple with the symbol index of each codepoint (-1 if the symbol doesn't exist), 
+                the code words (left aligned in 64 bits) and the length of each code word
+        """
+
+        symbols, code_words = list(self.source_code.map.keys()), list(self.source_code.map.values())
+        lengths = np.array([len(code_word) for code_word in code_words], dtype=np.int64)
+
+        # Codepoint -> symbol index
+        index = get_symbol_index(symbols)
+
+        # Symbol index -> code word (left aligned in 64 bits)
+        if lengths.max() > 64:
+            raise Exception(f"The code words of the coding method ({self.coding_method}) are longer than 64 bits.")
+        codes = np.array([int(code_word, 2) << (64-len(code_word)) if code_word else 0 for code_word in code_words], dtype=np.uint64)
+        return index, codes, lengths
+
+    def get_pair_table(self) -> tuple:
+        """
+        Build the lookup tables of the pairs of symbols, so two symbols are encoded with one code word.
+
+            Parameters
+                None
+
+            Returns
+                return Tuple with the code words (left aligned in 64 bits) and the length of each pair of symbols 
+                (the index of the pair is first*n + second), or None if the table is too big
+        """
+
+        _, codes, lengths = self.code_table
+        if lengths.size**2 > scripts.constants.PAIR_TABLE_SIZE or 2*lengths.max() > 64:
+            return None
+        pair_codes = codes[:, None] | (codes[None, :] >> lengths[:, None].astype(np.uint64))
+        pair_lengths = lengths[:, None] + lengths[None, :]
+        return pair_codes.reshape(-1), pair_lengths.reshape(-1)
+
+    def preamble_to_string(self) -> str:
+        """
+        Convert the pre-compression method, level and binary flag into the preamble of the coded content
+        (it goes before the source code, so the decoder knows how to undo the pre-compression and
+        whether the content is text or bytes).
+
+            Parameters
+                None
+
+            Returns
+                return String preamble format
+        """
+
+        method = 0 if self.compression is None else scripts.constants.COMPRESSION_METHODS.index(self.compression)+1
+        return "".join(
+            int_to_bin_left_padding(value, scripts.constants.PREAMBLE_FIELD_LENGTH)
+            for value in (method, self.compression_level, int(self.binary))
+        )
+
+    def check_inverse_source_code(self) -> bool:
+        """
+        Check if the inverse source code can hold the source code, its fields have BLOCK_CODE_LENGTH
+        bits (the symbols and the lengths of the code words) and it ends with the source code delimiter.
+
+            Parameters
+                None
+
+            Returns
+                return True if the inverse source code can hold the source code, False otherwise
+        """
+
+        limit = 1 << scripts.constants.BLOCK_CODE_LENGTH
+        return all(
+            ord(symbol) < limit and symbol != scripts.constants.SOURCE_CODE_DELIMITER and len(self.source_code.map[symbol]) < limit
+            for symbol in self.source_code.symbols1
+        )
+
+    def source_code_to_string(self, end_symbol: str) -> str:
+        """
+        Convert the source code into the header of the coded content, the canonical source code
+        or the inverse source code followed by the source code delimiter (the coding methods that
+        encode the content by themselves write their own header).
+
+            Parameters
+                end_symbol (str): Symbol that ends the content
+
+            Returns
+                return String source code format
+        """
+
+        if self.encoder.encodes_content:
+            return self.encoder.header_to_string(end_symbol)
+        if self.canonical:
+            return self.source_code.canonical_source_code_to_string(end_symbol, scripts.constants.BLOCK_CODE_LENGTH)
+        if not self.check_inverse_source_code():
+            raise Exception(f"The inverse source code can't hold symbols above {(1 << scripts.constants.BLOCK_CODE_LENGTH) - 1}, the delimiter ({scripts.constants.SOURCE_CODE_DELIMITER}) or long code words (use the canonical source code).")
+        inverse_source_code_str = self.source_code.inverse().inverse_source_code_to_string(scripts.constants.BLOCK_CODE_LENGTH)
+        return inverse_source_code_str + character_to_binary(scripts.constants.SOURCE_CODE_DELIMITER, scripts.constants.BLOCK_CODE_LENGTH)
+
+    def add_redundancy(self, coded_content: "BitBuffer", bit_width: int) -> "BitBuffer":
         """
         Add redundancy to the coded content.
 
             Parameters
-                coded_content (str): The coded content of the image of the text file
+                coded_content ("BitBuffer"): The coded content of the image of the text file
                 bit_width (int): Width of the bit
 
             Returns
                 return The new coded content with redundancy
         """
 
-        new_coded_content = ""
-        for bit in coded_content:
-            new_coded_content += bit*bit_width
-        return new_coded_content
+        return coded_content.repeat(bit_width)
 
-    def encode(self, content: str) -> str:
+    def encode_by_symbol(self, content: str) -> str:
         """
-        Encode the content.
+        Encode the content one symbol at a time, the code words are concatenated into a string
+        (the original encoder, it's the reference of the benchmark of the table encoder).
 
             Parameters
                 content (str): Text file content to encode
 
             Returns
-                return The encoded content
+                return The encoded content in string format
         """
 
-        encoded_content = "" 
+        encoded_content = ""
         for ch in content:
             encoded_content += self.source_code.map[ch]
         return encoded_content
+
+    def pack_code_words(self, codes: np.ndarray, lengths: np.ndarray, symbols: np.ndarray) -> "BitBuffer":
+        """
+        Pack the code words of a sequence of symbols into 64 bits words.
+
+            Parameters
+                codes (np.ndarray): Code words (left aligned in 64 bits)
+                lengths (np.ndarray): Length of each code word
+                symbols (np.ndarray): Symbol index of each character
+
+            Returns
+                return The packed code words
+        """
+
+        if not symbols.size:
+            return BitBuffer()
+        code, length = codes[symbols], lengths[symbols]
+        ends = np.cumsum(length)
+        starts = ends - length
+
+        # Each code word is split between the word where it starts (high) and the next one (low)
+        offset = (starts & 63).astype(np.uint64)
+        high = code >> offset
+        low = np.where(offset > 0, code << ((np.uint64(64) - offset) & np.uint64(63)), np.uint64(0))
+
+        # Every word has at least one code word starting on it, the code words don't overlap
+        first = np.searchsorted(starts, np.arange(0, int(starts[-1])+1, 64))
+        words = np.zeros(first.size+1, dtype=np.uint64)
+        words[:-1] = np.bitwise_or.reduceat(high, first)
+        words[1:] |= np.bitwise_or.reduceat(low, first)
+        return BitBuffer(words.astype(">u8").view(np.uint8), int(ends[-1]))._masked()
+
+    def get_symbols(self, content: str) -> np.ndarray:
+        """
+        Get the symbol index of each character of the content.
+
+            Parameters
+                content (str): Text file content
+
+            Returns
+                return Array with the symbol indexes
+        """
+
+        symbols = get_symbol_indexes(content, self.code_table[0])
+        if (symbols < 0).any():
+            raise Exception("The content has symbols without code word.")
+        return symbols
+
+    def get_positions(self, content: str, start: int = 0) -> np.ndarray:
+        """
+        Get the position of the first bit of each code word of the encoded content (the coding
+        methods that encode the content by themselves give the first position where each character can be decoded).
+
+            Parameters
+                content (str): Text file content
+                start (int): Position of the first code word
+
+            Returns
+                return Array with the positions (int64)
+        """
+
+        if self.encoder.encodes_content:
+            return self.encoder.get_positions(content, start)
+        lengths = self.code_table[2][self.get_symbols(content)]
+        return start + np.concatenate([[0], np.cumsum(lengths[:-1])]).astype(np.int64)
+
+    def encode(self, content: str) -> "BitBuffer":
+        """
+        Encode the content, some coding methods encode it by themselves.
+
+            Parameters
+                content (str): Text file content to encode
+
+            Returns
+                return The encoded content
+        """
+
+        if self.encoder.encodes_content:
+            return self.encoder.encode(content)
+        _, codes, lengths = self.code_table
+        symbols = self.get_symbols(content)
+
+        # Encode two symbols with each code word if it's possible, the single code words are stored after the pairs
+        if self.pair_table:
+            pair_codes, pair_lengths = self.pair_table
+            n, even = lengths.size, symbols.size - symbols.size%2
+            pairs = symbols[0:even:2].astype(np.int64)*n + symbols[1:even:2]
+            symbols = np.concatenate([pairs, n*n + symbols[even:]])
+            codes, lengths = np.concatenate([pair_codes, codes]), np.concatenate([pair_lengths, lengths])
+
+        encoded_content = BitBuffer()
+        encoded_content.reserve(int(lengths[symbols].sum()))
+        for i in range(0, symbols.size, scripts.constants.ENCODE_CHUNK_LENGTH):
+            encoded_content.append(self.pack_code_words(codes, lengths, symbols[i:i+scripts.constants.ENCODE_CHUNK_LENGTH]))
+        return encoded_content
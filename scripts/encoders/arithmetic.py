@@ -0,0 +1,166 @@
+from scripts.encoders.frequency_model import FrequencyModel
+from scripts.bit_buffer import BitBuffer
+from scripts.misc import *
+from typing import List
+import numpy as np
+
+# scripts.constants is imported in the methods because it imports the coding methods
+
+class Arithmetic(FrequencyModel):
+    """
+    A class of the arithmetic code method with fixed precision (range coder).
+
+        The interval [low, low + width) has ARITHMETIC_PRECISION bits and is split with the
+        quantized frequencies of the source (their total is 2^ARITHMETIC_FREQUENCY_BITS). The
+        interval is renormalized one byte at a time, so the encoded content is written and read
+        in whole bytes. The model is stored in the header of the frequency model and the interval
+        starts again in each block, the coder is flushed at the end of each block with one byte.
+
+        Attributes
+        ----------
+
+        source : "Source"
+            Source of the text file (Symbols, Probability Distribution)
+        output_symbols : List[str]
+            The output symbols of the coding method (binary)
+        frequency_bits : int
+            Number of bits of the total of the frequencies (ARITHMETIC_FREQUENCY_BITS)
+        n : int
+            Number of symbols
+        frequencies : List[int]
+            Quantized frequency of each symbol
+        end_symbol : str
+            Symbol that ends the content (the last symbol of the source)
+        cumulative : List[int]
+            Cumulative frequency of each symbol (n+1 values, the last one is the total)
+        block_length : int
+            Number of symbols of each block
+        layout : np.ndarray
+            First bit of each block of the last encoded content
+
+        Methods
+        -------
+
+        carry(encoded: bytearray) -> None:
+            Add a carry of low to the bytes already written.
+        encode_block(self, symbols: np.ndarray) -> "BitBuffer":
+            Encode the symbol indexes of a block.
+        decode_header(coded_content: "BitBuffer", start: int = 0) -> tuple:
+            Decode the model from the header of the coded content.
+        decode_block(model: tuple, coded_content: "BitBuffer") -> str:
+            Decode a block with the model.
+    """
+
+    def __init__(self, source: "Source", output_symbols: List[str] = ["0", "1"], block_length: int = None) -> None:
+        import scripts.constants
+        super().__init__(source, output_symbols, scripts.constants.ARITHMETIC_FREQUENCY_BITS, block_length)
+        self.end_symbol = self.source.symbols[-1]
+        self.cumulative = [0] + np.cumsum(self.frequencies).tolist()
+
+    @staticmethod
+    def carry(encoded: bytearray) -> None:
+        """
+        Add a carry of low to the bytes already written.
+
+            Parameters
+                encoded (bytearray): Bytes already written
+
+            Returns
+                return None
+        """
+
+        j = len(encoded) - 1
+        while encoded[j] == 0xFF:
+            encoded[j] = 0
+            j -= 1
+        encoded[j] += 1
+
+    def encode_block(self, symbols: np.ndarray) -> "BitBuffer":
+        """
+        Encode the symbol indexes of a block, the bytes of low that can't change anymore are written as soon as the
+        width gets below 2^(ARITHMETIC_PRECISION-8) and a carry of low is added to the bytes already written. The
+        block ends with the first byte of a point of the final interval (its other bytes are zeros).
+
+            Parameters
+                symbols (np.ndarray): Symbol indexes of the block
+
+            Returns
+                return The encoded block
+        """
+
+        import scripts.constants
+        cumulative, frequencies, scale = self.cumulative, self.frequencies, self.frequency_bits
+        precision = scripts.constants.ARITHMETIC_PRECISION
+        top, bottom = 1 << precision, 1 << (precision-8)
+        low, width, encoded = 0, top - 1, bytearray()
+        for i in symbols.tolist():
+            step = width >> scale
+            low, width = low + step*cumulative[i], step*frequencies[i]
+            if low >= top:
+                low -= top
+                self.carry(encoded)
+            while width < bottom:
+                encoded.append(low >> (precision-8))
+                low, width = (low << 8) & (top-1), width << 8
+        # The width is at least 2^(ARITHMETIC_PRECISION-8), so the interval holds a multiple of it
+        point = (low + bottom - 1) & ~(bottom - 1)
+        if point >= top:
+            point -= top
+            self.carry(encoded)
+        encoded.append(point >> (precision-8))
+        return BitBuffer.from_bytes(bytes(encoded))
+
+    @staticmethod
+    def decode_header(coded_content: "BitBuffer", start: int = 0) -> tuple:
+        """
+        Decode the model from the header of the coded content.
+
+            Parameters
+                coded_content ("BitBuffer"): The coded content
+                start (int): Position of the header
+
+            Returns
+                return Tuple with the model (symbols, frequencies, end symbol and block length) and last index of the header
+        """
+
+        import scripts.constants
+        return FrequencyModel.decode_model(coded_content, scripts.constants.ARITHMETIC_FREQUENCY_BITS, start)
+
+    @staticmethod
+    def decode_block(model: tuple, coded_content: "BitBuffer") -> str:
+        """
+        Decode a block with the model, the decoding stops after the end symbol, after block length symbols or when the bits run out.
+
+            Parameters
+                model (tuple): Symbols, frequencies, end symbol and block length
+                coded_content ("BitBuffer"): The encoded block
+
+            Returns
+                return The content of the block
+        """
+
+        import scripts.constants
+        symbols, frequencies, end_symbol, block_length = model
+        cumulative, frequencies = [0] + np.cumsum(frequencies).tolist(), frequencies.tolist()
+        total = cumulative[-1]
+        scale = total.bit_length() - 1
+        # Symbol index of each cumulative frequency
+        lookup = np.repeat(np.arange(len(symbols)), frequencies).tolist()
+        precision = scripts.constants.ARITHMETIC_PRECISION
+        bottom, nbytes = 1 << (precision-8), precision//8
+        # The bytes after the end are zeros
+        data = coded_content.to_bytes()
+        size = len(data)
+        value = int.from_bytes(data[:nbytes].ljust(nbytes, b"\0"), "big")
+        width, position, content = (1 << precision) - 1, nbytes, []
+        while position <= size + nbytes and len(content) < block_length:
+            step = width >> scale
+            i = lookup[min(value//step, total-1)]
+            content.append(symbols[i])
+            if symbols[i] == end_symbol:
+                break
+            value, width = value - step*cumulative[i], step*frequencies[i]
+            while width < bottom:
+                value = (value << 8) | (data[position] if position < size else 0)
+                position, width = position + 1, width << 8
+        return "".join(content)
@@ -1,24 +1,35 @@
 from scripts.source_code import SourceCode
 from scripts.encoders.coding_method import CodingMethod
+from scripts.bit_buffer import BitBuffer
 from scripts.misc import *
 from typing import List
-from math import ceil, log
+import numpy as np
+
+# scripts.constants is imported in the methods because it imports the coding methods
 
 class Block(CodingMethod):
     """
     A class of the Block code method.
 
+        Every symbol gets a code word of block_length d-ary digits (the index of the symbol in
+        base d). With binary output symbols the code words are fixed-width fields, so the content
+        is encoded and decoded by packing and unpacking the symbol indexes (the Encoder rejects the
+        d-ary code words with d > 2, they can't be written in the frames). The header has the next format:
+            symbol width + block length + number of symbols + end symbol + symbols sorted by their index
+
         Attributes
         ----------
 
-        source : "Source" 
+        source : "Source"
             Source of the text file (Symbols, Probability Distribution)
         output_symbols : List[str]
             The output symbols of the coding method
         d : int
-            The arity of the Block code 
+            The arity of the Block code
         n : int
             Number of symbols
+        block_length : int
+            Number of d-ary digits of each code word
 
         Methods
         -------
@@ -27,17 +38,36 @@ class Block(CodingMethod):
             Represents the Block codification in a string format.
         __repr__(self) -> str:
             Represents the Block codification in a string format for data structures.
+        get_block_length(self) -> int:
+            Get the number of d-ary digits to index the symbols.
         run(self) -> List[str]:
             Execute the entire Block codification algorihtm.
         get_source_code(self) -> "SourceCode":
             Get the source code from the Block code.
+        header_to_string(self, end_symbol: str) -> str:
+            Convert the symbols into the header of the coded content.
+        get_symbols(self, content: str) -> np.ndarray:
+            Get the symbol index of each character of the content.
+        encode(self, content: str) -> "BitBuffer":
+            Encode the content.
+        get_positions(self, content: str, start: int = 0) -> np.ndarray:
+            Get the position of the code word of each character.
+        decode_header(coded_content: "BitBuffer", start: int = 0) -> tuple:
+            Decode the symbols from the header of the coded content.
+        decode(model: tuple, coded_content: "BitBuffer") -> str:
+            Decode the coded content with the symbols.
     """
 
-    def __init__(self, source: "Source", output_symbols: List[str]) -> None: 
+    encodes_content = True
+
+    def __init__(self, source: "Source", output_symbols: List[str]) -> None:
         super().__init__(source)
         self.output_symbols = output_symbols
         self.d = len(self.output_symbols)
         self.n = len(self.source.symbols)
+        if self.d < 2:
+            raise Exception(f"The block code needs at least two output symbols ({self.output_symbols}).")
+        self.block_length = self.get_block_length()
 
     def __str__(self) -> str:
         """
@@ -45,7 +75,7 @@ class Block(CodingMethod):
 
             Parameters
                 None
-    
+
             Returns
                 return The string format of the block codification
         """
@@ -58,38 +88,179 @@ class Block(CodingMethod):
 
             Parameters
                 None
-    
+
             Returns
                 return The string format of the block codification
         """
 
         return self.source.__str__()
 
-    def run(self) -> List[str]:
+    def get_block_length(self) -> int:
         """
-        Execute the entire Huffman codification algorihtm.
+        Get the number of d-ary digits to index the symbols (the smallest k with d^k >= n, at least 1).
 
             Parameters
                 None
-    
+
             Returns
-                return The root of the tree
+                return The length of the code words
         """
 
-        block_length = ceil(log(self.n, self.d))
-        num_code_words = 2**block_length
-        return [int_to_bin_left_padding(code_word, block_length) for code_word in range(num_code_words)]
+        block_length, code_words = 1, self.d
+        while code_words < self.n:
+            block_length, code_words = block_length+1, code_words*self.d
+        return block_length
 
+    def run(self) -> List[str]:
+        """
+        Execute the entire Block codification algorihtm, the code word of each symbol is its index in base d.
+
+            Parameters
+                None
+
+            Returns
+                return List with the code word of each symbol
+        """
+
+        code_words = []
+        for index in range(self.n):
+            digits = []
+            for _ in range(self.block_length):
+                index, digit = divmod(index, self.d)
+                digits.append(self.output_symbols[digit])
+            code_words.append("".join(reversed(digits)))
+        return code_words
 
     def get_source_code(self) -> "SourceCode":
         """
-        Get the source code from the Huffman code.
+        Get the source code from the Block code.
 
             Parameters
                 None
-    
+
+            Returns
+                return Source code of the Block code
+        """
+
+        return SourceCode(
+            symbols1=self.source.symbols,
+            symbols2=self.run()
+        )
+
+    def header_to_string(self, end_symbol: str) -> str:
+        """
+        Convert the symbols into the header of the coded content (the number of symbols fits in block length + 1 bits).
+
+            Parameters
+                end_symbol (str): Symbol that ends the content
+
+            Returns
+                return String header format
+        """
+
+        import scripts.constants
+        symbol_width = max(ord(symbol) for symbol in self.source.symbols + [end_symbol]).bit_length()
+        header = int_to_bin_left_padding(symbol_width, scripts.constants.BLOCK_CODE_LENGTH)
+        header += int_to_bin_left_padding(self.block_length, scripts.constants.BLOCK_CODE_LENGTH)
+        header += int_to_bin_left_padding(self.n, self.block_length+1)
+        header += character_to_binary(end_symbol, symbol_width)
+        return header + "".join(character_to_binary(symbol, symbol_width) for symbol in self.source.symbols)
+
+    def get_symbols(self, content: str) -> np.ndarray:
+        """
+        Get the symbol index of each character of the content.
+
+            Parameters
+                content (str): Text file content
+
+            Returns
+                return Array with the symbol indexes (int64)
+        """
+
+        symbols = get_symbol_indexes(content, get_symbol_index(self.source.symbols))
+        if (symbols < 0).any():
+            raise Exception("The content has symbols without code word.")
+        return symbols
+
+    def encode(self, content: str) -> "BitBuffer":
+        """
+        Encode the content, the symbol indexes are packed in fields of block_length bits.
+
+            Parameters
+                content (str): Text file content to encode
+
+            Returns
+                return The encoded content
+        """
+
+        if list(self.output_symbols) != ["0", "1"]:
+            raise Exception(f"The block code needs binary output symbols to encode the content ({self.output_symbols}).")
+        return BitBuffer.from_fields(self.get_symbols(content), self.block_length)
+
+    def get_positions(self, content: str, start: int = 0) -> np.ndarray:
+        """
+        Get the position of the code word of each character (every code word has block_length bits).
+
+            Parameters
+                content (str): Text file content
+                start (int): Position of the encoded content
+
+            Returns
+                return Array with the positions (int64)
+        """
+
+        return start + self.block_length*np.arange(len(content), dtype=np.int64)
+
+    @staticmethod
+    def decode_header(coded_content: "BitBuffer", start: int = 0) -> tuple:
+        """
+        Decode the symbols from the header of the coded content.
+
+            Parameters
+                coded_content ("BitBuffer"): The coded content
+                start (int): Position of the header
+
+            Returns
+                return Tuple with the model (symbols, end symbol and block length) and last index of the header or raise a DecodingError
+        """
+
+        import scripts.constants
+        from scripts.decoder import DecodingError
+        i = start
+        symbol_width = coded_content[i:i+scripts.constants.BLOCK_CODE_LENGTH].to_int()
+        i += scripts.constants.BLOCK_CODE_LENGTH
+        block_length = coded_content[i:i+scripts.constants.BLOCK_CODE_LENGTH].to_int()
+        i += scripts.constants.BLOCK_CODE_LENGTH
+        if not symbol_width or not block_length:
+            raise DecodingError(f"The widths of the header of the block code ({symbol_width}, {block_length}) are invalid.")
+        n = coded_content[i:i+block_length+1].to_int()
+        i += block_length+1
+        if not n or i + symbol_width*(n+1) > len(coded_content):
+            raise DecodingError(f"The symbols of the header of the block code ({n}) are missing or run past the end of the coded content.")
+        end_symbol, = to_symbols([coded_content[i:i+symbol_width].to_int()])
+        i += symbol_width
+        symbols = to_symbols(coded_content[i:i+symbol_width*n].fields(symbol_width))
+        return (symbols, end_symbol, block_length), i+symbol_width*n
+
+    @staticmethod
+    def decode(model: tuple, coded_content: "BitBuffer") -> str:
+        """
+        Decode the coded content with the symbols, the fields of block_length bits are the symbol
+        indexes. The decoding stops in the end symbol, the incomplete and invalid fields are removed.
+
+            Parameters
+                model (tuple): Symbols, end symbol and block length
+                coded_content ("BitBuffer"): The encoded content (without the header)
+
             Returns
-                return Source code of the Huffman code
+                return The original content
         """
 
-        return SourceCode(self.source.symbols, self.run())
+        symbols, end_symbol, block_length = model
+        indexes = coded_content[:len(coded_content) - len(coded_content)%block_length].fields(block_length)
+        indexes = indexes[indexes < len(symbols)]
+        if end_symbol in symbols:
+            end = np.flatnonzero(indexes == symbols.index(end_symbol))
+            indexes = indexes[:end[0]] if end.size else indexes
+        codepoints = np.array([ord(symbol) for symbol in symbols], dtype="<u4")
+        return codepoints[indexes].tobytes().decode("utf-32-le")
@@ -0,0 +1,220 @@
+from scripts.encoders.coding_method import CodingMethod
+from scripts.encoders.huffman import Huffman
+from scripts.source import Source
+from scripts.bit_buffer import BitBuffer
+from scripts.misc import *
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, List
+import numpy as np
+
+# scripts.constants is imported in the methods because it imports the coding methods
+
+class BlockedHuffman(CodingMethod):
+    """
+    A class of the blocked Huffman code method.
+
+        The content is split in blocks of block_length symbols, each block has its own canonical
+        Huffman code or reuses the code of the previous block when it's cheaper. Each block is
+        stored as a flag (1 if it has its own code) + canonical source code (if the flag is 1) +
+        number of bits of the code words + code words, so the blocks with their own code can be
+        decoded on their own.
+
+        Attributes
+        ----------
+
+        source : "Source"
+            Source of the text file (Symbols, Probability Distribution)
+        output_symbols : List[str]
+            The output symbols of the coding method
+        block_length : int
+            Number of symbols of each block
+        workers : int
+            Number of workers to encode the blocks (1 to encode them in the main process)
+        executor : str
+            Pool of the workers ("process" or "thread")
+        end_symbol : str
+            Symbol that ends the content (the last symbol of the source)
+        layout : tuple
+            First character, first bit and flag of each block of the last encoded content
+
+        Methods
+        -------
+
+        get_source_code(self) -> "SourceCode":
+            Get the source code of the whole content.
+        get_block_encoder(content: str, output_symbols: List[str]) -> "Encoder":
+            Build the encoder of a block with its own canonical Huffman code.
+        get_cost(encoder: "Encoder", content: str) -> float:
+            Get the number of bits of a block encoded with an encoder.
+        encode_block(encoder: "Encoder", content: str, source_code_str: str) -> "BitBuffer":
+            Encode a block.
+        map(self, function: Callable, *iterables) -> list:
+            Apply a function to each block, in a pool with several workers.
+        encode(self, content: str) -> "BitBuffer":
+            Encode the content block by block.
+        get_positions(self, content: str, start: int = 0) -> np.ndarray:
+            Get the position of the block with its own code that holds each character.
+    """
+
+    encodes_content = True
+
+    def __init__(self, source: "Source", output_symbols: List[str], block_length: int = None, workers: int = 1, executor: str = "process") -> None:
+        import scripts.constants
+        super().__init__(source)
+        self.output_symbols = output_symbols
+        self.block_length = block_length or scripts.constants.BLOCKED_HUFFMAN_BLOCK_LENGTH
+        self.workers = workers
+        self.executor = executor
+        self.end_symbol = self.source.symbols[-1]
+        self.layout = None
+        if self.executor not in ("process", "thread"):
+            raise Exception(f"The executor ({self.executor}) isn't available.")
+
+    def get_source_code(self) -> "SourceCode":
+        """
+        Get the source code of the whole content (Huffman code of the global statistics).
+
+            Parameters
+                None
+
+            Returns
+                return Source code of the Huffman code
+        """
+
+        return Huffman(self.source, self.output_symbols).get_source_code()
+
+    @staticmethod
+    def get_block_encoder(content: str, output_symbols: List[str]) -> "Encoder":
+        """
+        Build the encoder of a block with its own canonical Huffman code (it runs in the workers).
+
+            Parameters
+                content (str): Content of the block
+                output_symbols (List[str]): The output symbols of the coding method
+
+            Returns
+                return The encoder of the block
+        """
+
+        from scripts.encoder import Encoder
+        counts = count_codepoints(get_codepoints(content), 0)
+        codepoints = np.flatnonzero(counts)
+        source = Source(
+            symbols=[chr(codepoint) for codepoint in codepoints],
+            probability_distribution=(counts[codepoints]/len(content)).tolist()
+        )
+        return Encoder(coding_method="huffman", source=source, args=[output_symbols], canonical=True)
+
+    @staticmethod
+    def get_cost(encoder: "Encoder", content: str) -> float:
+        """
+        Get the number of bits of a block encoded with an encoder.
+
+            Parameters
+                encoder ("Encoder"): Encoder of a block
+                content (str): Content of the block
+
+            Returns
+                return Number of bits of the code words (infinite if a symbol doesn't have code word)
+        """
+
+        index, _, lengths = encoder.code_table
+        symbols = get_symbol_indexes(content, index)
+        if (symbols < 0).any():
+            return float("inf")
+        return int(lengths[symbols].sum())
+
+    @staticmethod
+    def encode_block(encoder: "Encoder", content: str, source_code_str: str) -> "BitBuffer":
+        """
+        Encode a block (it runs in the workers).
+
+            Parameters
+                encoder ("Encoder"): Encoder of the block
+                content (str): Content of the block
+                source_code_str (str): Source code of the block (empty if it reuses the previous one)
+
+            Returns
+                return The encoded block
+        """
+
+        import scripts.constants
+        encoded_content = encoder.encode(content)
+        block = BitBuffer.from_string("1" + source_code_str if source_code_str else "0")
+        block.append_int(len(encoded_content), scripts.constants.BLOCK_SIZE_FIELD_LENGTH)
+        return block.append(encoded_content)
+
+    def map(self, function: Callable, *iterables) -> list:
+        """
+        Apply a function to each block, in a pool with several workers.
+
+            Parameters
+                function (Callable): Function to apply
+                iterables: Arguments of each call
+
+            Returns
+                return List with the results in order
+        """
+
+        if self.workers <= 1:
+            return list(map(function, *iterables))
+        executor_class = ProcessPoolExecutor if self.executor == "process" else ThreadPoolExecutor
+        with executor_class(max_workers=self.workers) as executor:
+            return list(executor.map(function, *iterables))
+
+    def encode(self, content: str) -> "BitBuffer":
+        """
+        Encode the content block by block, the codes of the blocks are built and the blocks
+        are encoded in the workers, only the choice of the code of each block is sequential.
+
+            Parameters
+                content (str): Text file content to encode
+
+            Returns
+                return The encoded content
+        """
+
+        blocks = [content[i:i+self.block_length] for i in range(0, len(content), self.block_length)]
+        encoders = self.map(self.get_block_encoder, blocks, [self.output_symbols]*len(blocks))
+
+        # Reuse the code of the previous block when it's cheaper than a new source code
+        chosen, source_codes, previous = [], [], None
+        for encoder, block in zip(encoders, blocks):
+            source_code_str = encoder.source_code_to_string(self.end_symbol)
+            if previous is not None and self.get_cost(previous, block) <= len(source_code_str) + self.get_cost(encoder, block):
+                chosen.append(previous)
+                source_codes.append("")
+            else:
+                chosen.append(encoder)
+                source_codes.append(source_code_str)
+                previous = encoder
+
+        encoded_content, bit_starts = BitBuffer(), []
+        for encoded_block in self.map(self.encode_block, chosen, blocks, source_codes):
+            bit_starts.append(len(encoded_content))
+            encoded_content.append(encoded_block)
+        self.layout = (
+            np.arange(0, len(content), self.block_length, dtype=np.int64),
+            np.array(bit_starts, dtype=np.int64),
+            np.array([bool(source_code_str) for source_code_str in source_codes], dtype=bool),
+        )
+        return encoded_content
+
+    def get_positions(self, content: str, start: int = 0) -> np.ndarray:
+        """
+        Get the position of the first bit of the block with its own code that holds each
+        character (the first position where the decoding of the character can start).
+
+            Parameters
+                content (str): Text file content
+                start (int): Position of the first block
+
+            Returns
+                return Array with the positions (int64)
+        """
+
+        if self.layout is None or self.layout[0].size != -(-len(content)//self.block_length):
+            self.encode(content)
+        character_starts, bit_starts, own_code = self.layout
+        owner = np.searchsorted(character_starts[own_code], np.arange(len(content)), side="right") - 1
+        return start + bit_starts[own_code][owner]
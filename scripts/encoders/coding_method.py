@@ -7,6 +7,8 @@ class CodingMethod:
 
         source : "Source" 
             Source of the text file (Symbols, Probability Distribution)
+        encodes_content : bool
+            The coding method encodes the content and writes the header by itself (instead of the code table of the Encoder)
 
         Methods
         -------
@@ -17,8 +19,14 @@ class CodingMethod:
             Represents the coding method in a string format for data structures.
         get_source_code(self) -> None:
             Get the source code from the coding method.
+        header_to_string(self, end_symbol: str) -> str:
+            Convert the model of the coding method into the header of the coded content.
+        average_length(self, source_code: "SourceCode") -> float:
+            Get the average number of bits of each symbol.
     """
 
+    encodes_content = False
+
     def __init__(self, source: "Source") -> None:
         self.source = source
 
@@ -60,4 +68,30 @@ class CodingMethod:
         """
 
         return None
-        
\ No newline at end of file
+
+    def header_to_string(self, end_symbol: str) -> str:
+        """
+        Convert the model of the coding method into the header of the coded content (only for
+        the coding methods that encode the content by themselves).
+
+            Parameters
+                end_symbol (str): Symbol that ends the content
+
+            Returns
+                return String header format
+        """
+
+        return ""
+
+    def average_length(self, source_code: "SourceCode") -> float:
+        """
+        Get the average number of bits of each symbol.
+
+            Parameters
+                source_code ("SourceCode"): Source code from the coding method
+
+            Returns
+                return A float representing the average length
+        """
+
+        return source_code.average_length(self.source)
@@ -0,0 +1,288 @@
+from scripts.source_code import SourceCode
+from scripts.encoders.coding_method import CodingMethod
+from scripts.bit_buffer import BitBuffer
+from scripts.misc import *
+from typing import List
+from abc import ABC, abstractmethod
+from math import ceil, log2
+import numpy as np
+
+# scripts.constants is imported in the methods because it imports the coding methods
+
+class FrequencyModel(CodingMethod, ABC):
+    """
+    A class of the coding methods that encode the content with the quantized frequencies of the source.
+
+        The frequencies are quantized to a total of 2^frequency_bits and the model is stored in
+        the header with the next format:
+            symbol width + number of symbols + block length + end symbol + (symbol + frequency - 1) of each symbol
+
+        The content is split in blocks of block_length symbols and the coder starts again in each
+        block, so each block is stored as the number of bits of the block + encoded block and the
+        blocks that start in a frame can be decoded without the previous frames. Each coding method
+        implements the coder of the blocks (encode_block and decode_block are abstract).
+
+        Attributes
+        ----------
+
+        source : "Source"
+            Source of the text file (Symbols, Probability Distribution)
+        output_symbols : List[str]
+            The output symbols of the coding method (binary)
+        frequency_bits : int
+            Number of bits of the total of the frequencies (and of the fields of the header)
+        n : int
+            Number of symbols
+        frequencies : List[int]
+            Quantized frequency of each symbol (the total is 2^frequency_bits)
+        block_length : int
+            Number of symbols of each block
+        layout : np.ndarray
+            First bit of each block of the last encoded content
+
+        Methods
+        -------
+
+        quantize(self) -> List[int]:
+            Quantize the probability distribution into integer frequencies.
+        get_source_code(self) -> "SourceCode":
+            Get a fixed length code to index the symbols.
+        header_to_string(self, end_symbol: str) -> str:
+            Convert the model into the header of the coded content.
+        average_length(self, source_code: "SourceCode") -> float:
+            Get the average number of bits of each symbol.
+        encode_block(self, symbols: np.ndarray) -> "BitBuffer":
+            Encode the symbol indexes of a block.
+        encode(self, content: str) -> "BitBuffer":
+            Encode the content block by block.
+        get_positions(self, content: str, start: int = 0) -> np.ndarray:
+            Get the position of the block that holds each character.
+        decode_model(coded_content: "BitBuffer", frequency_bits: int, start: int = 0) -> tuple:
+            Decode the model from the header of the coded content.
+        decode_block(model: tuple, coded_content: "BitBuffer") -> str:
+            Decode a block.
+        decode(cls, model: tuple, coded_content: "BitBuffer") -> str:
+            Decode the blocks of the coded content.
+    """
+
+    encodes_content = True
+
+    def __init__(self, source: "Source", output_symbols: List[str], frequency_bits: int, block_length: int = None) -> None:
+        import scripts.constants
+        super().__init__(source)
+        self.output_symbols = output_symbols
+        if list(self.output_symbols) != ["0", "1"]:
+            raise Exception(f"The {type(self).__name__} code needs binary output symbols ({self.output_symbols}).")
+        self.frequency_bits = frequency_bits
+        self.n = len(self.source.symbols)
+        self.frequencies = self.quantize()
+        self.block_length = block_length or scripts.constants.FREQUENCY_MODEL_BLOCK_LENGTH
+        self.layout = None
+
+    def quantize(self) -> List[int]:
+        """
+        Quantize the probability distribution into integer frequencies with a total of 2^frequency_bits,
+        every symbol keeps a frequency of at least 1 and the most probable symbol gets the remainder.
+
+            Parameters
+                None
+
+            Returns
+                return List with the frequency of each symbol
+        """
+
+        total = 1 << self.frequency_bits
+        if self.n > total//2:
+            raise Exception(f"The {type(self).__name__} code can't have more than {total//2} symbols ({self.n}).")
+        probabilities = np.array(self.source.probability_distribution, dtype=np.float64)
+        frequencies = np.maximum(1, np.floor(probabilities*(total - self.n))).astype(np.int64)
+        frequencies[np.argmax(probabilities)] += total - frequencies.sum()
+        return frequencies.tolist()
+
+    def get_source_code(self) -> "SourceCode":
+        """
+        Get a fixed length code to index the symbols (the content is encoded with the frequencies).
+
+            Parameters
+                None
+
+            Returns
+                return Source code with the index of each symbol
+        """
+
+        length = max(ceil(log2(self.n)), 1)
+        return SourceCode(
+            symbols1=self.source.symbols,
+            symbols2=[int_to_bin_left_padding(i, length) for i in range(self.n)]
+        )
+
+    def header_to_string(self, end_symbol: str) -> str:
+        """
+        Convert the model into the header of the coded content.
+
+            Parameters
+                end_symbol (str): Symbol that ends the content
+
+            Returns
+                return String header format
+        """
+
+        import scripts.constants
+        symbol_width = max(ord(symbol) for symbol in self.source.symbols).bit_length()
+        header = int_to_bin_left_padding(symbol_width, scripts.constants.BLOCK_CODE_LENGTH)
+        header += int_to_bin_left_padding(self.n, self.frequency_bits)
+        header += int_to_bin_left_padding(self.block_length, scripts.constants.BLOCK_SIZE_FIELD_LENGTH)
+        header += character_to_binary(end_symbol, symbol_width)
+        return header + "".join(
+            character_to_binary(symbol, symbol_width) + int_to_bin_left_padding(frequency-1, self.frequency_bits)
+            for symbol, frequency in zip(self.source.symbols, self.frequencies)
+        )
+
+    def average_length(self, source_code: "SourceCode") -> float:
+        """
+        Get the average number of bits of each symbol (the information of each symbol in the quantized model).
+
+            Parameters
+                source_code ("SourceCode"): Source code from the coding method (not used)
+
+            Returns
+                return A float representing the average length
+        """
+
+        total = sum(self.frequencies)
+        return sum(probability*log2(total/frequency) for probability, frequency in zip(self.source.probability_distribution, self.frequencies))
+
+    @abstractmethod
+    def encode_block(self, symbols: np.ndarray) -> "BitBuffer":
+        """
+        Encode the symbol indexes of a block (each coding method has its own coder).
+
+            Parameters
+                symbols (np.ndarray): Symbol indexes of the block
+
+            Returns
+                return The encoded block
+        """
+
+    def encode(self, content: str) -> "BitBuffer":
+        """
+        Encode the content block by block, the coder starts again in each block.
+
+            Parameters
+                content (str): Text file content to encode
+
+            Returns
+                return The encoded content
+        """
+
+        import scripts.constants
+        symbols = get_symbol_indexes(content, get_symbol_index(self.source.symbols))
+        if (symbols < 0).any():
+            raise Exception("The content has symbols without frequency.")
+        encoded_content, bit_starts = BitBuffer(), []
+        for i in range(0, symbols.size, self.block_length):
+            encoded_block = self.encode_block(symbols[i:i+self.block_length])
+            bit_starts.append(len(encoded_content))
+            encoded_content.append_int(len(encoded_block), scripts.constants.BLOCK_SIZE_FIELD_LENGTH)
+            encoded_content.append(encoded_block)
+        self.layout = np.array(bit_starts, dtype=np.int64)
+        return encoded_content
+
+    def get_positions(self, content: str, start: int = 0) -> np.ndarray:
+        """
+        Get the position of the first bit of the block that holds each character (the first
+        position where the decoding of the character can start).
+
+            Parameters
+                content (str): Text file content
+                start (int): Position of the first block
+
+            Returns
+                return Array with the positions (int64)
+        """
+
+        if self.layout is None or self.layout.size != -(-len(content)//self.block_length):
+            self.encode(content)
+        return start + self.layout[np.arange(len(content), dtype=np.int64)//self.block_length]
+
+    @staticmethod
+    def decode_model(coded_content: "BitBuffer", frequency_bits: int, start: int = 0) -> tuple:
+        """
+        Decode the model from the header of the coded content.
+
+            Parameters
+                coded_content ("BitBuffer"): The coded content
+                frequency_bits (int): Number of bits of the total of the frequencies
+                start (int): Position of the header
+
+            Returns
+                return Tuple with the model (symbols, frequencies, end symbol and block length) and last index of the header or raise a DecodingError
+        """
+
+        import scripts.constants
+        from scripts.decoder import DecodingError
+        i = start
+        symbol_width = coded_content[i:i+scripts.constants.BLOCK_CODE_LENGTH].to_int()
+        i += scripts.constants.BLOCK_CODE_LENGTH
+        n = coded_content[i:i+frequency_bits].to_int()
+        i += frequency_bits
+        block_length = coded_content[i:i+scripts.constants.BLOCK_SIZE_FIELD_LENGTH].to_int()
+        i += scripts.constants.BLOCK_SIZE_FIELD_LENGTH
+        if not block_length:
+            raise DecodingError("The blocks of the frequency model are empty.")
+        entry_length = symbol_width + frequency_bits
+        if not symbol_width or not n or i + symbol_width + entry_length*n > len(coded_content):
+            raise DecodingError(f"The symbols of the frequency model ({n}) are missing or run past the end of the coded content.")
+        end_symbol, = to_symbols([coded_content[i:i+symbol_width].to_int()])
+        i += symbol_width
+        entries = coded_content[i:i+entry_length*n].fields(entry_length)
+        symbols = to_symbols(entries >> np.uint64(frequency_bits))
+        frequencies = (entries & np.uint64((1 << frequency_bits) - 1)).astype(np.int64) + 1
+        if int(frequencies.sum()) != 1 << frequency_bits:
+            raise DecodingError(f"The frequencies of the model ({int(frequencies.sum())}) don't add up to {1 << frequency_bits}.")
+        return (symbols, frequencies, end_symbol, block_length), i+entry_length*n
+
+    @staticmethod
+    @abstractmethod
+    def decode_block(model: tuple, coded_content: "BitBuffer") -> str:
+        """
+        Decode a block (each coding method has its own decoder).
+
+            Parameters
+                model (tuple): Symbols, frequencies, end symbol and block length
+                coded_content ("BitBuffer"): The encoded block
+
+            Returns
+                return The content of the block (up to block length symbols, with the end symbol if the block has it)
+        """
+
+    @classmethod
+    def decode(cls, model: tuple, coded_content: "BitBuffer") -> str:
+        """
+        Decode the blocks of the coded content, the decoding stops in the end symbol or in
+        the last whole block (the block cut by the end of the coded content is dropped).
+
+            Parameters
+                model (tuple): Symbols, frequencies, end symbol and block length
+                coded_content ("BitBuffer"): The encoded content (without the header), starting with a block
+
+            Returns
+                return The original content
+        """
+
+        import scripts.constants
+        end_symbol, field_length = model[2], scripts.constants.BLOCK_SIZE_FIELD_LENGTH
+        content, i = [], 0
+        while i + field_length <= len(coded_content):
+            size = coded_content[i:i+field_length].to_int()
+            i += field_length
+            if i + size > len(coded_content):
+                break
+            block = cls.decode_block(model, coded_content[i:i+size])
+            i += size
+            end = block.find(end_symbol)
+            if end >= 0:
+                content.append(block[:end])
+                break
+            content.append(block)
+        return "".join(content)
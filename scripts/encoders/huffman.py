@@ -2,11 +2,15 @@ from scripts.source_code import SourceCode
 from scripts.encoders.coding_method import CodingMethod
 from scripts.encoders.huffman_node import HuffmanNode
 from typing import List
+import heapq
 
 class Huffman(CodingMethod):
     """
     A class of the Huffman code method.
 
+        The code is d-ary (d is the number of output symbols), but only the binary code words
+        (output symbols 0 and 1) can be written in the frames, the Encoder rejects the other ones.
+
         Attributes
         ----------
 
@@ -27,15 +31,13 @@ class Huffman(CodingMethod):
         __repr__(self) -> str:
             Represents the Huffman codification in a string format for data structures.
         init(self) -> List["HuffmanNode"]:
-            Sort the symbols based on it's probabilities and generate the initial nodes.
+            Generate the initial nodes (one for each symbol and the dummy nodes needed to fill the tree).
         run(self) -> "HuffmanNode":
             Execute the entire Huffman codification algorihtm.
         mark(self, root: "HuffmanNode") -> None:
             Mark each node of the tree with it's code word.
-        get_leaves(self, root: "HuffmanNode") -> List:
-            Get the leaves of the tree.
-        aux_get_leaves(self, root: "HuffmanNode", result: List[str]) -> None:
-            Auxiliary funciton to get the leaves of the tree.
+        get_leaves(self, root: "HuffmanNode") -> List[str]:
+            Get the code words of the leaves of the tree in the order of the symbols of the source.
         get_source_code(self) -> "SourceCode":
             Get the source code from the Huffman code.
     """
@@ -48,7 +50,7 @@ class Huffman(CodingMethod):
 
     def init(self) -> List["HuffmanNode"]:
         """
-        Sort the symbols based on it's probabilities and generate the initial nodes.
+        Generate the initial nodes (one for each symbol and the dummy nodes needed to fill the tree).
 
             Parameters
                 None
@@ -57,8 +59,10 @@ class Huffman(CodingMethod):
                 return List of Huffman nodes
         """
 
-        sorted_source = sorted(self.source.source, key=lambda symbol: symbol[1])
-        return [HuffmanNode(sorted_source[i][0], sorted_source[i][1]) for i in range(self.n)]
+        nodes = [HuffmanNode(symbol, probability, i) for i, (symbol, probability) in enumerate(self.source.source)]
+        # A complete d-ary tree has n+dummies leaves with (n+dummies-1) % (d-1) == 0
+        dummies = (self.d-1 - (self.n-1)%(self.d-1)) % (self.d-1) if self.n > 1 else 0
+        return nodes + [HuffmanNode("", 0) for _ in range(dummies)]
 
     def run(self) -> "HuffmanNode":
         """
@@ -71,39 +75,26 @@ class Huffman(CodingMethod):
                 return The root of the tree
         """
 
-        nodes = self.init()
-        r = (self.n-1)%(self.d-1)
-        running = True
-
-        while running:
-            # Step 2
-            child_nodes = nodes[:self.d-r]
-            total_probability = 0
-            for child_node in child_nodes:
-                child_node.active = False
-                total_probability += child_node.probability
-            for i in range(r):
-                child_node = HuffmanNode("", 0)
-                child_node.active = None
-                child_nodes.append(child_node)
-            node = HuffmanNode("", total_probability)
-            node.childs = child_nodes
-
-            # Remove the inactive nodes from the node list
-            for i in range(self.d-r):
-                if nodes:
-                    nodes.pop(0)
-            nodes.append(node)
+        # The counter breaks the ties between equal probabilities in order of creation
+        heap = [(node.probability, i, node) for i, node in enumerate(self.init())]
+        heapq.heapify(heap)
+        counter = len(heap)
 
-            # Sort the nodes list
-            nodes = sorted(nodes, key=lambda node: node.probability)
+        while len(heap) > 1:
+            # Merge the d nodes with the lowest probabilities
+            child_nodes = [heapq.heappop(heap)[2] for _ in range(min(self.d, len(heap)))]
+            node = HuffmanNode("", sum(child_node.probability for child_node in child_nodes))
+            node.childs = child_nodes
+            heapq.heappush(heap, (node.probability, counter, node))
+            counter += 1
 
-            # Step 3
-            if len(nodes) <= 1:
-                running = False
-            else:
-                r = 0
-        return node
+        root = heap[0][2]
+        if not root.childs:
+            # A single symbol still needs a code word of one output symbol
+            node = HuffmanNode("", root.probability)
+            node.childs = [root]
+            root = node
+        return root
 
     def mark(self, root: "HuffmanNode") -> None:
         """
@@ -116,48 +107,33 @@ class Huffman(CodingMethod):
                 return None
         """
 
-        if not root:
-            return []
-        queue = [root]
-        while queue:
-            for _ in range(len(queue)):
-                node = queue.pop(0)
-                for i in range(len(node.childs)):
-                    node.childs[i].mark = node.mark + self.output_symbols[i]
-                    queue.append(node.childs[i])
-
-    def get_leaves(self, root: "HuffmanNode") -> List:
-        """
-        Get the leaves of the tree.
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            for i, child_node in enumerate(node.childs):
+                child_node.mark = node.mark + self.output_symbols[i]
+                stack.append(child_node)
 
-            Parameters
-                root ("HuffmanNode"): The root of the tree
-    
-            Returns
-                return List with the leaves of the tree
-        """
-
-        result = []
-        self.aux_get_leaves(root, result)
-        return result
-
-    def aux_get_leaves(self, root: "HuffmanNode", result: List[str]) -> None:
+    def get_leaves(self, root: "HuffmanNode") -> List[str]:
         """
-        Auxiliary funciton to get the leaves of the tree.
+        Get the code words of the leaves of the tree in the order of the symbols of the source.
 
             Parameters
                 root ("HuffmanNode"): The root of the tree
-                result (List): List for save the leaves of the tree
     
             Returns
-                return None
+                return List with the code word of each symbol
         """
 
-        if not root.childs:
-            result.append(root.mark)
-        else:
-            for child in root.childs:
-                self.aux_get_leaves(child, result)
+        result = [""]*self.n
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if node.childs:
+                stack.extend(node.childs)
+            elif node.index >= 0:
+                result[node.index] = node.mark
+        return result
 
     def get_source_code(self) -> "SourceCode":
         """
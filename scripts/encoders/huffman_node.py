@@ -9,8 +9,8 @@ class HuffmanNode:
             Symbol of the Huffman node
         probability : float
             Probability of the Huffman node
-        active : bool
-            Current state of the Huffman node
+        index : int
+            Index of the symbol in the source (-1 for the internal and dummy nodes)
         childs : List["HuffmanNode"]
             Childs of the Huffman node
         mark : str
@@ -25,10 +25,12 @@ class HuffmanNode:
             Represents the Huffman node in a string format for data structures.
     """
 
-    def __init__(self, symbol: str, probability: float) -> None:
+    __slots__ = ("symbol", "probability", "index", "childs", "mark")
+
+    def __init__(self, symbol: str, probability: float, index: int = -1) -> None:
         self.symbol = symbol
         self.probability = probability
-        self.active = True
+        self.index = index
         self.childs = []
         self.mark = ""
 
@@ -56,4 +58,4 @@ class HuffmanNode:
                 return The string format of the huffman codification
         """
 
-        return str(self.symbol)
\ No newline at end of file
+        return str(self.symbol)
@@ -0,0 +1,210 @@
+from scripts.encoders.frequency_model import FrequencyModel
+from scripts.bit_buffer import BitBuffer
+from scripts.misc import *
+from typing import List
+from math import log2
+import numpy as np
+
+# scripts.constants is imported in the methods because it imports the coding methods
+
+class Rans(FrequencyModel):
+    """
+    A class of the range asymmetric numeral systems (rANS) code method with interleaved states.
+
+        The symbols are dealt in turns to several lanes (the symbol i goes to the lane i % lanes),
+        each lane has its own state of RANS_STATE_BITS bits and all the lanes share one stream of
+        RANS_WORD_BITS bits words, so each turn is encoded and decoded for all the lanes at the same
+        time. The frequencies are quantized to a total of 2^RANS_SCALE_BITS and the model is stored
+        in the header of the frequency model. The states start again in each block and each encoded block is:
+            number of encoded symbols + number of lanes + final state of each lane + words
+
+        Attributes
+        ----------
+
+        source : "Source"
+            Source of the text file (Symbols, Probability Distribution)
+        output_symbols : List[str]
+            The output symbols of the coding method (binary)
+        frequency_bits : int
+            Number of bits of the total of the frequencies (RANS_SCALE_BITS)
+        n : int
+            Number of symbols
+        frequencies : List[int]
+            Quantized frequency of each symbol
+        lanes : int
+            Maximal number of interleaved states
+        block_length : int
+            Number of symbols of each block (lanes*RANS_LANE_LENGTH by default)
+        layout : np.ndarray
+            First bit of each block of the last encoded content
+
+        Methods
+        -------
+
+        get_word_type() -> np.dtype:
+            Get the type of the words of the stream.
+        get_lanes(self, length: int) -> int:
+            Get the number of interleaved states of a block.
+        encode_block(self, symbols: np.ndarray) -> "BitBuffer":
+            Encode the symbol indexes of a block.
+        decode_header(coded_content: "BitBuffer", start: int = 0) -> tuple:
+            Decode the model from the header of the coded content.
+        decode_block(model: tuple, coded_content: "BitBuffer") -> str:
+            Decode a block with the model.
+    """
+
+    def __init__(self, source: "Source", output_symbols: List[str] = ["0", "1"], lanes: int = None, block_length: int = None) -> None:
+        import scripts.constants
+        self.lanes = lanes or scripts.constants.RANS_LANES
+        # The blocks are long enough to fill every lane
+        super().__init__(source, output_symbols, scripts.constants.RANS_SCALE_BITS, block_length or self.lanes*scripts.constants.RANS_LANE_LENGTH)
+        self.get_word_type()
+
+    @staticmethod
+    def get_word_type() -> np.dtype:
+        """
+        Get the type of the words of the stream (big endian, RANS_WORD_BITS bits).
+
+            Parameters
+                None
+
+            Returns
+                return The type of the words or raise an Exception
+        """
+
+        import scripts.constants
+        word_bits = scripts.constants.RANS_WORD_BITS
+        if word_bits not in (8, 16, 32) or 2*word_bits > scripts.constants.RANS_STATE_BITS:
+            raise Exception(f"The words of the rANS code ({word_bits} bits) aren't whole bytes up to half of the states.")
+        return np.dtype(f">u{word_bits//8}")
+
+    def get_lanes(self, length: int) -> int:
+        """
+        Get the number of interleaved states of a block, each lane has at least RANS_LANE_LENGTH
+        symbols so the final states don't take a big part of the encoded content.
+
+            Parameters
+                length (int): Number of symbols of the block
+
+            Returns
+                return Number of lanes
+        """
+
+        import scripts.constants
+        return max(1, min(self.lanes, length//scripts.constants.RANS_LANE_LENGTH))
+
+    def encode_block(self, symbols: np.ndarray) -> "BitBuffer":
+        """
+        Encode the symbol indexes of a block, the turns are encoded from the last one and the words
+        of each turn are written from the last lane, so the decoder reads the stream forward.
+
+            Parameters
+                symbols (np.ndarray): Symbol indexes of the block
+
+            Returns
+                return The encoded block
+        """
+
+        import scripts.constants
+        scale, word_bits = scripts.constants.RANS_SCALE_BITS, scripts.constants.RANS_WORD_BITS
+        state_bits = scripts.constants.RANS_STATE_BITS
+
+        frequencies = np.array(self.frequencies, dtype=np.uint64)
+        cumulative = np.concatenate([[0], np.cumsum(frequencies)[:-1]]).astype(np.uint64)
+        # A state above the limit of the symbol has to write a word first
+        limits = frequencies << np.uint64(state_bits - scale)
+
+        lanes = self.get_lanes(symbols.size)
+        states = np.full(lanes, 1 << (state_bits - word_bits), dtype=np.uint64)
+        words = []
+        for start in range(((symbols.size - 1)//lanes)*lanes, -1, -lanes):
+            turn = symbols[start:start+lanes]
+            x, f = states[:turn.size], frequencies[turn]
+            write = x >= limits[turn]
+            words.append((x[write] & np.uint64((1 << word_bits) - 1))[::-1])
+            x = np.where(write, x >> np.uint64(word_bits), x)
+            states[:turn.size] = ((x // f) << np.uint64(scale)) + x % f + cumulative[turn]
+
+        encoded_content = BitBuffer()
+        encoded_content.append_int(symbols.size, state_bits)
+        encoded_content.append_int(lanes, state_bits)
+        for state in states.tolist():
+            encoded_content.append_int(state, state_bits)
+        words = np.concatenate(words)[::-1] if words else np.zeros(0, dtype=np.uint64)
+        return encoded_content.append(BitBuffer.from_bytes(words.astype(self.get_word_type()).tobytes()))
+
+    @staticmethod
+    def decode_header(coded_content: "BitBuffer", start: int = 0) -> tuple:
+        """
+        Decode the model from the header of the coded content.
+
+            Parameters
+                coded_content ("BitBuffer"): The coded content
+                start (int): Position of the header
+
+            Returns
+                return Tuple with the model (symbols, frequencies, end symbol and block length) and last index of the header
+        """
+
+        import scripts.constants
+        return FrequencyModel.decode_model(coded_content, scripts.constants.RANS_SCALE_BITS, start)
+
+    @staticmethod
+    def decode_block(model: tuple, coded_content: "BitBuffer") -> str:
+        """
+        Decode a block with the model, each turn decodes one symbol of every lane and the lanes
+        below the lower limit read the next words in order. The decoding stops after the end symbol
+        or when the words run out, the number of symbols is capped by the block length and by the
+        symbols that the block can hold.
+
+            Parameters
+                model (tuple): Symbols, frequencies, end symbol and block length
+                coded_content ("BitBuffer"): The encoded block
+
+            Returns
+                return The content of the block
+        """
+
+        import scripts.constants
+        symbols, frequencies, end_symbol, block_length = model
+        scale, word_bits = scripts.constants.RANS_SCALE_BITS, scripts.constants.RANS_WORD_BITS
+        state_bits = scripts.constants.RANS_STATE_BITS
+        length = min(coded_content[:state_bits].to_int(), block_length)
+        # The states are at least 4 times the frequency of the next symbol, so each symbol takes at least
+        # log2(total/frequency) - log2(4/3) bits of the final states and the words
+        symbol_bits = scale - log2(int(frequencies.max())) - log2(4/3)
+        if symbol_bits > 0:
+            length = min(length, int(len(coded_content)/symbol_bits))
+        lanes = coded_content[state_bits:2*state_bits].to_int()
+        i = (2 + lanes)*state_bits
+        if not length or not lanes or i > len(coded_content):
+            return ""
+        states = coded_content[2*state_bits:i].fields(state_bits)
+        stream = coded_content[i:]
+        words = np.frombuffer(stream[:len(stream) - len(stream)%word_bits].to_bytes(), dtype=Rans.get_word_type()).astype(np.uint64)
+
+        frequencies = frequencies.astype(np.uint64)
+        cumulative = np.concatenate([[0], np.cumsum(frequencies)[:-1]]).astype(np.uint64)
+        # Symbol index of each slot
+        lookup = np.repeat(np.arange(len(symbols)), frequencies.astype(np.int64))
+        mask, lower = np.uint64((1 << scale) - 1), np.uint64(1 << (state_bits - word_bits))
+        decoded, position = np.empty(length, dtype=np.int64), 0
+        for start in range(0, length, lanes):
+            x = states[:min(lanes, length - start)]
+            slot = x & mask
+            turn = lookup[slot]
+            decoded[start:start+turn.size] = turn
+            x = frequencies[turn]*(x >> np.uint64(scale)) + slot - cumulative[turn]
+            read = np.flatnonzero(x < lower)
+            if position + read.size > words.size:
+                # The stream is truncated
+                decoded = decoded[:start+turn.size]
+                break
+            x[read] = (x[read] << np.uint64(word_bits)) | words[position:position+read.size]
+            position += read.size
+            states[:turn.size] = x
+
+        codepoints = np.array([ord(symbol) for symbol in symbols], dtype="<u4")
+        content = codepoints[decoded].tobytes().decode("utf-32-le")
+        end = content.find(end_symbol)
+        return content if end < 0 else content[:end+1]
@@ -0,0 +1,201 @@
+from scripts.bit_buffer import BitBuffer
+import numpy as np
+
+class ErrorCorrector:
+    """
+    A class to represent the error correcting codes of the frames.
+
+        The content of a frame is split in blocks of data_length symbols of symbol_width bits and
+        each block becomes a code word of code_length symbols. The code words are interleaved (the
+        first symbol of every code word, then the second one, ...) so a burst of wrong bits in the
+        frame is spread over many code words. The number of code words only depends on the number
+        of bits of the frame, so the decoder gets the same layout from the frame.
+
+        Attributes
+        ----------
+
+        symbol_width : int
+            Number of bits of each symbol of the code words
+        code_length : int
+            Number of symbols of each code word
+        data_length : int
+            Number of data symbols of each code word
+
+        Methods
+        -------
+
+        __str__(self) -> str:
+            Represents the error correcting code in a string format.
+        __repr__(self) -> str:
+            Represents the error correcting code in a string format for data structures.
+        get_rate(self) -> float:
+            Get the number of bits of the frame for each bit of the content.
+        get_layout(self, length: int) -> tuple:
+            Get the number of code words and their lengths in a frame.
+        get_capacity(self, length: int) -> int:
+            Get the number of bits of content that a frame can hold.
+        encode_blocks(self, data: np.ndarray) -> np.ndarray:
+            Encode the data blocks into code words.
+        decode_blocks(self, code_words: np.ndarray) -> np.ndarray:
+            Correct the code words and get their data blocks.
+        get_symbols(self, content: "BitBuffer") -> np.ndarray:
+            Split the content in symbols.
+        encode(self, content: "BitBuffer", length: int) -> "BitBuffer":
+            Encode the content of a frame.
+        decode(self, coded_content: "BitBuffer") -> "BitBuffer":
+            Decode the content of a frame.
+    """
+
+    def __init__(self, symbol_width: int, code_length: int, data_length: int) -> None:
+        self.symbol_width = symbol_width
+        self.code_length = code_length
+        self.data_length = data_length
+        if not 0 < self.data_length < self.code_length:
+            raise Exception(f"The code words ({self.code_length}) need more symbols than the data ({self.data_length}).")
+
+    def __str__(self) -> str:
+        """
+        Represents the error correcting code in a string format.
+
+            Parameters
+                None
+
+            Returns
+                return The string format of the error correcting code
+        """
+
+        return f"{type(self).__name__} ({self.code_length}, {self.data_length})"
+
+    def __repr__(self) -> str:
+        """
+        Represents the error correcting code in a string format for data structures.
+
+            Parameters
+                None
+
+            Returns
+                return The string format of the error correcting code
+        """
+
+        return self.__str__()
+
+    def get_rate(self) -> float:
+        """
+        Get the number of bits of the frame for each bit of the content.
+
+            Parameters
+                None
+
+            Returns
+                return The inverse of the code rate
+        """
+
+        return self.code_length/self.data_length
+
+    def get_layout(self, length: int) -> tuple:
+        """
+        Get the number of code words and their lengths in a frame.
+
+            Parameters
+                length (int): Number of bits of the frame
+
+            Returns
+                return Tuple with the number of code words, the number of symbols and the number of data symbols of each code word
+        """
+
+        return (length//self.symbol_width)//self.code_length, self.code_length, self.data_length
+
+    def get_capacity(self, length: int) -> int:
+        """
+        Get the number of bits of content that a frame can hold.
+
+            Parameters
+                length (int): Number of bits of the frame
+
+            Returns
+                return Number of bits of content
+        """
+
+        blocks, _, data_length = self.get_layout(length)
+        return blocks*data_length*self.symbol_width
+
+    def encode_blocks(self, data: np.ndarray) -> np.ndarray:
+        """
+        Encode the data blocks into code words, the base code fills the code words with zero symbols
+        (the codes add their redundancy instead).
+
+            Parameters
+                data (np.ndarray): Array with a data block in each row
+
+            Returns
+                return Array with a code word in each row
+        """
+
+        padding = np.zeros((data.shape[0], self.code_length - self.data_length), dtype=data.dtype)
+        return np.concatenate([data, padding], axis=1)
+
+    def decode_blocks(self, code_words: np.ndarray) -> np.ndarray:
+        """
+        Correct the code words and get their data blocks, the base code doesn't correct them
+        (the codes correct them instead).
+
+            Parameters
+                code_words (np.ndarray): Array with a code word in each row
+
+            Returns
+                return Array with a data block in each row
+        """
+
+        return code_words[:, :self.data_length]
+
+    def get_symbols(self, content: "BitBuffer") -> np.ndarray:
+        """
+        Split the content in symbols of symbol_width bits.
+
+            Parameters
+                content ("BitBuffer"): Content with a whole number of symbols
+
+            Returns
+                return Array with the symbols (uint8)
+        """
+
+        if self.symbol_width == 1:
+            return content.to_bits()
+        return content.fields(self.symbol_width).astype(np.uint8)
+
+    def encode(self, content: "BitBuffer", length: int) -> "BitBuffer":
+        """
+        Encode the content of a frame, the content is filled with zeros up to the capacity of the frame
+        and the code words are filled with zeros up to the length of the frame.
+
+            Parameters
+                content ("BitBuffer"): Content of the frame
+                length (int): Number of bits of the frame
+
+            Returns
+                return The interleaved code words (length bits)
+        """
+
+        blocks, code_length, data_length = self.get_layout(length)
+        capacity = blocks*data_length*self.symbol_width
+        if len(content) > capacity:
+            raise Exception(f"The content ({len(content)} bits) doesn't fit in the frame ({capacity} bits).")
+        data = self.get_symbols(BitBuffer.from_bytes(content.to_bytes(), len(content)).pad(capacity))
+        code_words = self.encode_blocks(data.reshape(blocks, data_length))
+        return BitBuffer.from_fields(code_words.T.reshape(-1), self.symbol_width).pad(length)
+
+    def decode(self, coded_content: "BitBuffer") -> "BitBuffer":
+        """
+        Decode the content of a frame, the bits after the last code word are ignored.
+
+            Parameters
+                coded_content ("BitBuffer"): The interleaved code words of the frame
+
+            Returns
+                return The content of the frame (with the zeros of the end)
+        """
+
+        blocks, code_length, data_length = self.get_layout(len(coded_content))
+        symbols = self.get_symbols(coded_content[:blocks*code_length*self.symbol_width])
+        data = self.decode_blocks(np.ascontiguousarray(symbols.reshape(code_length, blocks).T))
+        return BitBuffer.from_fields(data.reshape(-1), self.symbol_width)
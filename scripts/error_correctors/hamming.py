@@ -0,0 +1,108 @@
+from scripts.error_correctors.error_corrector import ErrorCorrector
+import numpy as np
+
+# scripts.constants is imported in the methods because it imports the error correcting codes
+
+class Hamming(ErrorCorrector):
+    """
+    A class of the Hamming code, it corrects one wrong bit of each code word.
+
+        The code words have 2^r - 1 bits, the data bits first and then the r parity bits. Every bit
+        of the code word has a different nonzero column value of r bits (the parity bits have the
+        powers of 2), the parity bits make the xor of the column values of the ones equal to 0, so
+        the xor of a received code word (syndrome) is the column value of the wrong bit.
+
+        Attributes
+        ----------
+
+        parity_bits : int
+            Number of parity bits of each code word (r)
+        columns : np.ndarray
+            Column value of each bit of the code words
+        positions : np.ndarray
+            Bit of the code word of each syndrome (-1 for the syndrome 0)
+
+        Methods
+        -------
+
+        get_columns(self) -> np.ndarray:
+            Get the column value of each bit of the code words.
+        get_syndromes(self, bits: np.ndarray, columns: np.ndarray) -> np.ndarray:
+            Get the xor of the column values of the ones of each row.
+        encode_blocks(self, data: np.ndarray) -> np.ndarray:
+            Encode the data blocks into code words.
+        decode_blocks(self, code_words: np.ndarray) -> np.ndarray:
+            Correct the code words and get their data blocks.
+    """
+
+    def __init__(self, parity_bits: int = None) -> None:
+        import scripts.constants
+        self.parity_bits = parity_bits or scripts.constants.HAMMING_PARITY_BITS
+        if not 2 <= self.parity_bits <= 8:
+            raise Exception(f"The Hamming code needs from 2 to 8 parity bits ({self.parity_bits}).")
+        code_length = (1 << self.parity_bits) - 1
+        super().__init__(1, code_length, code_length - self.parity_bits)
+        self.columns = self.get_columns()
+        self.positions = np.full(1 << self.parity_bits, -1, dtype=np.int64)
+        self.positions[self.columns] = np.arange(self.code_length)
+
+    def get_columns(self) -> np.ndarray:
+        """
+        Get the column value of each bit of the code words, the data bits have the values that
+        aren't powers of 2 and the parity bits have the powers of 2.
+
+            Parameters
+                None
+
+            Returns
+                return Array with the column values (uint8)
+        """
+
+        values = np.arange(1, self.code_length+1)
+        powers = (values & (values - 1)) == 0
+        return np.concatenate([values[~powers], values[powers]]).astype(np.uint8)
+
+    def get_syndromes(self, bits: np.ndarray, columns: np.ndarray) -> np.ndarray:
+        """
+        Get the xor of the column values of the ones of each row.
+
+            Parameters
+                bits (np.ndarray): Array with zeros and ones
+                columns (np.ndarray): Column value of each bit of the rows
+
+            Returns
+                return Array with the syndrome of each row (uint8)
+        """
+
+        return np.bitwise_xor.reduce(bits*columns, axis=1)
+
+    def encode_blocks(self, data: np.ndarray) -> np.ndarray:
+        """
+        Encode the data blocks into code words, the parity bits are the bits of the syndrome of the data.
+
+            Parameters
+                data (np.ndarray): Array with a data block in each row
+
+            Returns
+                return Array with a code word in each row
+        """
+
+        syndromes = self.get_syndromes(data, self.columns[:self.data_length])
+        parity = (syndromes[:, None] >> np.arange(self.parity_bits, dtype=np.uint8)) & 1
+        return np.concatenate([data, parity.astype(np.uint8)], axis=1)
+
+    def decode_blocks(self, code_words: np.ndarray) -> np.ndarray:
+        """
+        Correct the code words and get their data blocks, the bit of the syndrome of each code word is flipped.
+
+            Parameters
+                code_words (np.ndarray): Array with a code word in each row
+
+            Returns
+                return Array with a data block in each row
+        """
+
+        syndromes = self.get_syndromes(code_words, self.columns)
+        rows = np.flatnonzero(syndromes)
+        code_words[rows, self.positions[syndromes[rows]]] ^= 1
+        return code_words[:, :self.data_length]
@@ -0,0 +1,242 @@
+from scripts.error_correctors.error_corrector import ErrorCorrector
+from functools import lru_cache
+from math import ceil
+import numpy as np
+
+# scripts.constants is imported in the methods because it imports the error correcting codes
+
+class ReedSolomon(ErrorCorrector):
+    """
+    A class of the Reed-Solomon code over GF(256), it corrects parity_bytes/2 wrong bytes of each code word.
+
+        The code words have up to 255 bytes, the data bytes first and then the parity bytes, and
+        they are the multiples of the generator (x - a^0)(x - a^1)...(x - a^(parity_bytes-1)) where
+        a = 2. The frames that can't hold the code words of 255 bytes use shortened code words. The
+        code is linear, so the parity bytes and the syndromes are the xor of a table row for each
+        byte of the code words. Only the code words with a nonzero syndrome are corrected
+        (Berlekamp-Massey, Chien search and Forney).
+
+        Attributes
+        ----------
+
+        parity_bytes : int
+            Number of parity bytes of each code word
+
+        Methods
+        -------
+
+        get_field() -> tuple:
+            Get the exponential, logarithm and multiplication tables of GF(256).
+        get_tables(code_length: int, parity_bytes: int) -> tuple:
+            Get the parity and syndrome tables of the code words of a length.
+        get_layout(self, length: int) -> tuple:
+            Get the number of code words and their lengths in a frame.
+        get_syndromes(self, code_words: np.ndarray) -> np.ndarray:
+            Get the syndromes of the code words.
+        encode_blocks(self, data: np.ndarray) -> np.ndarray:
+            Encode the data blocks into code words.
+        correct(self, code_word: np.ndarray, syndromes: np.ndarray) -> None:
+            Correct the wrong bytes of a code word.
+        decode_blocks(self, code_words: np.ndarray) -> np.ndarray:
+            Correct the code words and get their data blocks.
+    """
+
+    def __init__(self, parity_bytes: int = None) -> None:
+        import scripts.constants
+        self.parity_bytes = parity_bytes or scripts.constants.REED_SOLOMON_PARITY_BYTES
+        if not 2 <= self.parity_bytes < scripts.constants.REED_SOLOMON_CODE_LENGTH:
+            raise Exception(f"The Reed-Solomon code needs from 2 to {scripts.constants.REED_SOLOMON_CODE_LENGTH-1} parity bytes ({self.parity_bytes}).")
+        code_length = scripts.constants.REED_SOLOMON_CODE_LENGTH
+        super().__init__(8, code_length, code_length - self.parity_bytes)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def get_field() -> tuple:
+        """
+        Get the exponential, logarithm and multiplication tables of GF(256) (they are built once in each process).
+
+            Parameters
+                None
+
+            Returns
+                return Tuple with the powers of a (510 values), the logarithms and the products of every pair of bytes
+        """
+
+        import scripts.constants
+
+        exp, log, value = np.zeros(510, dtype=np.int64), np.zeros(256, dtype=np.int64), 1
+        for i in range(255):
+            exp[i], log[value] = value, i
+            value <<= 1
+            if value & 0x100:
+                value ^= scripts.constants.GF256_PRIMITIVE_POLYNOMIAL
+        exp[255:] = exp[:255]
+        mul = exp[log[:, None] + log[None, :]].astype(np.uint8)
+        mul[0, :] = mul[:, 0] = 0
+        return exp, log, mul
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def get_tables(code_length: int, parity_bytes: int) -> tuple:
+        """
+        Get the parity and syndrome tables of the code words of a length, the row v of the parity table of
+        the byte i is the remainder of v*x^(code_length-1-i) divided by the generator and the row v of the
+        syndrome table of the byte i has v*a^(j*(code_length-1-i)) for each syndrome j.
+
+            Parameters
+                code_length (int): Number of bytes of the code words
+                parity_bytes (int): Number of parity bytes of the code words
+
+            Returns
+                return Tuple with the parity tables (data bytes, 256, parity bytes) and the syndrome tables (code bytes, 256, parity bytes)
+        """
+
+        exp, log, mul = ReedSolomon.get_field()
+        # Generator with the highest degree first
+        generator = [1]
+        for j in range(parity_bytes):
+            generator = [a ^ int(mul[b, exp[j]]) for a, b in zip(generator + [0], [0] + generator)]
+        # Remainders of x^parity_bytes, x^(parity_bytes+1), ... (the highest degree first)
+        remainder, remainders = generator[1:], []
+        for _ in range(code_length - parity_bytes):
+            remainders.append(remainder)
+            top, remainder = remainder[0], remainder[1:] + [0]
+            remainder = [a ^ int(mul[top, b]) for a, b in zip(remainder, generator[1:])]
+        parity = np.stack([mul[:, remainder] for remainder in reversed(remainders)])
+        powers = (np.arange(parity_bytes)[None, :]*np.arange(code_length-1, -1, -1)[:, None]) % 255
+        syndromes = np.stack([mul[:, exp[row]] for row in powers])
+        return parity, syndromes
+
+    def get_layout(self, length: int) -> tuple:
+        """
+        Get the number of code words and their lengths in a frame, the bytes of the frame are split
+        in code words of at most 255 bytes with the same length.
+
+            Parameters
+                length (int): Number of bits of the frame
+
+            Returns
+                return Tuple with the number of code words, the number of bytes and the number of data bytes of each code word
+        """
+
+        symbols = length//self.symbol_width
+        blocks = ceil(symbols/self.code_length)
+        code_length = symbols//blocks if blocks else 0
+        if code_length <= self.parity_bytes:
+            return 0, code_length, 0
+        return blocks, code_length, code_length - self.parity_bytes
+
+    def get_syndromes(self, code_words: np.ndarray) -> np.ndarray:
+        """
+        Get the syndromes of the code words (the code word evaluated in a^0, a^1, ...).
+
+            Parameters
+                code_words (np.ndarray): Array with a code word in each row
+
+            Returns
+                return Array with the syndromes of each code word
+        """
+
+        _, tables = self.get_tables(code_words.shape[1], self.parity_bytes)
+        syndromes = np.zeros((code_words.shape[0], self.parity_bytes), dtype=np.uint8)
+        for i, table in enumerate(tables):
+            syndromes ^= table[code_words[:, i]]
+        return syndromes
+
+    def encode_blocks(self, data: np.ndarray) -> np.ndarray:
+        """
+        Encode the data blocks into code words, the parity bytes are the remainder of the data divided by the generator.
+
+            Parameters
+                data (np.ndarray): Array with a data block in each row
+
+            Returns
+                return Array with a code word in each row
+        """
+
+        tables, _ = self.get_tables(data.shape[1] + self.parity_bytes, self.parity_bytes)
+        parity = np.zeros((data.shape[0], self.parity_bytes), dtype=np.uint8)
+        for i, table in enumerate(tables):
+            parity ^= table[data[:, i]]
+        return np.concatenate([data, parity], axis=1)
+
+    def correct(self, code_word: np.ndarray, syndromes: np.ndarray) -> None:
+        """
+        Correct the wrong bytes of a code word, the code words with too many wrong bytes are left as they are.
+
+            Parameters
+                code_word (np.ndarray): The code word
+                syndromes (np.ndarray): Syndromes of the code word
+
+            Returns
+                return None
+        """
+
+        exp, log, mul = self.get_field()
+        syndromes = syndromes.tolist()
+        # Berlekamp-Massey: error locator (the lowest degree first) with the roots a^-p of the wrong powers p
+        locator, previous, errors, shift, scale = [1], [1], 0, 1, 1
+        for n in range(self.parity_bytes):
+            delta = syndromes[n]
+            for i in range(1, errors+1):
+                delta ^= int(mul[locator[i], syndromes[n-i]])
+            if not delta:
+                shift += 1
+                continue
+            factor = int(exp[log[delta] - log[scale] + 255])
+            update = [0]*shift + [int(mul[factor, value]) for value in previous]
+            new_locator = [a ^ b for a, b in zip(locator + [0]*(len(update) - len(locator)), update + [0]*(len(locator) - len(update)))]
+            if 2*errors <= n:
+                previous, errors, scale, shift = locator, n + 1 - errors, delta, 1
+            else:
+                shift += 1
+            locator = new_locator
+        locator = locator[:errors+1]
+        if 2*errors > self.parity_bytes or len(locator) <= errors:
+            return
+
+        # Chien search: the locator in a^-p for every power p of the code word
+        code_length = code_word.size
+        powers = np.arange(code_length)
+        values = np.zeros(code_length, dtype=np.int64)
+        for degree, coefficient in enumerate(locator):
+            if coefficient:
+                values ^= exp[(log[coefficient] - degree*powers) % 255]
+        wrong = np.flatnonzero(values == 0)
+        if wrong.size != errors:
+            return
+
+        # Forney: the magnitude of the power p is X*evaluator(1/X)/locator'(1/X) with X = a^p
+        evaluator = [0]*self.parity_bytes
+        for i, a in enumerate(syndromes):
+            for j, b in enumerate(locator[:self.parity_bytes-i]):
+                evaluator[i+j] ^= int(mul[a, b])
+        for power in wrong.tolist():
+            inverse = int(exp[(255 - power) % 255])
+            numerator, denominator, x = 0, 0, 1
+            for degree, coefficient in enumerate(evaluator):
+                numerator ^= int(mul[coefficient, x])
+                if degree % 2 == 0 and degree+1 < len(locator):
+                    # Formal derivative, only the odd degrees remain
+                    denominator ^= int(mul[locator[degree+1], x])
+                x = int(mul[x, inverse])
+            if not denominator:
+                return
+            magnitude = int(exp[(power + log[numerator] - log[denominator]) % 255]) if numerator else 0
+            code_word[code_length-1-power] ^= magnitude
+
+    def decode_blocks(self, code_words: np.ndarray) -> np.ndarray:
+        """
+        Correct the code words and get their data blocks, only the code words with a nonzero syndrome are corrected.
+
+            Parameters
+                code_words (np.ndarray): Array with a code word in each row
+
+            Returns
+                return Array with a data block in each row
+        """
+
+        syndromes = self.get_syndromes(code_words)
+        for row in np.flatnonzero(syndromes.any(axis=1)).tolist():
+            self.correct(code_words[row], syndromes[row])
+        return code_words[:, :code_words.shape[1] - self.parity_bytes]
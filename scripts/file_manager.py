@@ -1,7 +1,8 @@
-from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from scripts.misc import *
 from PIL import Image
-import io, os, scripts.constants
+from time import perf_counter
+import io, os, scripts.constants, numpy as np
 
 
 class FileManager:
@@ -23,6 +24,14 @@ class FileManager:
             Content of the text file
         length : int
             Total number of characters in the content of the text file
+        binary : bool
+            Read the bytes of the file (each symbol is a byte) instead of its text
+        compression : str
+            Name of the pre-compression method (None to keep the text)
+        compression_level : int
+            Level of the pre-compression
+        compression_time : float
+            Seconds spent in the pre-compression
 
         Methods
         -------
@@ -39,8 +48,10 @@ class FileManager:
             Get the video in string format.
         get_text_content(self) -> str:
             Get the content of the text file.
+        get_binary_content(self) -> str:
+            Get the bytes of the file.
         get_occurrences(self) -> dict:
-            Get the unique symbols and number occurences from the file path.
+            Get the unique symbols and number occurences from the content.
         get_total_length(self) -> int:
             Get the total length of the text file.
         get_probability_distribution(self) -> list:
@@ -49,11 +60,17 @@ class FileManager:
             Get a unique printable character.
         convert(self, file_format: str) -> None:
             Convert the file to text file.
+        compress(self) -> None:
+            Compress the content with the pre-compression method.
         initialization(self) -> None:
             Initializate the file manager.
     """
 
-    def __init__(self, file_path: str) -> None:
+    def __init__(self, file_path: str, compression: str = None, compression_level: int = None, binary: bool = False) -> None:
+        self.binary = binary
+        self.compression = compression
+        self.compression_level = scripts.constants.COMPRESSION_LEVEL if compression_level is None else compression_level
+        self.compression_time = 0.0
         self.initialization(file_path) 
 
     def check_file_path(self, file_path: str) -> bool:
@@ -142,22 +159,47 @@ class FileManager:
             content = file.read()
         return content
 
-    def get_occurrences(self) -> Counter:
+    def get_binary_content(self) -> str:
         """
-        Get the unique symbols and number occurences from the file path.
+        Get the bytes of the file, each byte becomes the symbol with the same code point (latin-1),
+        so the file isn't decoded as text (the symbols are mapped to their indexes in chunks, see get_symbol_indexes).
 
             Parameters
                 None
 
             Returns
-                return A Counter with the unique symbols (keys) and the number of occurrences of each symbol (values)
+                return The bytes of the file in string format
         """
 
-        occurrences = Counter()
-        with open(self.file_path, 'r', encoding='utf-8') as file:
-            while chunk := file.read(8192):  # Read in chunks of 8KB
-                occurrences.update(chunk)
-        return occurrences
+        with open(self.file_path, "rb") as file:
+            return file.read().decode("latin-1")
+
+    def get_occurrences(self) -> dict:
+        """
+        Get the unique symbols and number occurences from the content, the symbols are sorted by their code point.
+
+            Parameters
+                None
+
+            Returns
+                return A dictionary with the unique symbols (keys) and the number of occurrences of each symbol (values)
+        """
+
+        if self.binary:
+            # Every symbol of a binary content is a byte
+            codepoints = np.frombuffer(self.content.encode("latin-1"), dtype=np.uint8)
+        else:
+            codepoints = get_codepoints(self.content)
+        if codepoints.size >= scripts.constants.PARALLEL_COUNT_LENGTH:
+            # Count each part of the content in a different process
+            minlength = int(codepoints.max()) + 1
+            parts = np.array_split(codepoints, os.cpu_count() or 1)
+            with ProcessPoolExecutor() as executor:
+                counts = sum(executor.map(count_codepoints, parts, [minlength]*len(parts)))
+        else:
+            counts = count_codepoints(codepoints, 0)
+        values = np.flatnonzero(counts)
+        return dict(zip(map(chr, values.tolist()), counts[values].tolist()))
 
     def get_total_length(self) -> int:
         """
@@ -183,7 +225,8 @@ class FileManager:
                 return A list with the probabilities of each symbol in terms of the length of the text file
         """
 
-        return [self.occurrences[key]/self.length for key in self.symbols]
+        counts = np.fromiter((self.occurrences[key] for key in self.symbols), dtype=np.float64, count=len(self.symbols))
+        return (counts/self.length).tolist()
 
     def get_unique_symbol(self) -> str:
         """
@@ -196,8 +239,9 @@ class FileManager:
                 return A unique printable ASCII symbol, or None if all symbols are used.
         """
 
+        used = set(self.symbols)
         for symbol in scripts.constants.ASCII_PRINTABLE_SYMBOLS:
-            if symbol not in self.symbols:
+            if symbol not in used:
                 return symbol
         return None
 
@@ -212,7 +256,9 @@ class FileManager:
                 return None
         """
 
-        if self.file_format in scripts.constants.TXT_FORMATS:
+        if self.binary:
+            return self.get_binary_content()
+        elif self.file_format in scripts.constants.TXT_FORMATS:
             return self.get_text_content()
         elif self.file_format in scripts.constants.IMG_FORMATS:
             return self.get_img_content()
@@ -223,6 +269,25 @@ class FileManager:
         else:
             raise Exception(f"The file format ({self.file_format}) isn't available.")  
 
+    def compress(self) -> None:
+        """
+        Compress the content with the pre-compression method, each byte of the compressed
+        content becomes a symbol (latin-1) so the coding methods encode the bytes.
+
+            Parameters
+                None
+
+            Returns
+                return None
+        """
+
+        if self.compression not in scripts.constants.COMPRESSION_METHODS:
+            raise Exception(f"The compression method ({self.compression}) isn't available.")
+        start = perf_counter()
+        data = self.content.encode("latin-1" if self.binary else "utf-8")
+        self.content = compress_bytes(data, self.compression, self.compression_level).decode("latin-1")
+        self.compression_time = perf_counter() - start
+
     def initialization(self, file_path: str) -> None:
         """
         Initializate the file manager.
@@ -239,9 +304,15 @@ class FileManager:
         self.file_path = file_path
         self.file_format = self.get_file_format()
         self.content = self.convert()
+        if self.compression is not None:
+            self.compress()
         self.occurrences = self.get_occurrences()
         self.symbols = list(self.occurrences.keys())
-        self.end_delimiter = self.get_unique_symbol()
+        # The binary and compressed contents use every byte, their delimiter is outside of the byte alphabet
+        if self.binary or self.compression is not None:
+            self.end_delimiter = scripts.constants.BYTE_END_DELIMITER
+        else:
+            self.end_delimiter = self.get_unique_symbol()
         if not self.end_delimiter:
             raise Exception(f"The delimiter ({self.end_delimiter}) is in the content of the file, this can produce ambiguity.")
         # Add the new symbol (end delimiter)
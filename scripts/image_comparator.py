@@ -1,105 +1,157 @@
 import numpy as np
 import scripts.constants, os
 from PIL import Image
-from typing import List
-import matplotlib.pyplot as plt
+from typing import Iterable, Iterator, List
 
 class ImageComparator:
 
-    def __init__(self, original_frames_path: str, video_frames_path: str, comparison_path: str) -> None:
+    def __init__(self, original_frames_path: str, video_frames_path: str, comparison_path: str, heatmap_step: int = 0, streamed: bool = False) -> None:
         self.original_frames_path = original_frames_path
         self.video_frames_path = video_frames_path
         self.comparison_path = comparison_path
-        self.comparisons = self.compare() 
-        self.save(self.comparisons)
+        self.heatmap_step = heatmap_step
+        # The streamed frames are compared while they are read (see stream)
+        self.comparisons = [] if streamed else self.compare()
 
     def rgb_distance(self, color1: np.ndarray, color2: np.ndarray) -> float:
         """
-        Calculate the distance between two RGB colors.
+        Calculate the distance between two RGB colors (or arrays of RGB colors).
 
             Parameters
-                color1 (np.ndarray): Fist RGB color
-                color2 (np.ndarray): Second RGB color
+                color1 (np.ndarray): Fist RGB color, the channels are in the last axis
+                color2 (np.ndarray): Second RGB color, the channels are in the last axis
 
             Returns
                 return The distance between both colors
         """
 
-        color1, color2 = np.array(color1, dtype=int), np.array(color2, dtype=int)
-        return np.sum(np.square(color2 - color1))
+        # The differences of the channels (uint8) fit in int16 and their squares in int32
+        difference = np.subtract(np.asarray(color2), np.asarray(color1), dtype=np.int16)
+        return np.sum(np.square(difference, dtype=np.int32), axis=-1, dtype=np.int32)
 
     def rgb_similarity(self, color1: np.ndarray, color2: np.ndarray) -> float:
         """
-        Calculate the similarity between two RGB colors.
+        Calculate the similarity between two RGB colors (or arrays of RGB colors).
 
             Parameters
-                color1 (np.ndarray): Fist RGB color
-                color2 (np.ndarray): Second RGB color
+                color1 (np.ndarray): Fist RGB color, the channels are in the last axis
+                color2 (np.ndarray): Second RGB color, the channels are in the last axis
 
             Returns
                 return The similarity between two colors (between [0, 1])
         """
 
-        return ((scripts.constants.MAX_DIST - self.rgb_distance(color1, color2)) / scripts.constants.MAX_DIST)
+        return (scripts.constants.MAX_DIST - self.rgb_distance(color1, color2)).astype(np.float32) / scripts.constants.MAX_DIST
 
-    def save(self, comparisons: List[np.ndarray]) -> None:
+    def get_colormap(self) -> np.ndarray:
         """
-        Save the comparisons matrix. 
+        Get the lookup table of the heatmap colors (viridis).
 
             Parameters
                 None
     
             Returns
-                return None
+                return Array with the RGB color of each of the 256 levels (uint8)
         """
 
-        for i in range(len(comparisons)):
-            plt.figure(figsize=(6, 4))
-            plt.imshow(comparisons[i], cmap="viridis", interpolation="nearest")
+        colors = np.array(scripts.constants.HEATMAP_COLORS, dtype=np.float64)
+        stops, levels = np.linspace(0, 255, len(colors)), np.arange(256)
+        return np.stack([np.interp(levels, stops, colors[:, j]) for j in range(3)], axis=1).round().astype(np.uint8)
 
-            # Add color bar indicating the scale
-            plt.colorbar()
+    def save(self, index: int, comparison: np.ndarray) -> None:
+        """
+        Save the comparison matrix of a frame as a heatmap.
 
-            # Optional: Add labels, title, etc.
-            plt.title(f"Original frame{i} vs Video frame{i}")
-            plt.xlabel("X-axis")
-            plt.ylabel("Y-axis")
+            Parameters
+                index (int): Index of the frame
+                comparison (np.ndarray): Similarity of each pixel of the frame
+    
+            Returns
+                return None
+        """
 
-            # Show plot
-            plt.savefig(self.comparison_path + f"\\cmp_frame{i}.png", dpi=300)
+        levels = np.clip(np.rint(comparison*255), 0, 255).astype(np.uint8)
+        Image.fromarray(self.get_colormap()[levels]).save(self.comparison_path + f"\\cmp_frame{index}.png")
 
-    def average(self, comparisons: List[np.ndarray]) -> float:
+    def average(self, comparisons: List[float]) -> float:
         return [np.mean(comparison) for comparison in comparisons]
 
-    def compare(self) -> List[np.ndarray]:
+    def get_pixel_array(self, frame: object) -> np.ndarray:
         """
-        Compare two images. 
+        Get the pixels of an image with the channels in the last axis.
+
+            Parameters
+                frame (object): Path of the image, PIL image or array
+    
+            Returns
+                return Array with shape (height, width, channels)
+        """
+
+        pixel_array = np.asarray(Image.open(frame) if isinstance(frame, str) else frame)
+        if pixel_array.dtype == bool:
+            pixel_array = pixel_array.astype(np.uint8)
+        return pixel_array[..., None] if pixel_array.ndim == 2 else pixel_array
+
+    def get_frame_pairs(self) -> Iterator[tuple]:
+        """
+        Get the pairs of original and video frames one at a time, the images with the same name in both folders.
 
             Parameters
                 None
     
             Returns
-                return None
+                return Iterator over the original frame and the video frame of each pair
         """
-        
-        # Iterate over all files in the directory
-        comparisons = []
-        for filename in os.listdir(self.original_frames_path):
+
+        for filename in sorted(os.listdir(self.original_frames_path), key=lambda filename: (len(filename), filename)):
             original_file_path = os.path.join(self.original_frames_path, filename)
             video_file_path = os.path.join(self.video_frames_path, filename)
             if os.path.isfile(original_file_path) and os.path.isfile(video_file_path):
-                original_img = Image.open(original_file_path)
-                video_img = Image.open(video_file_path)
-                width, height = original_img.size
-                comparison = np.zeros(shape=(height, width), dtype=np.float64)
-                for y in range(height):
-                    for x in range(width):
-                        pixel0 = original_img.getpixel((x, y))
-                        pixel1 = video_img.getpixel((x, y))
-                        comparison[y][x] = self.rgb_similarity(pixel1, pixel0)
-                comparisons.append(comparison)
-        return comparisons
+                yield original_file_path, video_file_path
+
+    def compare_frame(self, index: int, original_frame: object, video_frame: object) -> float:
+        """
+        Compare an original frame with its video frame, the similarity of every heatmap_step frames is saved as a heatmap.
 
+            Parameters
+                index (int): Index of the frame
+                original_frame (object): Path of the image, PIL image or array of the original frame
+                video_frame (object): Path of the image, PIL image or array of the video frame
+    
+            Returns
+                return The average similarity of the pixels of the frame
+        """
+
+        comparison = self.rgb_similarity(self.get_pixel_array(video_frame), self.get_pixel_array(original_frame))
+        if self.heatmap_step > 0 and index % self.heatmap_step == 0:
+            self.save(index, comparison)
+        return float(np.mean(comparison))
 
+    def compare(self) -> List[float]:
+        """
+        Compare the original frames with the video frames of the folders one pair at a time, so only one pair is in memory.
 
+            Parameters
+                None
+    
+            Returns
+                return List with the average similarity of the pixels of each frame
+        """
+
+        return [self.compare_frame(i, original_frame, video_frame) for i, (original_frame, video_frame) in enumerate(self.get_frame_pairs())]
+
+    def stream(self, frame_pairs: Iterable[tuple]) -> Iterator[tuple]:
+        """
+        Compare the pairs of frames as they are read and pass them on (to decode them in the same pass),
+        the similarity of each frame is added to the comparisons.
+
+            Parameters
+                frame_pairs (Iterable[tuple]): Original frame and video frame of each pair
+    
+            Returns
+                return Iterator over the original frame and the video frame of each pair
+        """
 
+        for original_frame, video_frame in frame_pairs:
+            self.comparisons.append(self.compare_frame(len(self.comparisons), original_frame, video_frame))
+            yield original_frame, video_frame
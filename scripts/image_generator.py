@@ -1,7 +1,7 @@
 import scripts.constants
 from scripts.misc import *
-from typing import List
 from PIL import Image
+import numpy as np
 
 class ImageGenerator:
     """
@@ -10,7 +10,7 @@ class ImageGenerator:
         Attributes
         ----------
 
-        coded_content : str
+        coded_content : "BitBuffer"
             Text file coded content
         bit_depth : int
             Bit depth (bpp) of the image
@@ -22,7 +22,11 @@ class ImageGenerator:
             Width of the image
         height : int
             Height of the image
-        pixel_array : List[List]
+        channels : int
+            Number of channels of each pixel
+        cell_grid : "CellGrid"
+            Grid of cells of the image (None to write each byte of the content in one channel)
+        pixel_array : np.ndarray
             Matrix with pixels
         image : "PIL.Image.Image"
             PIL Image object
@@ -30,9 +34,9 @@ class ImageGenerator:
         Methods
         -------
 
-        generate_pixels(self) -> List:
+        generate_pixels(self) -> np.ndarray:
             Generate the image pixels from the content.
-        get_pixel_array(self, pixels: List) -> List[List]:
+        get_pixel_array(self, pixels: np.ndarray) -> np.ndarray:
             Generate the array of pixels from the pixel list.
         create_img(self) -> "PIL.Image.Image":
             Create the image from the pixel array.
@@ -40,60 +44,55 @@ class ImageGenerator:
             Save the image in the given path.
     """
 
-    def __init__(self, coded_content: str, bit_depth: int, dimensions: tuple) -> None:
+    def __init__(self, coded_content: "BitBuffer", bit_depth: int, dimensions: tuple, cell_grid: "CellGrid" = None) -> None:
         self.coded_content = coded_content
         self.bit_depth = bit_depth
+        self.cell_grid = cell_grid
         self.total_pixels = len(self.coded_content)/self.bit_depth
+        if self.cell_grid is not None:
+            self.total_pixels = len(self.coded_content)*self.cell_grid.get_pixels_per_bit(self.bit_depth)
         self.dimensions = dimensions
         self.width, self.height = self.dimensions
-        self.pixel_array = self.get_pixel_array(self.generate_pixels())
+        self.channels = max(self.bit_depth//scripts.constants.BITS_PER_CHANNEL, 1)
+        if self.cell_grid is not None:
+            self.pixel_array = self.cell_grid.to_pixel_array(self.coded_content, self.bit_depth, self.dimensions)
+        else:
+            self.pixel_array = self.get_pixel_array(self.generate_pixels())
         self.image = self.create_img()
 
-    def generate_pixels(self) -> List:
+    def generate_pixels(self) -> np.ndarray:
         """
-        Generate the image pixels from the content.
+        Generate the image pixels from the content, each byte of the packed content is the value of one channel.
 
             Parameters
                 None
 
             Returns
-                return The list of pixels
+                return The array with the values of the channels of every pixel (filled with zeros)
         """
 
-        pixels = []
-        for i in range(0, len(self.coded_content), self.bit_depth):
-            splitted_coded_content, sub = self.coded_content[i:i+self.bit_depth], []
-            # Divide by the number of channels
-            for j in range(0, len(splitted_coded_content), self.bit_depth//3):
-                if splitted_coded_content[j:j+self.bit_depth//3]:
-                    if len(splitted_coded_content[j:j+8]) < 8:
-                        sub.append(int(zero_pad_right(splitted_coded_content[j:j+8], self.bit_depth//3), 2))
-                    else:
-                        sub.append(int(splitted_coded_content[j:j+8], 2))
-            if len(sub) < 3:
-                for i in range(3-len(sub)):
-                    sub.append(0)
-            pixels.append(tuple(sub))
+        if self.bit_depth < scripts.constants.BITS_PER_CHANNEL:
+            values = self.coded_content.to_bits()
+        else:
+            values = np.frombuffer(self.coded_content.to_bytes(), dtype=np.uint8)
+        pixels = np.zeros(self.width*self.height*self.channels, dtype=np.uint8)
+        pixels[:values.size] = values
         return pixels
 
-    def get_pixel_array(self, pixels: List) -> List[List]:
+    def get_pixel_array(self, pixels: np.ndarray) -> np.ndarray:
         """
         Generate the array of pixels from the pixel list.
 
             Parameters
-                pixels (List): List of pixels
+                pixels (np.ndarray): Values of the channels of every pixel
 
             Returns
-                return The array of pixels
+                return The array of pixels with shape (height, width, channels) or (height, width) with one channel
         """
 
-        array = []
-        for i in range(self.height): 
-            array.append(pixels[i*self.width:(i+1)*self.width])
-        if len(array[-1]) < self.width:
-            for i in range(self.width-len(array[-1])):
-                array[-1].append(tuple([0, 0, 0]))
-        return array
+        if self.channels == 1:
+            return pixels.reshape(self.height, self.width)
+        return pixels.reshape(self.height, self.width, self.channels)
 
     def create_img(self) -> "PIL.Image.Image":
         """
@@ -106,12 +105,9 @@ class ImageGenerator:
                 return PIL.Image.Image create from the the pixel array
         """
 
-        image = Image.new(scripts.constants.MODES[self.bit_depth], (self.width, self.height))
-        for row in range(len(self.pixel_array)):
-            for col in range(len(self.pixel_array[row])):
-                pixel_value = self.pixel_array[row][col]
-                image.putpixel((col, row), pixel_value)
-        return image
+        if self.bit_depth < scripts.constants.BITS_PER_CHANNEL:
+            return Image.fromarray(self.pixel_array.astype(bool))
+        return Image.fromarray(self.pixel_array, scripts.constants.MODES[self.bit_depth])
 
     def save(self, file_path: str) -> None:
         """
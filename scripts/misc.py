@@ -1,3 +1,5 @@
+import zlib, lzma, bz2, sys, numpy as np
+
 def zero_pad_right(binary_string: str,  length: int) -> str:
     """
     Add zeros to fit the length.
@@ -68,3 +70,130 @@ def int_to_bin_left_padding(num: int, n: int) -> str:
 
     return str(bin(num)[2:]).zfill(n)
 
+def count_codepoints(codepoints: np.ndarray, minlength: int) -> np.ndarray:
+    """
+    Count the occurrences of each code point.
+
+        Parameters
+            codepoints (np.ndarray): Array with the code points
+            minlength (int): Minimal length of the result
+
+        Returns
+            return Array with the number of occurrences of each code point
+    """
+
+    return np.bincount(codepoints, minlength=minlength)
+
+def get_codepoints(content: str) -> np.ndarray:
+    """
+    Get the code point of each character of the content.
+
+        Parameters
+            content (str): Text file content
+
+        Returns
+            return Array with the code points (uint32)
+    """
+
+    return np.frombuffer(content.encode("utf-32-le"), dtype="<u4")
+
+def get_symbol_index(symbols: list) -> np.ndarray:
+    """
+    Get the symbol index of each code point up to the last symbol, the indexes have the smallest
+    signed type that holds them (int16 for the byte alphabet).
+
+        Parameters
+            symbols (list): Symbols in the order of their indexes
+
+        Returns
+            return Array with the symbol index of each code point (-1 if the code point isn't a symbol)
+    """
+
+    codepoints = np.array([ord(symbol) for symbol in symbols], dtype=np.int64)
+    dtype = np.int16 if codepoints.size <= np.iinfo(np.int16).max else np.int32
+    index = np.full(codepoints.max()+1 if codepoints.size else 0, -1, dtype=dtype)
+    index[codepoints] = np.arange(codepoints.size)
+    return index
+
+def get_symbol_indexes(content: str, index: np.ndarray) -> np.ndarray:
+    """
+    Get the symbol index of each character of the content, the content is mapped in chunks of
+    ENCODE_CHUNK_LENGTH characters so only one chunk of code points (4 bytes each) is in memory.
+
+        Parameters
+            content (str): Text file content
+            index (np.ndarray): Symbol index of each code point (see get_symbol_index)
+
+        Returns
+            return Array with the symbol indexes (-1 for the characters that aren't symbols)
+    """
+
+    # scripts.constants is imported here because it imports the coding methods (and they import this module)
+    import scripts.constants
+    symbols = np.full(len(content), -1, dtype=index.dtype)
+    if not index.size:
+        return symbols
+    for i in range(0, len(content), scripts.constants.ENCODE_CHUNK_LENGTH):
+        codepoints = get_codepoints(content[i:i+scripts.constants.ENCODE_CHUNK_LENGTH])
+        chunk = index[np.minimum(codepoints, index.size-1)]
+        symbols[i:i+codepoints.size] = np.where(codepoints < index.size, chunk, -1)
+    return symbols
+
+def to_symbols(values: np.ndarray) -> list:
+    """
+    Convert the code points read from a header of the coded content into symbols.
+
+        Parameters
+            values (np.ndarray): Code points of the symbols
+
+        Returns
+            return List with the symbols or raise a DecodingError (a value isn't a code point)
+    """
+
+    # scripts.decoder is imported here because it imports this module
+    from scripts.decoder import DecodingError
+    values = np.asarray(values, dtype=np.uint64)
+    if values.size and int(values.max()) > sys.maxunicode:
+        raise DecodingError(f"The symbols of the header ({int(values.max())}) aren't code points.")
+    return [chr(value) for value in values.tolist()]
+
+def compress_bytes(data: bytes, compression: str, level: int) -> bytes:
+    """
+    Compress the data with a standard library compressor.
+
+        Parameters
+            data (bytes): Data to compress
+            compression (str): Name of the compressor ("zlib", "lzma" or "bz2")
+            level (int): Level of the compression (0 to 9, bz2 uses at least 1)
+
+        Returns
+            return The compressed data
+    """
+
+    if compression == "zlib":
+        return zlib.compress(data, level)
+    if compression == "lzma":
+        return lzma.compress(data, preset=level)
+    if compression == "bz2":
+        return bz2.compress(data, max(level, 1))
+    raise Exception(f"The compression method ({compression}) isn't available.")
+
+def decompress_bytes(data: bytes, compression: str) -> bytes:
+    """
+    Decompress the data of a standard library compressor.
+
+        Parameters
+            data (bytes): Compressed data
+            compression (str): Name of the compressor ("zlib", "lzma" or "bz2")
+
+        Returns
+            return The original data
+    """
+
+    if compression == "zlib":
+        return zlib.decompress(data)
+    if compression == "lzma":
+        return lzma.decompress(data)
+    if compression == "bz2":
+        return bz2.decompress(data)
+    raise Exception(f"The compression method ({compression}) isn't available.")
@@ -2,9 +2,11 @@ from scripts.file_manager import FileManager
 from scripts.source import Source
 from scripts.encoders.huffman import Huffman
 from scripts.encoder import Encoder
-from scripts.decoder import Decoder
+from scripts.decoder import Decoder, DecodingError
 from scripts.video_generator import VideoGenerator
 from scripts.image_comparator import ImageComparator
+from scripts.bit_buffer import BitBuffer
+from scripts.cell_grid import CellGrid
 from scripts.entity import Entity
 from scripts.misc import *
 from math import ceil
@@ -29,6 +31,38 @@ class Program(Entity):
             Name of the coding method to use
         args : tuple
             Extra arguments of the coding method
+        canonical : bool
+            Use the canonical source code as header of the coded content
+        heatmap_step : int
+            Save the comparison heatmap of every heatmap_step frames (0 to disable)
+        save_frames : bool
+            Save the original and the video frames as images (otherwise they stay in memory)
+        workers : int
+            Number of workers to generate and decode the frames, and to encode and decode the blocks of the blocked Huffman code
+        executor : str
+            Pool of the workers ("thread" or "process")
+        binary : bool
+            Encode the bytes of the file instead of its text (the decoded bytes are saved in the parent path)
+        compression : str
+            Name of the pre-compression method of the content (None to encode the text)
+        compression_level : int
+            Level of the pre-compression
+        error_correction : str
+            Name of the error correcting code of the frames (None to only repeat the bits)
+        error_correction_args : list
+            Extra arguments of the error correcting code (strength)
+        error_corrector : "ErrorCorrector"
+            Error correcting code of the frames
+        cell_width : int
+            Number of pixels of each row of the cells of the frames (None to repeat the bits and the rows)
+        cell_height : int
+            Number of rows of the cells of the frames (None to repeat the bits and the rows)
+        cell_bits : int
+            Number of bits of each channel of the cells
+        cell_sampling : str
+            Way to read the interior of the cells ("mean" or "center")
+        cell_grid : "CellGrid"
+            Grid of cells of the frames
         metrics : dict
             Dictionary with the program metrics
 
@@ -47,6 +81,10 @@ class Program(Entity):
             Get the metrics.
         generate_results(self) -> str:
             Generate the final results.
+        get_compression_metrics(self, video: "VideoGenerator", decoder: "Decoder") -> dict:
+            Get the metrics of the pre-compression.
+        select_error_corrector(self) -> "ErrorCorrector":
+            Select the error correcting code of the frames.
         initialization(self) -> None:
             Initializate the program.
         run(self) -> None:
@@ -60,9 +98,38 @@ class Program(Entity):
         "bit_width"     : int,
         "bit_height"    : int,
         "args"          : list,
+        "canonical"     : bool,
+        "heatmap_step"  : int,
+        "save_frames"   : bool,
+        "workers"       : int,
+        "executor"      : str,
+        "compression"   : str,
+        "compression_level" : int,
+        "binary"        : bool,
+        "error_correction" : str,
+        "error_correction_args" : list,
+        "cell_width"    : int,
+        "cell_height"   : int,
+        "cell_bits"     : int,
+        "cell_sampling" : str,
     }
 
     def __init__(self, **kwargs: dict) -> None:
+        # Default values
+        self.canonical = False
+        self.heatmap_step = 0
+        self.save_frames = False
+        self.workers = 1
+        self.executor = "thread"
+        self.compression = None
+        self.compression_level = scripts.constants.COMPRESSION_LEVEL
+        self.binary = False
+        self.error_correction = None
+        self.error_correction_args = []
+        self.cell_width = None
+        self.cell_height = None
+        self.cell_bits = scripts.constants.CELL_BITS
+        self.cell_sampling = "mean"
         # Validate the kwargs arguments
         self.validate_kwargs(kwargs, self.valid_kwargs) 
         self.initialization()
@@ -171,14 +238,16 @@ class Program(Entity):
         Generate the final results.
 
             Parameters
-                decoder_content (str): Final result of the code
+                decoder_content (str): Final result of the code (None if the frames couldn't be decoded)
     
             Returns
                 return The results of the Program execution.
         """
 
+        # The content of a pre-compressed file is compared with the text (or the bytes) of the file
+        original_content = self.file_manager.content[:-1] if self.compression is None else self.file_manager.convert()
         result = f"Basic information - {self.coding_method}\n"
-        result += "Result: True\n" if self.file_manager.content[:-1] == decoder_content else "Result: False\n"
+        result += "Result: True\n" if original_content == decoder_content else "Result: False\n"
         result += "File path: " + self.file_manager.file_path + "\n"
         result += "Coding method: " + self.coding_method + "\n"
         result += "Unique characters: " + str(len(self.file_manager.symbols)) + "\n"
@@ -187,6 +256,55 @@ class Program(Entity):
         result += "Metrics\n"
         return result
 
+    def get_compression_metrics(self, video: "VideoGenerator", decoder: "Decoder") -> dict:
+        """
+        Get the metrics of the pre-compression, the frames saved are counted against the frames that the
+        content of the file encoded with the same coding method without pre-compression fills (at the resolution of the video).
+
+            Parameters
+                video ("VideoGenerator"): Video generator of the coded content
+                decoder ("Decoder"): Decoder of the video
+
+            Returns
+                return Dictionary with the metrics
+        """
+
+        # Encode the content of the file again without the pre-compression
+        file_manager = FileManager(self.file_path, binary=self.binary)
+        encoder = Encoder(
+            coding_method=self.coding_method,
+            source=Source(symbols=file_manager.symbols, probability_distribution=file_manager.get_probability_distribution()),
+            args=self.args,
+            canonical=self.canonical,
+            binary=self.binary
+        )
+        original_bits = len(encoder.preamble_to_string() + encoder.source_code_to_string(file_manager.end_delimiter)) + len(encoder.encode(file_manager.content))
+        original_frames = max(ceil(original_bits/video.payload_capacity), 1)
+        return {
+            "compression": f"{self.compression} (level {self.compression_level})",
+            "compressed-bytes": self.file_manager.length - 1,
+            "frames": video.frames,
+            "frames-saved": original_frames - video.frames,
+            "compression-time": self.file_manager.compression_time + decoder.decompression_time,
+        }
+
+    def select_error_corrector(self) -> "ErrorCorrector":
+        """
+        Select the error correcting code of the frames.
+
+            Parameters
+                None
+
+            Returns
+                return The error correcting code (None without error correction) or raise an Exception
+        """
+
+        if self.error_correction is None:
+            return None
+        if self.error_correction not in scripts.constants.ERROR_CORRECTION_METHODS:
+            raise Exception(f"The error correction method ({self.error_correction}) isn't available.")
+        return scripts.constants.ERROR_CORRECTION_METHODS[self.error_correction](*self.error_correction_args)
+
     def initialization(self) -> None:
         """
         Initializate the program.
@@ -202,11 +320,36 @@ class Program(Entity):
         self.create_paths()
         self.create_folders()
 
-        self.file_manager = FileManager(self.file_path)
+        self.file_manager = FileManager(self.file_path, self.compression, self.compression_level, self.binary)
         self.metrics = {}
 
         # Assert lower case letters
         self.coding_method = self.coding_method.lower();
+        self.executor = self.executor.lower()
+        if self.executor not in ("process", "thread"):
+            raise Exception(f"The executor ({self.executor}) isn't available.")
+
+        # The blocked Huffman code encodes and decodes its blocks with the workers of the program (output symbols, block length, workers, executor)
+        if self.coding_method == "blocked_huffman" and len(self.args) < 3:
+            self.args = list(self.args) + [None]*(2 - len(self.args)) + [self.workers, self.executor]
+
+        # The inverse source code can't hold the byte alphabet of the binary and pre-compressed contents (8 bits symbols and delimiter)
+        # nor the texts with symbols above 255 or the delimiter
+        self.canonical = (
+            self.canonical or self.binary or self.compression is not None
+            or max(map(ord, self.file_manager.symbols), default=0) >= 1 << scripts.constants.BLOCK_CODE_LENGTH
+            or scripts.constants.SOURCE_CODE_DELIMITER in self.file_manager.symbols
+        )
+
+        # Assert lower case letters
+        if self.error_correction is not None:
+            self.error_correction = self.error_correction.lower()
+        self.error_corrector = self.select_error_corrector()
+
+        # Grid of cells of the frames (square cells if only one side is given)
+        self.cell_grid = None
+        if self.cell_width is not None or self.cell_height is not None:
+            self.cell_grid = CellGrid(self.cell_width or self.cell_height, self.cell_height or self.cell_width, self.cell_bits, self.cell_sampling)
 
     def run(self) -> None:
         """
@@ -228,34 +371,44 @@ class Program(Entity):
         # Get the content of the file
         content = self.file_manager.content
 
+        # Record the pre-compression in the preamble
+        compression = {} if self.compression is None else {"compression": self.compression, "compression_level": self.compression_level}
+
         # Create the encoder & get the source code 
         encoder = Encoder(
             coding_method=self.coding_method,
             source=source, 
-            args=self.args
+            args=self.args,
+            canonical=self.canonical,
+            binary=self.binary,
+            **compression
         )
 
         source_code = encoder.source_code
-        inverse_source_code = source_code.inverse()
 
-        # Get the inverse source code in string format
-        inverse_source_code_str = inverse_source_code.inverse_source_code_to_string(scripts.constants.BLOCK_CODE_LENGTH)
-        
-        """
-        
+        # Get the preamble and the source code in string format (header of the coded content)
+        source_code_str = encoder.preamble_to_string() + encoder.source_code_to_string(self.file_manager.end_delimiter)
+
         # Average word length and entropy of the source and source code
-        average_length = source_code.average_length(source)
+        average_length = encoder.encoder.average_length(source_code)
 
         # The base of the entropy is 2
         entropy = source.entropy(scripts.constants.ENTROPY_ARITY)
 
-        # Add the inverse source code to the coded content of the text file and the delimiters
-        coded_content = inverse_source_code_str + character_to_binary(scripts.constants.SOURCE_CODE_DELIMITER, scripts.constants.BLOCK_CODE_LENGTH) + encoder.encode(content) 
-        coded_content = encoder.add_redundancy(coded_content, self.bit_width)
+        # Add the source code to the coded content of the text file
+        coded_content = BitBuffer.from_string(source_code_str)
+        coded_content.append(encoder.encode(content))
+
+        # Protect the content of the frames with the error correcting code
+        error_correction = {} if self.error_corrector is None else {"error_corrector": self.error_corrector}
+
+        # Write the content in the cells of the frames instead of repeating the bits and the rows
+        cells = {} if self.cell_grid is None else {"cell_grid": self.cell_grid}
 
         # Video generator in the platform of youtube
         video = VideoGenerator(
             coded_content = coded_content,
+            positions = encoder.get_positions(content, len(source_code_str)),
             bit_depth = scripts.constants.BIT_DEPTH,
             platform = self.platform.lower(),
             bit_width = self.bit_width,
@@ -263,31 +416,63 @@ class Program(Entity):
             original_frames_path = self.original_frames_path,
             video_frames_path = self.video_frames_path,
             video_path = self.video_path,
+            save_frames = self.save_frames,
+            workers = self.workers,
+            executor = self.executor,
+            **error_correction,
+            **cells
         )
 
-        # Decoder
-        decoder = Decoder(self.original_frames_path)
-
-        coded_content_decoder = decoder.get_coded_content()
-
-        decoder_content = decoder.decode(coded_content_decoder)
+        # Decoder of the frames read back from the video when they have an error correcting code or a grid of cells (the images
+        # extracted from the video or the video itself), otherwise of the original frames (the images of the folder or the frames generated again)
+        read_back = self.error_corrector is not None or self.cell_grid is not None
+        decoder = Decoder(
+            self.video_frames_path if read_back else self.original_frames_path,
+            self.canonical, self.bit_width, self.bit_height, self.workers, self.executor,
+            coding_method=self.coding_method, error_corrector=self.error_corrector, cell_grid=self.cell_grid
+        )
 
-        # Image comparison
+        # Image comparison (the frames of the video are compared with the original frames while they are decoded)
         image_comparator = ImageComparator(
             self.original_frames_path,
             self.video_frames_path,
-            self.comparison_path
+            self.comparison_path,
+            self.heatmap_step,
+            not self.save_frames
         )
-        image_comparator.compare()
+
+        try:
+            if self.save_frames:
+                decoder_content = decoder.decode_frames()
+            else:
+                frame_pairs = image_comparator.stream(video.get_frame_pairs(video.video_file_path))
+                decoder_content = decoder.decode_frames(video_frame if read_back else original_frame for original_frame, video_frame in frame_pairs)
+        except DecodingError as e:
+            # The frames couldn't be decoded (the result is False)
+            decoder_content = None
+            self.metrics["decoding-error"] = str(e)
+
+        # Write back the exact bytes of the binary files
+        if self.binary and decoder_content is not None:
+            decoder.save_content(decoder_content, self.parent_path + "\\decoded_" + os.path.basename(self.file_path))
+
         comparisons = image_comparator.average(image_comparator.comparisons)
 
         # Save basic metrics
         self.metrics["entropy"] = entropy
         self.metrics["average-length"] = average_length
         self.metrics["efficiency"] = entropy/average_length
+        self.metrics["header-bits"] = len(source_code_str)
         self.metrics["pixels"] = video.total_pixels
         self.metrics["dimensions"] = (video.width, video.height)
+        self.metrics["frames"] = video.frames
+        self.metrics["payload-capacity"] = video.payload_capacity
+        if self.error_corrector is not None:
+            self.metrics["error-correction"] = str(self.error_corrector)
+        if self.cell_grid is not None:
+            self.metrics["cells"] = str(self.cell_grid)
+        if self.compression is not None:
+            self.metrics.update(self.get_compression_metrics(video, decoder))
         
         result = self.generate_results(decoder_content, comparisons) + "\n" + self.get_metrics()
-        self.log(f"log_{self.coding_method}.txt", result)
-        """
\ No newline at end of file
+        self.log(f"log_{self.coding_method}.txt", result)
\ No newline at end of file
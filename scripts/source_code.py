@@ -1,6 +1,7 @@
 from scripts.entity import Entity
 from scripts.misc import *
 from typing import List
+from collections import Counter
 
 
 class SourceCode(Entity):
@@ -28,8 +29,14 @@ class SourceCode(Entity):
             Get inverse source code.
         average_length(self, source: "Source") -> float:
             Get the average length of the source code.
-        source_code_to_string(self, length: int) -> str:
+        inverse_source_code_to_string(self, length: int) -> str:
             Convert the source code object into a string object with then next format:
+        canonical_code_words(lengths: List[int]) -> List[str]:
+            Get the canonical code words of a list of sorted lengths.
+        canonical(self) -> "SourceCode":
+            Get the canonical source code with the same code word lengths.
+        canonical_source_code_to_string(self, end_symbol: str, field_length: int) -> str:
+            Convert the canonical source code into a string object with the code word lengths.
     """
 
     valid_kwargs = {
@@ -113,3 +120,76 @@ class SourceCode(Entity):
         for key in self.map:
             sc_to_string += character_to_binary(self.map[key], length) + int_to_bin_left_padding(len(key), length) + key
         return sc_to_string
+
+
+    @staticmethod
+    def canonical_code_words(lengths: List[int]) -> List[str]:
+        """
+        Get the canonical code words of a list of sorted lengths, each code word is the
+        previous one plus one, shifted to the left to fit its length.
+
+            Parameters
+                lengths (List[int]): Sorted lengths of the code words
+
+            Returns
+                return List with the binary code words
+        """
+
+        code_words, code, previous = [], 0, lengths[0] if lengths else 0
+        for length in lengths:
+            code <<= length - previous
+            code_words.append(int_to_bin_left_padding(code, length))
+            code, previous = code + 1, length
+        return code_words
+
+    def canonical(self) -> "SourceCode":
+        """
+        Get the canonical source code with the same code word lengths, the symbols are sorted
+        by the length of their code word and then by their value.
+
+            Parameters
+                None
+
+            Returns
+                return The canonical SourceCode
+        """
+
+        if any(set(code_word) - {"0", "1"} for code_word in self.symbols2):
+            raise Exception("The canonical source code needs binary code words.")
+        order = sorted(range(len(self.symbols1)), key=lambda i: (len(self.symbols2[i]), ord(self.symbols1[i])))
+        code_words = self.canonical_code_words([len(self.symbols2[i]) for i in order])
+        symbols2 = [""]*len(self.symbols1)
+        for i, code_word in zip(order, code_words):
+            symbols2[i] = code_word
+        return SourceCode(
+            symbols1=self.symbols1,
+            symbols2=symbols2
+        )
+
+    def canonical_source_code_to_string(self, end_symbol: str, field_length: int) -> str:
+        """
+        Convert the canonical source code into a string object with the next format:
+            symbol width + maximal length + number of code words of each length (1 to maximal length) +
+            end symbol + symbols sorted by the length of their code word and then by their value
+
+            Parameters
+                end_symbol (str): Symbol that ends the content
+                field_length (int): Number of bits of the symbol width and the maximal length
+
+            Returns
+                return String source code format
+        """
+
+        lengths = Counter(len(code_word) for code_word in self.symbols2)
+        symbols = sorted(self.symbols1, key=lambda symbol: (len(self.map[symbol]), ord(symbol)))
+        # The end symbol can be outside of the symbols (e.g. the blocks of the blocked coding methods)
+        symbol_width = max(ord(symbol) for symbol in self.symbols1 + [end_symbol]).bit_length()
+        max_length = max(lengths)
+        if max_length >= 1 << field_length:
+            raise Exception(f"The code words are too long for the canonical source code ({max_length}).")
+        sc_to_string = int_to_bin_left_padding(symbol_width, field_length)
+        sc_to_string += int_to_bin_left_padding(max_length, field_length)
+        # The count of symbols of each length fits in symbol_width+1 bits
+        sc_to_string += "".join(int_to_bin_left_padding(lengths[length], symbol_width+1) for length in range(1, max_length+1))
+        sc_to_string += character_to_binary(end_symbol, symbol_width)
+        return sc_to_string + "".join(character_to_binary(symbol, symbol_width) for symbol in symbols)
@@ -1,9 +1,15 @@
 from scripts.image_generator import ImageGenerator
+from scripts.bit_buffer import BitBuffer
+from scripts.error_correctors.error_corrector import ErrorCorrector
+from scripts.cell_grid import CellGrid
 from scripts.entity import Entity
 from scripts.constants import *
-from typing import List
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from collections import deque
+from typing import Iterator
 from math import ceil
-import cv2, os, numpy as np
+from PIL import Image
+import cv2, os, json, numpy as np
 
 
 class VideoGenerator(Entity):
@@ -13,8 +19,10 @@ class VideoGenerator(Entity):
         Attributes
         ----------
 
-        coded_content : str
-            Text file coded content
+        coded_content : "BitBuffer"
+            Text file coded content (without redundancy)
+        positions : np.ndarray
+            Position of the first bit of each code word of the coded content (None to set the offsets to 0)
         bit_depth : int
             Bit depth (bpp) of the image
         platform : str
@@ -27,38 +35,72 @@ class VideoGenerator(Entity):
             Width of the image
         height : int
             Height of the image
-        pixel_array : List[List]
-            Matrix with pixels
-        images : List
-            List with PIL Image objects
+        frames : int
+            Number of frames
+        frame_capacity : int
+            Number of bits of each frame before the rows are repeated (or the bits of the cells)
+        code_capacity : int
+            Number of bits of each frame before the bits are repeated (the code words of the error correcting code)
+        payload_capacity : int
+            Number of bits of the coded content in each frame
         original_frames_path : str
             Path of the original frames folder
         video_frames_path : str
             Path of the video frames folder
         video_path : str
             Path of the video folder
+        video_file_path : str
+            Path of the video file
+        index_file_path : str
+            Path of the seek index of the video (None without the positions of the code words)
+        save_frames : bool
+            Save the original and the video frames as images (otherwise they are generated and read again with get_frame_pairs)
+        workers : int
+            Number of workers to generate the frames (1 to generate them in the main process)
+        executor : str
+            Pool of the workers ("process" or "thread")
+        error_corrector : "ErrorCorrector"
+            Error correcting code of the content of each frame (None to only repeat the bits)
+        cell_grid : "CellGrid"
+            Grid of cells of the frames (None to repeat the bits and the rows)
 
         Methods
         -------
 
         fit_resolution(self) -> tuple:
             Find the best resolution for the total pixels.
-        generate_images(self) -> List:
-            Generate the video images (frames).
+        get_frame_header(self, index: int, payload_length: int, offset: int) -> "BitBuffer":
+            Get the header of a frame.
+        get_checkpoint(self, index: int) -> tuple:
+            Get the first code word that starts in the payload of a frame.
+        get_seek_index(self) -> dict:
+            Get the seek index of the video.
+        save_seek_index(self, file_path: str) -> None:
+            Save the seek index of the video as a json file.
+        get_frame_contents(self) -> Iterator["BitBuffer"]:
+            Get the content of each frame (header and payload) without redundancy.
+        generate_frame(frame_content: "BitBuffer", bit_depth: int, dimensions: tuple, bit_width: int, bit_height: int, error_corrector: "ErrorCorrector" = None, cell_grid: "CellGrid" = None) -> np.ndarray:
+            Generate the pixels of one frame.
+        to_image(self, pixel_array: np.ndarray) -> "PIL.Image.Image":
+            Create the image of a frame from its pixels.
+        generate_frames(self) -> Iterator["PIL.Image.Image"]:
+            Generate the video images (frames) one at a time.
+        read_frames(self, video_path: str) -> Iterator[np.ndarray]:
+            Read the frames of the video one at a time.
+        get_frame_pairs(self, video_path: str) -> Iterator[tuple]:
+            Get the pairs of original and video frames one at a time.
         extract_frames(self, video_path: str, output_folder: str) -> None:
             Extract the frames of the video.
-        create_video(self, folder_path: str, fps: int) -> None:
+        to_bgr(self, image: "PIL.Image.Image") -> np.ndarray:
+            Convert the image into the BGR array expected by OpenCV.
+        create_video(self, file_path: str, fps: int, folder_path: str = None) -> None:
             Create the video in the given format.
-        save(self, file_path: str) -> None:
-            Save the video in the given path.
-        repeat_coded_content(self) -> str:
-            Repeat the bits row of the coded content with the bit height.
         initialization(self) -> None:
             Initializate the program.
     """
 
     valid_kwargs = {
-        "coded_content"        : str,
+        "coded_content"        : BitBuffer,
         "bit_depth"            : int,
         "platform"             : str,
         "bit_width"            : int,
@@ -66,9 +108,22 @@ class VideoGenerator(Entity):
         "original_frames_path" : str,
         "video_frames_path"    : str,
         "video_path"           : str,
+        "save_frames"          : bool,
+        "workers"              : int,
+        "executor"             : str,
+        "positions"            : np.ndarray,
+        "error_corrector"      : ErrorCorrector,
+        "cell_grid"            : CellGrid,
     }
 
     def __init__(self, **kwargs: dict) -> None:
+        # Default values
+        self.positions = None
+        self.save_frames = True
+        self.workers = 1
+        self.executor = "thread"
+        self.error_corrector = None
+        self.cell_grid = None
         # Validate the kwargs arguments
         self.validate_kwargs(kwargs, self.valid_kwargs)
         self.initialization()
@@ -113,100 +168,255 @@ class VideoGenerator(Entity):
             best_resolution = max(dimensions, key=lambda dimension: dimension[0][0])
             return best_resolution[0], best_resolution[2]
 
-    def generate_images(self) -> List:
+    def get_frame_header(self, index: int, payload_length: int, offset: int) -> "BitBuffer":
         """
-        Generate the video images (frames).
+        Get the header of a frame: index of the frame, total frames, number of bits of the
+        payload and position of the first code word that starts in the payload.
+
+            Parameters
+                index (int): Index of the frame
+                payload_length (int): Number of bits of the payload of the frame
+                offset (int): Position of the first code word in the payload
+
+            Returns
+                return The header of the frame
+        """
+
+        header = BitBuffer()
+        for value in (index, self.frames, payload_length, offset):
+            header.append_int(value, FRAME_HEADER_FIELD_LENGTH)
+        return header
+
+    def get_checkpoint(self, index: int) -> tuple:
+        """
+        Get the first code word that starts in the payload of a frame.
+
+            Parameters
+                index (int): Index of the frame
+
+            Returns
+                return Tuple with the index of the character and the position of the code word in the payload
+        """
+
+        if self.positions is None:
+            return 0, 0
+        start = index*self.payload_capacity
+        character = int(np.searchsorted(self.positions, start))
+        if character == self.positions.size:
+            # The rest of the payload belongs to the last code word
+            return character, len(self.coded_content) - start
+        return character, int(self.positions[character]) - start
+
+    def get_seek_index(self) -> dict:
+        """
+        Get the seek index of the video, a checkpoint for each frame with the first character
+        that starts in the frame and the position of its code word in the payload.
 
             Parameters
                 None
 
             Returns
-                return List with the images
+                return Dictionary with the number of characters, the number of frames and the checkpoints
         """
 
-        coded_content_area, images = self.width*self.height*self.bit_depth, []
-        for i in range(0, len(self.coded_content), coded_content_area):
-            images.append(ImageGenerator(self.coded_content[i: i+coded_content_area], self.bit_depth, self.dimensions).image)
-        return images
+        checkpoints = []
+        for index in range(self.frames):
+            character, offset = self.get_checkpoint(index)
+            checkpoints.append({"frame": index, "character": character, "offset": offset})
+        return {"characters": int(self.positions.size), "frames": self.frames, "checkpoints": checkpoints}
 
-    def extract_frames(self, video_path: str, output_folder: str) -> None:
+    def save_seek_index(self, file_path: str) -> None:
         """
-        Extract the frames of the video.
+        Save the seek index of the video as a json file.
 
             Parameters
-                video_path (str): (str): Path of the video.
-                output_folder (str): Path to save the video frames.
+                file_path (str): Path to save the seek index
+
+            Returns
+                return None
+        """
+
+        with open(file_path, "w") as f:
+            json.dump(self.get_seek_index(), f)
+
+    def get_frame_contents(self) -> Iterator["BitBuffer"]:
+        """
+        Get the content of each frame (header and payload) without redundancy.
+
+            Parameters
+                None
+
+            Returns
+                return Iterator over the contents of the frames
+        """
+
+        for index in range(self.frames):
+            start = index*self.payload_capacity
+            payload = self.coded_content[start: start+self.payload_capacity]
+            _, offset = self.get_checkpoint(index)
+            yield self.get_frame_header(index, len(payload), min(offset, len(payload))) + payload
+
+    @staticmethod
+    def generate_frame(frame_content: "BitBuffer", bit_depth: int, dimensions: tuple, bit_width: int, bit_height: int, error_corrector: "ErrorCorrector" = None, cell_grid: "CellGrid" = None) -> np.ndarray:
+        """
+        Generate the pixels of one frame (it runs in the workers), the content is encoded with the
+        error correcting code before the bits and the rows are repeated (or written in the cells).
+
+            Parameters
+                frame_content ("BitBuffer"): Bits of the frame (header and payload) without redundancy
+                bit_depth (int): Bit depth (bpp) of the image
+                dimensions (tuple): Dimensions (width and height) of the image
+                bit_width (int): Number of repetitions of each bit
+                bit_height (int): Number of repetitions of each row
+                error_corrector ("ErrorCorrector"): Error correcting code of the content (None to skip it)
+                cell_grid ("CellGrid"): Grid of cells of the frame (None to repeat the bits and the rows)
+
+            Returns
+                return Array with the pixels of the frame
+        """
+
+        if error_corrector is not None:
+            length = (dimensions[1]//bit_height)*dimensions[0]*bit_depth//bit_width if cell_grid is None else cell_grid.get_capacity(dimensions, bit_depth)
+            frame_content = error_corrector.encode(frame_content, length)
+        if cell_grid is not None:
+            return ImageGenerator(frame_content, bit_depth, dimensions, cell_grid).pixel_array
+        frame_content = frame_content.repeat(bit_width).repeat_rows(dimensions[0]*bit_depth, bit_height)
+        return ImageGenerator(frame_content, bit_depth, dimensions).pixel_array
+
+    def to_image(self, pixel_array: np.ndarray) -> "PIL.Image.Image":
+        """
+        Create the image of a frame from its pixels.
+
+            Parameters
+                pixel_array (np.ndarray): Array with the pixels of the frame
+
+            Returns
+                return PIL.Image.Image of the frame
+        """
+
+        if self.bit_depth < BITS_PER_CHANNEL:
+            return Image.fromarray(pixel_array.astype(bool))
+        return Image.fromarray(pixel_array, MODES[self.bit_depth])
+
+    def generate_frames(self) -> Iterator["PIL.Image.Image"]:
+        """
+        Generate the video images (frames) one at a time, each frame holds its header and the
+        next payload_capacity bits of the coded content (in the code words of the error correcting code), with each bit repeated bit_width times
+        and each row repeated bit_height times. With several workers the frames are generated in a pool and returned in order,
+        at most 2*workers frames are pending at the same time.
+
+            Parameters
+                None
+
+            Returns
+                return Iterator over the images
+        """
+
+        args = (self.bit_depth, self.dimensions, self.bit_width, self.bit_height, self.error_corrector, self.cell_grid)
+        contents = self.get_frame_contents()
+        if self.workers <= 1:
+            for frame_content in contents:
+                yield self.to_image(self.generate_frame(frame_content, *args))
+            return
+        executor_class = ProcessPoolExecutor if self.executor == "process" else ThreadPoolExecutor
+        with executor_class(max_workers=self.workers) as executor:
+            pending = deque()
+            for frame_content in contents:
+                pending.append(executor.submit(self.generate_frame, frame_content, *args))
+                if len(pending) >= 2*self.workers:
+                    yield self.to_image(pending.popleft().result())
+            while pending:
+                yield self.to_image(pending.popleft().result())
+
+    def read_frames(self, video_path: str) -> Iterator[np.ndarray]:
+        """
+        Read the frames of the video one at a time.
+
+            Parameters
+                video_path (str): Path of the video
 
             Returns
-                return List with the images
+                return Iterator over the RGB arrays of the frames
         """
 
         video_capture = cv2.VideoCapture(video_path)
         if not video_capture.isOpened():
-            print("Error: Could not open video.")
-            return
-        if not os.path.exists(output_folder):
-            os.makedirs(output_folder)
-        frame_count = 0
+            raise Exception(f"The video ({video_path}) couldn't be opened.")
         while True:
             ret, frame = video_capture.read()
             if not ret:
                 break
-            frame_filename = os.path.join(output_folder, f"frame{frame_count}.png")
-            cv2.imwrite(frame_filename, frame)
-            frame_count += 1
+            yield cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         video_capture.release()
 
-    def create_video(self, folder_path: str, fps: int) -> None:
+    def get_frame_pairs(self, video_path: str) -> Iterator[tuple]:
         """
-        Create the video in the given format.
+        Get the pairs of original and video frames one at a time, the original frames are generated again
+        instead of being kept in memory and the video is read once.
 
             Parameters
-                folder_path (str): (str): Path to save the video
-                fps (int): Number of FPS
+                video_path (str): Path of the video
 
             Returns
-                return List with the images
+                return Iterator over the original frame (PIL image) and the video frame (RGB array) of each pair
         """
 
-        height, width, layers = np.array(self.images[0]).shape
-        # Define the codec and create VideoWriter object (H.264 codec)
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')  # Use 'mp4v' for H.264 codec
-        video = cv2.VideoWriter(folder_path, fourcc, fps, (width, height))
-        for image in self.images:
-            video.write(np.array(image))
-        video.release()
+        yield from zip(self.generate_frames(), self.read_frames(video_path))
 
-    def save(self, folder_path: str) -> None:
+    def extract_frames(self, video_path: str, output_folder: str) -> None:
         """
-        Save the video in the given path.
+        Extract the frames of the video.
 
             Parameters
-                folder_path (str): Path to save the video
+                video_path (str): (str): Path of the video.
+                output_folder (str): Path to save the video frames.
 
             Returns
                 return None
         """
 
-        for i in range(len(self.images)):
-            self.images[i].save(folder_path+f"\\frame{i}.png")
+        if not os.path.exists(output_folder):
+            os.makedirs(output_folder)
+        for frame_count, frame in enumerate(self.read_frames(video_path)):
+            frame_filename = os.path.join(output_folder, f"frame{frame_count}.png")
+            cv2.imwrite(frame_filename, cv2.cvtColor(frame, cv2.COLOR_RGB2BGR))
 
-    def repeat_coded_content(self) -> str:
+    def to_bgr(self, image: "PIL.Image.Image") -> np.ndarray:
         """
-        Repeat the bits row of the coded content with the bit height.
+        Convert the image into the BGR array expected by OpenCV.
 
             Parameters
-                None
+                image ("PIL.Image.Image"): Frame of the video
 
             Returns
-                return Repeated coded content
+                return Array with shape (height, width, 3)
         """
 
-        row_bit_length = self.width*self.bit_depth
-        repeated_coded_content = ""
-        for i in range(0, len(self.coded_content), row_bit_length):
-            repeated_coded_content += self.coded_content[i:i+row_bit_length]*self.bit_height
-        return repeated_coded_content
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        return cv2.cvtColor(np.asarray(image), cv2.COLOR_RGB2BGR)
+
+    def create_video(self, file_path: str, fps: int, folder_path: str = None) -> None:
+        """
+        Create the video in the given format, the frames are written as soon as they are generated.
+
+            Parameters
+                file_path (str): Path to save the video
+                fps (int): Number of FPS
+                folder_path (str): Path to save the frames as images (None to skip them)
+
+            Returns
+                return None
+        """
+
+        # Define the codec and create VideoWriter object (H.264 codec)
+        fourcc = cv2.VideoWriter_fourcc(*'mp4v')  # Use 'mp4v' for H.264 codec
+        video = cv2.VideoWriter(file_path, fourcc, fps, self.dimensions)
+        for i, image in enumerate(self.generate_frames()):
+            if folder_path is not None:
+                image.save(folder_path+f"\\frame{i}.png")
+            video.write(self.to_bgr(image))
+        video.release()
 
     def initialization(self) -> None:
         """
@@ -219,12 +429,39 @@ class VideoGenerator(Entity):
                 return None
         """
 
-        self.total_pixels = (len(self.coded_content)*self.bit_height)/self.bit_depth
+        if self.cell_grid is not None and (self.bit_width, self.bit_height) != (1, 1):
+            raise Exception(f"The cells ({self.cell_grid}) replace the repetition of the bits and the rows ({self.bit_width}, {self.bit_height}).")
+        self.total_pixels = (len(self.coded_content)*self.bit_width*self.bit_height)/self.bit_depth
+        if self.cell_grid is not None:
+            self.total_pixels = len(self.coded_content)*self.cell_grid.get_pixels_per_bit(self.bit_depth)
+        if self.error_corrector is not None:
+            self.total_pixels *= self.error_corrector.get_rate()
         self.dimensions, self.frames = self.fit_resolution()
+        # The video codec (4:2:0 chroma) drops the last row or column of the odd dimensions
+        self.dimensions = tuple(dimension + dimension%2 for dimension in self.dimensions)
         self.width, self.height = self.dimensions
-        self.coded_content = self.repeat_coded_content()
-        print(len(self.coded_content)/self.bit_depth, self.total_pixels)
-        self.images = self.generate_images()
-        self.save(self.original_frames_path)
-        self.create_video(self.video_path+"/output_video.mp4", 1)
-        self.extract_frames(self.video_path+"/output_video.mp4", self.video_frames_path)
+        # The groups of repeated rows and bits (or the cells) don't cross the frames
+        self.frame_capacity = (self.height//self.bit_height)*self.width*self.bit_depth
+        if self.cell_grid is not None:
+            self.frame_capacity = self.cell_grid.get_capacity(self.dimensions, self.bit_depth)
+        self.code_capacity = self.frame_capacity//self.bit_width
+        if self.error_corrector is None:
+            self.payload_capacity = self.code_capacity - FRAME_HEADER_LENGTH
+        else:
+            self.payload_capacity = self.error_corrector.get_capacity(self.code_capacity) - FRAME_HEADER_LENGTH
+        if self.payload_capacity <= 0:
+            raise Exception(f"The frames ({self.dimensions}) can't hold the frame header.")
+        self.frames = max(ceil(len(self.coded_content)/self.payload_capacity), 1)
+        if self.executor not in ("process", "thread"):
+            raise Exception(f"The executor ({self.executor}) isn't available.")
+        self.video_file_path = self.video_path+"/output_video.mp4"
+        self.index_file_path = None
+        if self.positions is not None:
+            self.index_file_path = os.path.splitext(self.video_file_path)[0]+".json"
+            self.save_seek_index(self.index_file_path)
+        if self.save_frames:
+            self.create_video(self.video_file_path, 1, self.original_frames_path)
+            self.extract_frames(self.video_file_path, self.video_frames_path)
+        else:
+            # The frames aren't kept, the frames of the video are read back with get_frame_pairs
+            self.create_video(self.video_file_path, 1)
@@ -0,0 +1,45 @@
+from scripts.bit_buffer import BitBuffer
+import numpy as np, pytest
+
+@pytest.fixture
+def bits():
+    return "".join(np.random.default_rng(0).choice(["0", "1"], 1001))
+
+def test_string_round_trip(bits):
+    assert BitBuffer.from_string(bits).to_string() == bits
+
+def test_bits_and_bytes_round_trip(bits):
+    buffer = BitBuffer.from_string(bits)
+    assert BitBuffer.from_bits(buffer.to_bits()) == buffer
+    assert BitBuffer.from_bytes(buffer.to_bytes(), len(buffer)) == buffer
+
+def test_append_and_slice(bits):
+    buffer = BitBuffer.from_string(bits[:500])
+    buffer.append(bits[500:])
+    buffer.append_int(5, 3)
+    assert buffer.to_string() == bits + "101"
+    assert buffer[13:700].to_string() == bits[13:700]
+    assert buffer[-3:].to_int() == 5
+
+def test_fields(bits):
+    buffer = BitBuffer.from_string(bits[:1000])
+    assert buffer.fields(10).tolist() == [int(bits[i:i+10], 2) for i in range(0, 1000, 10)]
+    assert BitBuffer.from_fields(buffer.fields(10), 10) == buffer
+
+@pytest.mark.parametrize("factor", [1, 2, 3, 8])
+def test_majority_inverts_repeat(bits, factor):
+    buffer = BitBuffer.from_string(bits)
+    assert buffer.repeat(factor).to_string() == "".join(bit*factor for bit in bits)
+    assert buffer.repeat(factor).majority(factor) == buffer
+
+@pytest.mark.parametrize("row_length", [8, 13])
+@pytest.mark.parametrize("factor", [1, 2, 3])
+def test_repeat_rows_pads_the_last_row(row_length, factor):
+    buffer = BitBuffer.from_string("10110")
+    repeated = buffer.repeat_rows(row_length, factor)
+    assert repeated.to_string() == ("10110" + "0"*(row_length - 5))*factor
+    assert repeated.majority_rows(row_length, factor).to_string() == "10110" + "0"*(row_length - 5)
+
+def test_repeat_rows_of_an_empty_buffer():
+    assert len(BitBuffer().repeat_rows(8, 1)) == 0
+    assert len(BitBuffer().repeat_rows(13, 3)) == 0
@@ -0,0 +1,125 @@
+from scripts.source import Source
+from scripts.encoder import Encoder
+from scripts.decoder import Decoder
+from scripts.video_generator import VideoGenerator
+from scripts.encoders.frequency_model import FrequencyModel
+from scripts.bit_buffer import BitBuffer
+from collections import Counter
+import scripts.constants, numpy as np, os, pytest
+
+END = "~"
+BIT_SIZE = 2
+
+def get_text(symbols: str, length: int, seed: int = 0, exponent: float = 4) -> str:
+    rng = np.random.default_rng(seed)
+    weights = rng.random(len(symbols))**exponent
+    return "".join(rng.choice(list(symbols), length, p=weights/weights.sum()))
+
+def get_encoder(text: str, coding_method: str = "huffman", args: list = None, canonical: bool = False) -> Encoder:
+    counts = Counter(text + END)
+    source = Source(symbols=list(counts), probability_distribution=[count/(len(text)+1) for count in counts.values()])
+    return Encoder(coding_method=coding_method, source=source, args=args or [["0", "1"]], canonical=canonical)
+
+def round_trip(text: str, coding_method: str, args: list = None) -> str:
+    encoder = get_encoder(text, coding_method, args, True)
+    coded_content = BitBuffer.from_string(encoder.preamble_to_string() + encoder.source_code_to_string(END))
+    coded_content.append(encoder.encode(text + END))
+    return Decoder("", True, coding_method=coding_method).decode_content(coded_content)
+
+@pytest.fixture
+def generate_frames(tmp_path, monkeypatch):
+    # Small frames to split the texts in several frames
+    monkeypatch.setitem(scripts.constants.RESOLUTIONS, "test", [(32, 16), (64, 32)])
+
+    def generate(text: str, coding_method: str = "huffman", args: list = None, canonical: bool = False) -> tuple:
+        encoder = get_encoder(text, coding_method, args, canonical)
+        header = encoder.preamble_to_string() + encoder.source_code_to_string(END)
+        coded_content = BitBuffer.from_string(header).append(encoder.encode(text + END))
+        video = VideoGenerator(
+            coded_content = coded_content,
+            positions = encoder.get_positions(text + END, len(header)),
+            bit_depth = scripts.constants.BIT_DEPTH,
+            platform = "test",
+            bit_width = BIT_SIZE,
+            bit_height = BIT_SIZE,
+            original_frames_path = str(tmp_path),
+            video_frames_path = str(tmp_path),
+            video_path = str(tmp_path),
+            save_frames = False
+        )
+        frames = list(video.generate_frames())
+        for index, frame in enumerate(frames):
+            frame.save(os.path.join(tmp_path, f"frame{index}.png"))
+        decoder = Decoder(str(tmp_path), canonical, BIT_SIZE, BIT_SIZE, coding_method=coding_method)
+        return video, frames, decoder
+
+    return generate
+
+TEXT = get_text("abcdefghijklmnopqrstuvwxyz ,.\n", 20000)
+
+TEXTS = [
+    "",
+    "a",
+    get_text("ab", 5000, 1, 1),
+    TEXT,
+    # Skewed symbols get the minimum frequency
+    get_text("abcdefghijklmnopqrstuvwxyz0123456789", 30000, 2, 12),
+    get_text("añ€𝄞 ", 5000, 3, 2),
+]
+
+@pytest.mark.parametrize("coding_method, args", [("huffman", None), ("blocked_huffman", [["0", "1"], 1000]), ("arithmetic", None), ("rans", None)])
+def test_frames_decode_in_any_order(generate_frames, coding_method, args):
+    _, frames, decoder = generate_frames(TEXT, coding_method, args)
+    assert len(frames) > 2
+    order = np.random.default_rng(0).permutation(len(frames))
+    assert decoder.decode_frames(frames[index] for index in order) == TEXT
+    assert decoder.decode_frames() == TEXT
+
+def test_missing_frames_only_lose_their_content(generate_frames):
+    _, frames, decoder = generate_frames(TEXT)
+    content = decoder.decode_frames(frames[:2] + frames[3:])
+    assert len(content) < len(TEXT)
+    assert TEXT.startswith(content[:100]) and TEXT.endswith(content[-100:])
+
+@pytest.mark.parametrize("coding_method", ["huffman", "arithmetic", "rans"])
+def test_decode_range_matches_the_slices_of_the_content(generate_frames, coding_method):
+    video, frames, decoder = generate_frames(TEXT, coding_method)
+    rng = np.random.default_rng(1)
+    ranges = [(0, 1), (0, len(TEXT)), (len(TEXT)-1, 10), (len(TEXT), 10), (video.payload_capacity//4, 5)]
+    ranges += [(int(rng.integers(len(TEXT))), int(rng.integers(1, 3000))) for _ in range(20)]
+    for start, length in ranges:
+        assert decoder.decode_range(start, length, index_file_path=video.index_file_path) == TEXT[start:start+length]
+
+def test_decode_range_reads_the_frames_of_the_range(generate_frames, monkeypatch):
+    video, frames, decoder = generate_frames(TEXT)
+    reads = []
+    read_frame_range = decoder.read_frame_range
+
+    def read_counted_frame_range(first: int, count: int, video_file_path: str = None):
+        reads.append((first, count))
+        return read_frame_range(first, count, video_file_path)
+
+    monkeypatch.setattr(decoder, "read_frame_range", read_counted_frame_range)
+    start = len(TEXT)//2
+    assert decoder.decode_range(start, 10, index_file_path=video.index_file_path) == TEXT[start:start+10]
+    assert sum(count for _, count in reads) < len(frames)
+
+@pytest.mark.parametrize("text", TEXTS, ids=range(len(TEXTS)))
+@pytest.mark.parametrize("block_length", [None, 7, 1000])
+def test_arithmetic_round_trip(text, block_length):
+    assert round_trip(text, "arithmetic", [["0", "1"], block_length]) == text
+
+def test_arithmetic_round_trip_with_a_block_for_each_symbol():
+    assert round_trip(TEXT[:500], "arithmetic", [["0", "1"], 1]) == TEXT[:500]
+
+@pytest.mark.parametrize("text", TEXTS, ids=range(len(TEXTS)))
+@pytest.mark.parametrize("lanes, block_length", [(None, None), (1, None), (3, 1000), (32, 7)])
+def test_rans_round_trip(text, lanes, block_length):
+    assert round_trip(text, "rans", [["0", "1"], lanes, block_length]) == text
+
+def test_rans_round_trip_with_a_block_for_each_symbol():
+    assert round_trip(TEXT[:500], "rans", [["0", "1"], 4, 1]) == TEXT[:500]
+
+def test_frequency_model_is_abstract():
+    with pytest.raises(TypeError):
+        FrequencyModel(Source(symbols=["a", END], probability_distribution=[0.5, 0.5]), ["0", "1"], 12)
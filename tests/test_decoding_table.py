@@ -0,0 +1,63 @@
+from scripts.source import Source
+from scripts.encoder import Encoder
+from scripts.decoder import Decoder
+from scripts.decoding_table import DecodingTable
+from scripts.bit_buffer import BitBuffer
+from collections import Counter
+import numpy as np, pytest
+
+END = "~"
+
+def get_text(symbols: str, length: int, exponent: float = 4, seed: int = 0) -> str:
+    rng = np.random.default_rng(seed)
+    weights = rng.random(len(symbols))**exponent
+    return "".join(rng.choice(list(symbols), length, p=weights/weights.sum()))
+
+def get_coded_content(text: str, coding_method: str = "huffman", canonical: bool = False) -> BitBuffer:
+    counts = Counter(text + END)
+    source = Source(symbols=list(counts), probability_distribution=[count/(len(text)+1) for count in counts.values()])
+    encoder = Encoder(coding_method=coding_method, source=source, args=[["0", "1"]], canonical=canonical)
+    coded_content = BitBuffer.from_string(encoder.preamble_to_string() + encoder.source_code_to_string(END))
+    return coded_content.append(encoder.encode(text + END))
+
+def decode_by_bit(inverse_source_code: dict, bits: str) -> str:
+    content, sub = "", ""
+    for bit in bits:
+        sub += bit
+        if sub in inverse_source_code:
+            content += inverse_source_code[sub]
+            sub = ""
+    return content
+
+TEXTS = [
+    get_text("abcdefghijklmnopqrstuvwxyz ,.\n", 20000),
+    # Skewed symbols give code words longer than the lookup table (fallback table)
+    get_text("abcdefghijklmnopqrstuvwxyz0123456789", 30000, 12, 1),
+    get_text("añ€𝄞 ", 5000, 2, 2),
+]
+
+# The inverse source code only holds the symbols up to 255
+@pytest.mark.parametrize("text, canonical", [(TEXTS[0], False), (TEXTS[1], False)] + [(text, True) for text in TEXTS])
+def test_table_decoder_matches_the_bit_decoder(text, canonical):
+    coded_content = get_coded_content(text, canonical=canonical)
+    decoder = Decoder("", canonical)
+    assert decoder.decode_content(coded_content) == decoder.decode_content_by_bit(coded_content) == text
+
+def test_long_code_words_use_the_fallback_table():
+    coded_content = get_coded_content(TEXTS[1])
+    inverse_source_code, _, _ = Decoder("").decode_source_code(coded_content, Decoder("").decode_preamble(coded_content))
+    table = DecodingTable(inverse_source_code)
+    assert table.max_length > table.table_bits
+    assert table.fallback[0].size
+
+@pytest.mark.parametrize("cut", [0, 1, 5, 17])
+def test_table_decoder_drops_the_cut_code_word(cut):
+    inverse_source_code = {"0": "a", "10": "b", "110": "c", "1110": "d", "1111": "e"}
+    rng = np.random.default_rng(cut)
+    bits = "".join(rng.choice(list(inverse_source_code), 3000))
+    bits = bits[:len(bits)-cut]
+    assert DecodingTable(inverse_source_code).decode(BitBuffer.from_string(bits)) == decode_by_bit(inverse_source_code, bits)
+
+def test_table_decoder_stops_in_the_end_symbol():
+    inverse_source_code = {"0": "a", "10": "b", "11": END}
+    assert DecodingTable(inverse_source_code).decode(BitBuffer.from_string("0100110100"), END) == "aba"
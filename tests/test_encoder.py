@@ -0,0 +1,53 @@
+from scripts.source import Source
+from scripts.encoder import Encoder
+from scripts.bit_buffer import BitBuffer
+from collections import Counter
+import scripts.constants, numpy as np, pytest
+
+def get_text(symbols: str, length: int, seed: int = 0) -> str:
+    rng = np.random.default_rng(seed)
+    weights = rng.random(len(symbols))**4
+    return "".join(rng.choice(list(symbols), length, p=weights/weights.sum()))
+
+def get_encoder(text: str, coding_method: str = "huffman", canonical: bool = False) -> Encoder:
+    counts = Counter(text)
+    source = Source(symbols=list(counts), probability_distribution=[count/len(text) for count in counts.values()])
+    return Encoder(coding_method=coding_method, source=source, args=[["0", "1"]], canonical=canonical)
+
+TEXTS = [
+    get_text("ab", 1000),
+    get_text("abcdefghijklmnopqrstuvwxyz ,.\n", 20001),
+    get_text("añ€𝄞 ", 3001, 1),
+]
+
+@pytest.mark.parametrize("text", TEXTS)
+@pytest.mark.parametrize("coding_method, canonical", [("huffman", False), ("huffman", True), ("block", False)])
+def test_table_encoder_matches_the_symbol_encoder(text, coding_method, canonical):
+    encoder = get_encoder(text, coding_method, canonical)
+    assert encoder.encode(text) == BitBuffer.from_string(encoder.encode_by_symbol(text))
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_table_encoder_without_pairs_and_in_chunks(text, monkeypatch):
+    monkeypatch.setattr(scripts.constants, "PAIR_TABLE_SIZE", 0)
+    monkeypatch.setattr(scripts.constants, "ENCODE_CHUNK_LENGTH", 100)
+    encoder = get_encoder(text)
+    assert encoder.pair_table is None
+    assert encoder.encode(text) == BitBuffer.from_string(encoder.encode_by_symbol(text))
+
+def test_positions_point_to_the_code_words():
+    text = TEXTS[1][:500]
+    encoder = get_encoder(text)
+    encoded_content = encoder.encode(text).to_string()
+    positions = encoder.get_positions(text, 7)
+    for ch, position in zip(text, positions.tolist()):
+        code_word = encoder.source_code.map[ch]
+        assert encoded_content[position-7:position-7+len(code_word)] == code_word
+
+def test_symbols_without_code_word():
+    with pytest.raises(Exception):
+        get_encoder("abc").encode("abd")
+
+def test_d_ary_output_symbols_are_rejected():
+    source = Source(symbols=["a", "b", "c"], probability_distribution=[0.5, 0.25, 0.25])
+    with pytest.raises(Exception, match="binary output symbols"):
+        Encoder(coding_method="huffman", source=source, args=[["0", "1", "2"]])
@@ -0,0 +1,58 @@
+from scripts.error_correctors.hamming import Hamming
+from scripts.error_correctors.reed_solomon import ReedSolomon
+from scripts.bit_buffer import BitBuffer
+import numpy as np, pytest
+
+def get_content(length: int, seed: int = 0) -> BitBuffer:
+    return BitBuffer.from_bits(np.random.default_rng(seed).integers(0, 2, length).astype(bool))
+
+def inject_errors(code_words: np.ndarray, errors: int, symbol_width: int, seed: int = 0) -> np.ndarray:
+    # Different wrong symbols in each code word
+    rng = np.random.default_rng(seed)
+    code_words = code_words.copy()
+    for code_word in code_words:
+        positions = rng.choice(code_word.size, errors, replace=False)
+        code_word[positions] ^= rng.integers(1, 1 << symbol_width, errors).astype(code_word.dtype)
+    return code_words
+
+ERROR_CORRECTORS = [Hamming(2), Hamming(3), Hamming(8), ReedSolomon(2), ReedSolomon(32), ReedSolomon(100)]
+
+def get_errors(error_corrector: "ErrorCorrector") -> int:
+    return 1 if isinstance(error_corrector, Hamming) else error_corrector.parity_bytes//2
+
+@pytest.mark.parametrize("error_corrector", ERROR_CORRECTORS, ids=str)
+def test_error_corrector_round_trip(error_corrector):
+    length = 20000
+    content = get_content(error_corrector.get_capacity(length) - 5)
+    coded_content = error_corrector.encode(content, length)
+    assert len(coded_content) == length
+    assert error_corrector.decode(coded_content)[:len(content)] == content
+
+@pytest.mark.parametrize("error_corrector", ERROR_CORRECTORS, ids=str)
+def test_error_corrector_corrects_t_errors_of_each_code_word(error_corrector):
+    rng = np.random.default_rng(1)
+    data = rng.integers(0, 1 << error_corrector.symbol_width, (50, error_corrector.data_length)).astype(np.uint8)
+    code_words = error_corrector.encode_blocks(data)
+    errors = get_errors(error_corrector)
+    assert np.array_equal(error_corrector.decode_blocks(inject_errors(code_words, errors, error_corrector.symbol_width)), data)
+
+@pytest.mark.parametrize("error_corrector", ERROR_CORRECTORS, ids=str)
+def test_error_corrector_corrects_a_burst_of_the_frame(error_corrector):
+    length = 30000
+    content = get_content(error_corrector.get_capacity(length), 2)
+    coded_content = error_corrector.encode(content, length).to_bits()
+    # The code words are interleaved, so a burst of t symbols of each code word is corrected
+    blocks, _, _ = error_corrector.get_layout(length)
+    burst = blocks*get_errors(error_corrector)*error_corrector.symbol_width
+    coded_content[1000:1000+burst] ^= True
+    assert error_corrector.decode(BitBuffer.from_bits(coded_content))[:len(content)] == content
+
+def test_reed_solomon_shortened_code_words():
+    # The frame only has room for code words shorter than 255 bytes
+    error_corrector = ReedSolomon(10)
+    blocks, code_length, data_length = error_corrector.get_layout(8*600)
+    assert (blocks, code_length, data_length) == (3, 200, 190)
+    content = get_content(error_corrector.get_capacity(8*600), 3)
+    code_words = error_corrector.encode_blocks(error_corrector.get_symbols(content).reshape(blocks, data_length))
+    data = error_corrector.decode_blocks(inject_errors(code_words, 5, 8, 3))
+    assert BitBuffer.from_fields(data.reshape(-1), 8) == content